@@ -1,11 +1,18 @@
 from django.contrib import admin
 from .models import (
     Recipe,
+    RecipeIngredient,
     UserSavedRecipe,
     GroceryList,
     GroceryItem,
     PantryItem,
     MealHistory,
+    DailyNutrition,
+    RecipeJob,
+    MealPlan,
+    MealPlanEntry,
+    SyncChange,
+    BedrockCallLog,
 )
 
 
@@ -23,6 +30,13 @@ class RecipeAdmin(admin.ModelAdmin):
     readonly_fields = ("created_at",)
 
 
+@admin.register(RecipeIngredient)
+class RecipeIngredientAdmin(admin.ModelAdmin):
+    list_display = ("ingredient", "recipe", "recipe_size")
+    search_fields = ("ingredient", "recipe__name")
+    raw_id_fields = ("recipe",)
+
+
 @admin.register(UserSavedRecipe)
 class UserSavedRecipeAdmin(admin.ModelAdmin):
     list_display = ("user", "recipe", "saved_at")
@@ -67,3 +81,61 @@ class MealHistoryAdmin(admin.ModelAdmin):
     list_display = ("user", "recipe_name", "calories_consumed", "eaten_at")
     list_filter = ("eaten_at",)
     search_fields = ("user__email", "recipe_name")
+
+
+@admin.register(SyncChange)
+class SyncChangeAdmin(admin.ModelAdmin):
+    list_display = ("id", "user", "kind", "object_id", "op", "changed_at")
+    list_filter = ("kind", "op", "changed_at")
+    search_fields = ("user__email",)
+
+
+@admin.register(DailyNutrition)
+class DailyNutritionAdmin(admin.ModelAdmin):
+    list_display = ("user", "date", "meals", "calories", "protein_g", "carbs_g", "fat_g")
+    list_filter = ("date",)
+    search_fields = ("user__email",)
+    readonly_fields = ("updated_at",)
+
+
+@admin.register(RecipeJob)
+class RecipeJobAdmin(admin.ModelAdmin):
+    list_display = ("id", "user", "kind", "status", "created_at", "finished_at")
+    list_filter = ("kind", "status", "created_at")
+    search_fields = ("user__email",)
+    readonly_fields = ("created_at", "started_at", "finished_at")
+
+
+class MealPlanEntryInline(admin.TabularInline):
+    model = MealPlanEntry
+    extra = 0
+    fields = ("day", "meal", "status", "source", "recipe", "generation_ms", "error")
+    readonly_fields = fields
+    raw_id_fields = ("recipe",)
+
+
+@admin.register(MealPlan)
+class MealPlanAdmin(admin.ModelAdmin):
+    list_display = ("id", "user", "name", "start_date", "days", "status", "created_at")
+    list_filter = ("status", "created_at")
+    search_fields = ("user__email", "name")
+    readonly_fields = ("created_at", "updated_at")
+    inlines = (MealPlanEntryInline,)
+
+
+@admin.register(BedrockCallLog)
+class BedrockCallLogAdmin(admin.ModelAdmin):
+    list_display = (
+        "created_at",
+        "endpoint",
+        "status",
+        "wall_ms",
+        "ttfb_ms",
+        "input_tokens",
+        "output_tokens",
+        "cost_usd",
+        "user",
+    )
+    list_filter = ("endpoint", "status", "model_id", "created_at")
+    search_fields = ("user__email", "error")
+    raw_id_fields = ("user",)
@@ -1,6 +1,17 @@
 from django.apps import AppConfig
+from django.conf import settings
 
 
 class ApiConfig(AppConfig):
     default_auto_field = 'django.db.models.BigAutoField'
     name = 'api'
+
+    def ready(self):
+        from . import signals  # noqa: F401 - registers signal receivers
+
+        # Optionally build the Bedrock client at startup so the first recipe
+        # request doesn't pay for credential and endpoint resolution.
+        if getattr(settings, "BEDROCK_CLIENT", {}).get("WARM_UP_ON_STARTUP"):
+            from .services.bedrock_client import get_client_manager
+
+            get_client_manager().warm_up()
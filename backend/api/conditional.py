@@ -0,0 +1,58 @@
+import hashlib
+from functools import wraps
+
+from django.db.models import Count, Max
+from django.utils.cache import get_conditional_response, patch_cache_control
+from django.utils.http import quote_etag
+
+
+def list_state(queryset, timestamp_field):
+    """``(row_count, latest_timestamp)`` for ``queryset`` in one aggregate query."""
+    state = queryset.aggregate(count=Count("pk"), latest=Max(timestamp_field))
+    return state["count"], state["latest"]
+
+
+def conditional_list(state_func):
+    """
+    ETag support for a per-user GET list view.
+
+    ``state_func(request)`` returns a list of ``list_state`` tuples describing
+    everything the response is built from. Together with the user and the
+    query string they form the ETag, so a matching ``If-None-Match`` gets a
+    304 after only those aggregate queries, without running the list query
+    or the serializer.
+
+    Only counts and latest timestamps are compared, so every write path for
+    the listed rows must bump the timestamp (``auto_now`` fields do).
+    There is deliberately no ``Last-Modified``: deleting a row other than
+    the newest changes the count but not the latest timestamp, so
+    ``If-Modified-Since`` would answer 304 for a list that has changed.
+    Place it below ``@api_view``/``@permission_classes`` so the user is
+    authenticated first.
+    """
+
+    def decorator(view):
+        @wraps(view)
+        def wrapper(request, *args, **kwargs):
+            if request.method not in ("GET", "HEAD"):
+                return view(request, *args, **kwargs)
+
+            states = state_func(request)
+            fingerprint = "|".join(
+                [str(request.user.pk), request.get_full_path()]
+                + [f"{count}:{latest.isoformat() if latest else ''}" for count, latest in states]
+            )
+            etag = quote_etag(hashlib.md5(fingerprint.encode("utf-8")).hexdigest())
+
+            response = get_conditional_response(request, etag=etag)
+            if response is None:
+                response = view(request, *args, **kwargs)
+            if response.status_code in (200, 304):
+                response.headers.setdefault("ETag", etag)
+            # Per-user data: clients may keep it but must revalidate.
+            patch_cache_control(response, private=True, no_cache=True)
+            return response
+
+        return wrapper
+
+    return decorator
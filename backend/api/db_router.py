@@ -0,0 +1,188 @@
+import logging
+import random
+import threading
+import time
+from contextvars import ContextVar
+
+from django.conf import settings
+from django.db import DEFAULT_DB_ALIAS, DatabaseError, connections
+
+logger = logging.getLogger(__name__)
+
+# Seconds the replica is behind; 0 when it has replayed everything it
+# received (an idle primary would otherwise look like growing lag), NULL
+# when the server is not a standby (e.g. a second alias for the primary).
+_LAG_SQL = """
+    SELECT CASE
+        WHEN NOT pg_is_in_recovery() THEN NULL
+        WHEN pg_last_wal_receive_lsn() = pg_last_wal_replay_lsn() THEN 0
+        ELSE EXTRACT(EPOCH FROM now() - pg_last_xact_replay_timestamp())
+    END
+"""
+
+
+def _options():
+    return getattr(settings, "REPLICA_ROUTING", {})
+
+
+class RoutingState:
+    """Where the current request's reads go; set up by ``ReplicaRoutingMiddleware``."""
+
+    __slots__ = ("read_alias", "wrote")
+
+    def __init__(self):
+        self.read_alias = None
+        self.wrote = False
+
+
+_state = ContextVar("replica_routing", default=None)
+
+
+def current_state():
+    return _state.get()
+
+
+def begin_request():
+    """Start routing for a request; pass the result to ``end_request``."""
+    return _state.set(RoutingState())
+
+
+def end_request(token):
+    _state.reset(token)
+
+
+class ReplicaRouter:
+    """
+    Send a request's reads to the replica its middleware picked.
+
+    Everything else (writes, reads outside a routed request, reads after the
+    request has written anything) uses the primary. Replicas mirror the
+    primary, so they are never migrated.
+    """
+
+    def db_for_read(self, model, **hints):
+        state = _state.get()
+        if state is not None and state.read_alias and not state.wrote:
+            return state.read_alias
+        return DEFAULT_DB_ALIAS
+
+    def db_for_write(self, model, **hints):
+        state = _state.get()
+        if state is not None:
+            # Later reads in this request must see what it wrote.
+            state.wrote = True
+        return DEFAULT_DB_ALIAS
+
+    def allow_relation(self, obj1, obj2, **hints):
+        # All aliases hold the same data.
+        return True
+
+    def allow_migrate(self, db, app_label, model_name=None, **hints):
+        return db not in get_replica_pool().aliases
+
+
+class ReplicaPool:
+    """
+    Health-checked choice among the read replicas of this process.
+
+    A replica is used while it accepts connections and, on PostgreSQL, lags
+    the primary by at most ``max_lag_seconds``. Checks are cached for
+    ``check_interval`` seconds; a failed replica is left alone for
+    ``retry_seconds``. With no healthy replica, reads fall back to the primary.
+    """
+
+    def __init__(self, aliases, max_lag_seconds=None, check_interval=5, retry_seconds=30):
+        self.aliases = tuple(aliases)
+        self.max_lag_seconds = max_lag_seconds
+        self.check_interval = check_interval
+        self.retry_seconds = retry_seconds
+        self._health = {}  # alias -> (valid until, healthy)
+        self._lock = threading.Lock()
+        self._counters = {"replica_reads": 0, "sticky": 0, "fallbacks": 0, "failed_checks": 0}
+
+    def _incr(self, counter):
+        with self._lock:
+            self._counters[counter] += 1
+
+    def _mark(self, alias, healthy):
+        ttl = self.check_interval if healthy else self.retry_seconds
+        with self._lock:
+            self._health[alias] = (time.monotonic() + ttl, healthy)
+            if not healthy:
+                self._counters["failed_checks"] += 1
+
+    def _lag_ok(self, alias):
+        connection = connections[alias]
+        if self.max_lag_seconds is None or connection.vendor != "postgresql":
+            return True
+        with connection.cursor() as cursor:
+            cursor.execute(_LAG_SQL)
+            lag = cursor.fetchone()[0]
+        if lag is not None and lag > self.max_lag_seconds:
+            logger.warning("Replica %s is %.1fs behind; reading from the primary", alias, lag)
+            return False
+        return True
+
+    def _usable(self, alias):
+        with self._lock:
+            cached = self._health.get(alias)
+        if cached is not None and cached[0] > time.monotonic() and not cached[1]:
+            return False
+        try:
+            # Connects this thread now, so a dead replica fails here rather
+            # than in the middle of the view.
+            connections[alias].ensure_connection()
+            if cached is None or cached[0] <= time.monotonic():
+                healthy = self._lag_ok(alias)
+                self._mark(alias, healthy)
+                return healthy
+        except DatabaseError as e:
+            logger.warning("Replica %s unavailable: %s", alias, e)
+            self._mark(alias, False)
+            return False
+        return True
+
+    def choose(self):
+        """A usable replica alias, or ``None`` to read from the primary."""
+        candidates = list(self.aliases)
+        random.shuffle(candidates)
+        for alias in candidates:
+            if self._usable(alias):
+                self._incr("replica_reads")
+                return alias
+        if candidates:
+            self._incr("fallbacks")
+        return None
+
+    def record_sticky(self):
+        self._incr("sticky")
+
+    def stats(self):
+        now = time.monotonic()
+        with self._lock:
+            stats = dict(self._counters)
+            stats["healthy"] = {
+                alias: healthy if until > now else None
+                for alias, (until, healthy) in self._health.items()
+            }
+        return stats
+
+
+_pool = None
+_pool_lock = threading.Lock()
+
+
+def get_replica_pool():
+    """Return the process-wide pool configured from ``settings.REPLICA_ROUTING``."""
+    global _pool
+    if _pool is None:
+        with _pool_lock:
+            if _pool is None:
+                options = _options()
+                _pool = ReplicaPool(
+                    aliases=options.get("REPLICAS", ()),
+                    max_lag_seconds=options.get("MAX_LAG_SECONDS"),
+                    check_interval=options.get("CHECK_INTERVAL_SECONDS", 5),
+                    retry_seconds=options.get("RETRY_SECONDS", 30),
+                )
+    return _pool
@@ -0,0 +1,38 @@
+import time
+
+from django.core.management.base import BaseCommand
+
+from api.models import GroceryItem, Recipe
+
+
+class Command(BaseCommand):
+    help = "Fill the numeric protein_g/carbs_g/fat_g columns from the macros JSON."
+
+    def add_arguments(self, parser):
+        parser.add_argument("--batch-size", type=int, default=1000)
+
+    def handle(self, *args, **options):
+        batch_size = options["batch_size"]
+        for model in (Recipe, GroceryItem):
+            started = time.monotonic()
+            updated = 0
+            last_id = 0
+            while True:
+                batch = list(
+                    model.objects.filter(id__gt=last_id)
+                    .order_by("id")
+                    .only("id", "macros", *model.MACRO_COLUMNS)[:batch_size]
+                )
+                if not batch:
+                    break
+                for row in batch:
+                    row.sync_macro_columns()
+                model.objects.bulk_update(batch, model.MACRO_COLUMNS)
+                updated += len(batch)
+                last_id = batch[-1].id
+            elapsed = time.monotonic() - started
+            self.stdout.write(
+                self.style.SUCCESS(
+                    f"{model.__name__}: parsed macros for {updated} row(s) in {elapsed:.2f}s"
+                )
+            )
@@ -0,0 +1,228 @@
+import io
+import json
+import os
+import socket
+import subprocess
+import sys
+import tempfile
+import time
+import urllib.error
+import urllib.request
+
+from django.conf import settings
+from django.core.management import call_command
+from django.core.management.base import BaseCommand, CommandError
+
+MODES = ("wsgi", "asgi")
+
+
+def _free_port():
+    with socket.socket() as sock:
+        sock.bind(("127.0.0.1", 0))
+        return sock.getsockname()[1]
+
+
+def _parse_levels(text):
+    try:
+        levels = [int(part) for part in text.split(",") if part.strip()]
+    except ValueError as e:
+        raise CommandError(f"--levels must be comma-separated integers: {e}") from e
+    if not levels or min(levels) < 1:
+        raise CommandError("--levels needs at least one positive client count")
+    return levels
+
+
+class _Server:
+    """A gunicorn (WSGI) or uvicorn (ASGI) server for this project, in a subprocess."""
+
+    def __init__(self, mode, port, workers, threads, env):
+        self.mode = mode
+        self.base_url = f"http://127.0.0.1:{port}"
+        if mode == "wsgi":
+            self.args = [
+                sys.executable, "-m", "gunicorn", "personal_chef_project.wsgi",
+                "--bind", f"127.0.0.1:{port}",
+                "--workers", str(workers),
+                "--worker-class", "gthread",
+                "--threads", str(threads),
+                "--timeout", "300",
+            ]
+        else:
+            self.args = [
+                sys.executable, "-m", "uvicorn", "personal_chef_project.asgi:application",
+                "--host", "127.0.0.1",
+                "--port", str(port),
+                "--workers", str(workers),
+                "--no-access-log",
+            ]
+        self.env = env
+        self.process = None
+        self.log = None
+
+    def start(self, timeout):
+        self.log = tempfile.TemporaryFile()
+        self.process = subprocess.Popen(
+            self.args, cwd=settings.BASE_DIR, env=self.env, stdout=self.log, stderr=subprocess.STDOUT
+        )
+        deadline = time.monotonic() + timeout
+        while time.monotonic() < deadline:
+            if self.process.poll() is not None:
+                raise CommandError(f"{self.args[2]} exited on startup:\n{self.output()}")
+            try:
+                # Any HTTP response (here a 401) means the app is loaded.
+                urllib.request.urlopen(self.base_url + "/api/v1/recipes/generate/", timeout=2)
+                return
+            except urllib.error.HTTPError:
+                return
+            except OSError:
+                time.sleep(0.2)
+        self.stop()
+        raise CommandError(f"{self.args[2]} did not answer within {timeout:g}s:\n{self.output()}")
+
+    def output(self, lines=30):
+        self.log.seek(0)
+        return "\n".join(self.log.read().decode(errors="replace").splitlines()[-lines:])
+
+    def stop(self):
+        if self.process is not None and self.process.poll() is None:
+            self.process.terminate()
+            try:
+                self.process.wait(timeout=15)
+            except subprocess.TimeoutExpired:
+                self.process.kill()
+                self.process.wait()
+        if self.log is not None:
+            self.log.close()
+
+
+class Command(BaseCommand):
+    help = (
+        "Compare how many concurrent Bedrock-bound requests one worker sustains "
+        "under WSGI (gunicorn, gthread) and ASGI (uvicorn, async views). Each "
+        "server runs against the local Bedrock simulator and is loaded with "
+        "load_test at every --levels client count. Run it against a development "
+        "database."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--levels", default="8,32,128,256", help="Comma-separated concurrent client counts."
+        )
+        parser.add_argument("--duration", type=float, default=15, help="Seconds per level.")
+        parser.add_argument(
+            "--mix", default="generate=1", help="load_test scenario weights (default generate only)."
+        )
+        parser.add_argument("--users", type=int, default=4, help="Benchmark accounts to spread load over.")
+        parser.add_argument("--workers", type=int, default=1, help="Worker processes per server.")
+        parser.add_argument(
+            "--threads", type=int, default=8, help="Threads per gunicorn worker (WSGI only)."
+        )
+        parser.add_argument("--modes", default="wsgi,asgi", help="Servers to run, of wsgi and asgi.")
+        parser.add_argument("--ttfb-median-ms", type=float, help="Override the simulator's TTFB median.")
+        parser.add_argument(
+            "--output-tokens-per-second", type=float, help="Override the simulator's output rate."
+        )
+        parser.add_argument(
+            "--startup-timeout", type=float, default=30, help="Seconds to wait for each server."
+        )
+        parser.add_argument("--json", dest="json_path", help="Also write the results to this file.")
+
+    def handle(self, *args, **options):
+        levels = _parse_levels(options["levels"])
+        modes = [mode.strip() for mode in options["modes"].split(",") if mode.strip()]
+        if not modes or set(modes) - set(MODES):
+            raise CommandError(f"--modes must name some of {', '.join(MODES)}")
+        if options["duration"] <= 0:
+            raise CommandError("--duration must be positive")
+
+        env = dict(os.environ)
+        env.update({
+            "DJANGO_SETTINGS_MODULE": os.environ.get("DJANGO_SETTINGS_MODULE", settings.SETTINGS_MODULE),
+            "BEDROCK_BACKEND": "simulator",
+            # Neither server should queue on the Bedrock connection pool.
+            "BEDROCK_MAX_POOL_CONNECTIONS": str(max(levels)),
+        })
+        if options["ttfb_median_ms"] is not None:
+            env["BEDROCK_SIMULATOR_TTFB_MEDIAN_MS"] = str(options["ttfb_median_ms"])
+        if options["output_tokens_per_second"] is not None:
+            env["BEDROCK_SIMULATOR_OUTPUT_TOKENS_PER_SECOND"] = str(options["output_tokens_per_second"])
+
+        rows = []
+        for mode in modes:
+            server = _Server(
+                mode,
+                _free_port(),
+                options["workers"],
+                options["threads"],
+                {**env, "DJANGO_ASYNC_VIEWS": str(mode == "asgi")},
+            )
+            self.stdout.write(f"Starting {mode.upper()} server: {' '.join(server.args[2:])}")
+            server.start(options["startup_timeout"])
+            try:
+                for level in levels:
+                    total = self._run_level(server, level, options)
+                    rows.append({"mode": mode, "clients": level, **total})
+                    self.stdout.write(
+                        f"  {level:>4} clients: {total['rps']:g} req/s, p50 {_num(total['p50'])} ms, "
+                        f"p99 {_num(total['p99'])} ms, {total['errors']} errors"
+                    )
+            finally:
+                server.stop()
+
+        self._report(rows, levels, modes)
+        if options["json_path"]:
+            with open(options["json_path"], "w") as f:
+                json.dump(
+                    {
+                        "options": {
+                            key: options[key]
+                            for key in ("levels", "duration", "mix", "workers", "threads", "ttfb_median_ms")
+                        },
+                        "results": rows,
+                    },
+                    f,
+                    indent=2,
+                )
+
+    def _run_level(self, server, level, options):
+        with tempfile.NamedTemporaryFile(suffix=".json") as results:
+            call_command(
+                "load_test",
+                base_url=server.base_url,
+                concurrency=level,
+                duration=options["duration"],
+                mix=options["mix"],
+                users=options["users"],
+                # Distinct prompts keep every request a cache miss, and
+                # without stored recipes pantry suggestions ask Bedrock too.
+                distinct_prompts=100_000,
+                recipes=0,
+                json_path=results.name,
+                stdout=io.StringIO(),
+            )
+            with open(results.name) as f:
+                report = json.load(f)
+        total = report["results"][-1]
+        return {key: total[key] for key in ("count", "errors", "rps", "p50", "p95", "p99", "max")}
+
+    def _report(self, rows, levels, modes):
+        self.stdout.write("")
+        self.stdout.write("mode  clients  requests  errors    req/s   p50 ms   p95 ms   p99 ms")
+        for row in rows:
+            line = (
+                f"{row['mode']:<4}  {row['clients']:>7}  {row['count']:>8}  {row['errors']:>6}  "
+                f"{_num(row['rps']):>7}  {_num(row['p50']):>7}  {_num(row['p95']):>7}  {_num(row['p99']):>7}"
+            )
+            self.stdout.write(self.style.WARNING(line) if row["errors"] else line)
+        if set(MODES) <= set(modes):
+            by_key = {(row["mode"], row["clients"]): row for row in rows}
+            for level in levels:
+                wsgi, asgi = by_key[("wsgi", level)], by_key[("asgi", level)]
+                if wsgi["rps"]:
+                    self.stdout.write(
+                        f"ASGI/WSGI throughput at {level} clients: {asgi['rps'] / wsgi['rps']:.1f}x"
+                    )
+
+
+def _num(value):
+    return "-" if value is None else f"{value:g}"
@@ -0,0 +1,410 @@
+import itertools
+import json
+import statistics
+import time
+from contextlib import ExitStack
+
+from django.core.management.base import BaseCommand, CommandError
+from django.db import connections
+from django.test import Client
+from django.test.utils import setup_test_environment
+from django.urls import URLPattern, URLResolver, get_resolver, resolve
+from django.utils import timezone
+
+from api.models import GroceryItem, GroceryList, PantryItem, Recipe, RecipeJob, UserSavedRecipe
+from api.services.bedrock_client import get_client_manager
+from api.services.bedrock_fake import FakeBedrockClient, fake_recipe
+from api.services.benchmark_data import (
+    EMAIL_DOMAIN,
+    PANTRY_NAMES,
+    PASSWORD,
+    clean_up,
+    next_recipe_id,
+    seed_recipes,
+    seed_user,
+)
+from api.services.job_queue import get_job_queue
+from api.services.meal_plans import create_plan
+from api.services.request_metrics import QueryCounter
+
+
+class Case:
+    """
+    One timed request.
+
+    ``path`` and ``data`` may use ``{name}`` placeholders filled from the
+    seeded context plus whatever ``setup(ctx, run)`` returns for that run.
+    ``budget`` is the most queries the request may run on its own thread.
+    """
+
+    def __init__(self, method, path, budget, status=200, data=None, setup=None,
+                 content_type="application/json", user="main"):
+        self.method = method
+        self.path = path
+        self.budget = budget
+        self.status = status
+        self.data = data
+        self.setup = setup
+        self.content_type = content_type
+        self.user = user
+
+    @property
+    def label(self):
+        return f"{self.method} {self.path}"
+
+
+def _fill(value, values):
+    if isinstance(value, str):
+        # A bare "{name}" is replaced by the value itself, e.g. a list of ids.
+        if value.startswith("{") and value.endswith("}") and value[1:-1].isidentifier():
+            return values[value[1:-1]]
+        return value.format_map(values)
+    if isinstance(value, dict):
+        return {key: _fill(item, values) for key, item in value.items()}
+    if isinstance(value, list):
+        return [_fill(item, values) for item in value]
+    return value
+
+
+# --- per-run setup for requests that consume what they touch -------------
+
+def _unique(ctx):
+    """Text no earlier request of this or any other run has used."""
+    return f"{ctx['started']}-{next(ctx['serial'])}"
+
+
+def _prompt(ctx, run):
+    # A new prompt each time, so every run misses the response cache.
+    return {"prompt": f"benchmark dinner {_unique(ctx)}"}
+
+
+def _register(ctx, run):
+    return {"email": f"register-{_unique(ctx)}@{EMAIL_DOMAIN}"}
+
+
+def _new_recipe(ctx, run):
+    recipe = fake_recipe(f"benchmark saved recipe {_unique(ctx)}")
+    return {"recipe": recipe}
+
+
+def _saved_recipe(ctx, run):
+    recipe = Recipe.objects.create(**fake_recipe(f"benchmark unsave {_unique(ctx)}"))
+    ctx["recipe_ids"].append(recipe.id)
+    UserSavedRecipe.objects.create(user=ctx["main"], recipe=recipe)
+    return {"recipe_id": recipe.id}
+
+
+def _grocery_item(ctx, run):
+    item = GroceryItem.objects.create(
+        grocery_list_id=ctx["list_id"], ingredient=f"disposable {_unique(ctx)}", quantity="1"
+    )
+    return {"item_id": item.id}
+
+
+def _pantry_item(ctx, run):
+    item = PantryItem.objects.create(user=ctx["main"], name=f"disposable {_unique(ctx)}")
+    return {"pantry_item_id": item.id}
+
+
+def _fresh_list(ctx, run):
+    grocery_list = GroceryList.objects.create(user=ctx["main"], name=f"Consolidate {run}")
+    GroceryItem.objects.bulk_create(
+        GroceryItem(grocery_list=grocery_list, ingredient=name, quantity="200 g")
+        for name in PANTRY_NAMES[:15]
+    )
+    return {"fresh_list_id": grocery_list.id}
+
+
+def _bulk_operations(ctx, run):
+    items = GroceryItem.objects.bulk_create(
+        GroceryItem(grocery_list_id=ctx["list_id"], ingredient=f"bulk {run} {n}", quantity="1")
+        for n in range(15)
+    )
+    operations = [
+        {"op": "create", "data": {"grocery_list": ctx["list_id"], "ingredient": f"new {n}", "quantity": "2"}}
+        for n in range(20)
+    ]
+    operations += [{"op": "update", "id": item.id, "data": {"quantity": "3"}} for item in items[:10]]
+    operations += [{"op": "delete", "id": item.id} for item in items[10:]]
+    return {"operations": operations}
+
+
+def _meal_plan(ctx, run):
+    plan = create_plan(ctx["main"], timezone.localdate(), days=1)
+    return {"plan_id": plan.id}
+
+
+def _pantry_csv(ctx, run):
+    rows = "\n".join(f"{name},bench note {run}" for name in PANTRY_NAMES)
+    return {"csv": f"name,notes\n{rows}\n"}
+
+
+def _cases():
+    """Every benchmarked request, with its query budget."""
+    return [
+        # Recipes
+        Case("POST", "/api/v1/recipes/generate/", 5, data={"prompt": "{prompt}"}, setup=_prompt),
+        Case("POST", "/api/v1/recipes/generate/stream/", 5, data={"prompt": "{prompt}"}, setup=_prompt),
+        Case("GET", "/api/v1/recipes/pantry-suggestions/", 3),
+        Case("GET", "/api/v1/recipes/search/?q=chicken", 1),
+        Case("GET", "/api/v1/recipes/{recipe_id}/", 1),
+        Case("GET", "/api/v1/recipes/saved-recipes/", 2),
+        Case("GET", "/api/v1/recipes/saved-recipes/?view=summary&limit=50", 2),
+        Case("POST", "/api/v1/recipes/save-recipes/", 10, status=201, data="{recipe}", setup=_new_recipe),
+        Case("DELETE", "/api/v1/recipes/saved-recipes/{recipe_id}/", 3, status=204, setup=_saved_recipe),
+        Case("POST", "/api/v1/recipes/jobs/", 2, status=202, data={"prompt": "{prompt}"}, setup=_prompt),
+        Case("GET", "/api/v1/recipes/jobs/{job_id}/", 1),
+        # Groceries
+        Case("GET", "/api/v1/grocery/grocery-list/", 4),
+        Case("POST", "/api/v1/grocery/grocery-list/", 3, status=201, data={"name": "Benchmark list"}),
+        Case("GET", "/api/v1/grocery/grocery-list/{list_id}/", 2),
+        Case("PUT", "/api/v1/grocery/grocery-list/{list_id}/", 4, data={"name": "Weekly shop"}),
+        Case("POST", "/api/v1/grocery/grocery-list/{fresh_list_id}/consolidate/", 4,
+             data={"recipe_ids": "{consolidate_recipe_ids}"}, setup=_fresh_list),
+        Case("GET", "/api/v1/grocery/grocery-item/?grocery_list={list_id}", 1),
+        Case("POST", "/api/v1/grocery/grocery-item/", 4, status=201,
+             data={"grocery_list": "{list_id}", "ingredient": "capers", "quantity": "1 jar"}),
+        Case("POST", "/api/v1/grocery/grocery-item/bulk/", 8, data={"operations": "{operations}"},
+             setup=_bulk_operations),
+        Case("GET", "/api/v1/grocery/grocery-item/{item_id}/", 1, setup=_grocery_item),
+        Case("DELETE", "/api/v1/grocery/grocery-item/{item_id}/", 4, status=204, setup=_grocery_item),
+        # Pantry
+        Case("GET", "/api/v1/pantry/items/", 2),
+        Case("GET", "/api/v1/pantry/items/?limit=100", 2),
+        Case("POST", "/api/v1/pantry/items/import/", 4, data="{csv}", setup=_pantry_csv,
+             content_type="text/csv"),
+        Case("GET", "/api/v1/pantry/items/{pantry_item_id}/", 1, setup=_pantry_item),
+        Case("DELETE", "/api/v1/pantry/items/{pantry_item_id}/", 3, status=204, setup=_pantry_item),
+        # Delta sync
+        Case("GET", "/api/v1/sync/", 5),
+        # Nutrition
+        Case("GET", "/api/v1/nutrition/meals/", 1),
+        Case("GET", "/api/v1/nutrition/meals/{meal_id}/", 1),
+        Case("GET", "/api/v1/nutrition/summary/?period=week", 2),
+        Case("GET", "/api/v1/nutrition/grocery-lists/{list_id}/", 2),
+        Case("GET", "/api/v1/nutrition/saved-recipes/", 2),
+        # Meal plans
+        Case("POST", "/api/v1/meal-plans/", 16, status=201, data={"days": 1}),
+        Case("POST", "/api/v1/meal-plans/stream/", 18, data={"days": 1}),
+        Case("GET", "/api/v1/meal-plans/", 1),
+        Case("GET", "/api/v1/meal-plans/{plan_id}/", 3, setup=_meal_plan),
+        Case("DELETE", "/api/v1/meal-plans/{plan_id}/", 3, status=204, setup=_meal_plan),
+        # Metrics
+        Case("GET", "/api/v1/metrics/bedrock/", 0, user="staff"),
+        Case("GET", "/api/v1/metrics/requests/", 0, user="staff"),
+        Case("GET", "/api/v1/metrics/prometheus/", 0, user=None),
+        # Accounts (mounted under both auth/ and profile/)
+        *[
+            case
+            for prefix in ("/api/v1/auth", "/api/v1/profile")
+            for case in (
+                Case("POST", f"{prefix}/register/", 3, status=201, user=None, setup=_register,
+                     data={"email": "{email}", "password": PASSWORD, "password_confirm": PASSWORD}),
+                Case("POST", f"{prefix}/login/", 1, user=None,
+                     data={"email": "{main_email}", "password": PASSWORD}),
+                Case("GET", f"{prefix}/profile/", 0),
+                Case("PUT", f"{prefix}/profile/update/", 3, data={"goal": "maintain"}),
+            )
+        ],
+    ]
+
+
+def _routes(patterns, prefix=""):
+    """Every URL pattern string in ``patterns``, with its include prefixes."""
+    for pattern in patterns:
+        route = prefix + str(pattern.pattern)
+        if isinstance(pattern, URLResolver):
+            yield from _routes(pattern.url_patterns, route)
+        elif isinstance(pattern, URLPattern):
+            yield route
+
+
+class Command(BaseCommand):
+    help = (
+        "Seed benchmark users with realistic data, time every API route against "
+        "an in-process fake Bedrock and fail if any request runs more queries "
+        "than its budget. Run it against a development or CI database."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("--runs", type=int, default=5, help="Timed runs per request.")
+        parser.add_argument("--pantry-items", type=int, default=300)
+        parser.add_argument("--grocery-lists", type=int, default=20)
+        parser.add_argument("--items-per-list", type=int, default=25)
+        parser.add_argument("--recipes", type=int, default=400, help="Stored recipes to seed.")
+        parser.add_argument("--saved-recipes", type=int, default=200)
+        parser.add_argument("--meals", type=int, default=300, help="Meal history entries.")
+        parser.add_argument(
+            "--bedrock-latency-ms",
+            type=int,
+            default=0,
+            help="Latency of the fake Bedrock per call (default none).",
+        )
+        parser.add_argument(
+            "--only", default="", help="Only run requests whose path contains this text."
+        )
+        parser.add_argument("--json", dest="json_path", help="Also write the results to this file.")
+        parser.add_argument(
+            "--keep-data", action="store_true", help="Leave the benchmark users and recipes in place."
+        )
+
+    def handle(self, *args, **options):
+        if options["runs"] < 1:
+            raise CommandError("--runs must be at least 1")
+        setup_test_environment()
+        manager = get_client_manager()
+        fake = FakeBedrockClient(latency_ms=options["bedrock_latency_ms"])
+        manager.use_client(fake)
+
+        ctx = {"started": int(time.time()), "serial": itertools.count(), "recipe_ids": []}
+        first_new_recipe = next_recipe_id()
+        try:
+            started = time.perf_counter()
+            self._seed(ctx, options)
+            self.stdout.write(f"Seeded benchmark data in {time.perf_counter() - started:.1f}s")
+            results = self._run(ctx, options)
+        finally:
+            # Queued recipe jobs still use the fake client and the seeded user.
+            get_job_queue().drain(timeout=30)
+            manager.reset()
+            if not options["keep_data"]:
+                clean_up(ctx["recipe_ids"], first_new_recipe)
+
+        self._report(results, fake.calls)
+        uncovered = [] if options["only"] else self._uncovered(results)
+        if options["json_path"]:
+            with open(options["json_path"], "w") as f:
+                json.dump({"results": results, "uncovered_routes": uncovered}, f, indent=2)
+
+        failures = [result for result in results if result["failures"]]
+        if uncovered:
+            self.stdout.write(self.style.WARNING("Routes without a benchmark:"))
+            for route in uncovered:
+                self.stdout.write(f"  {route}")
+        if failures or uncovered:
+            raise CommandError(
+                f"{len(failures)} request(s) failed and {len(uncovered)} route(s) are not benchmarked"
+            )
+        self.stdout.write(self.style.SUCCESS("All requests within their query budgets"))
+
+    # --- data -------------------------------------------------------------
+
+    def _seed(self, ctx, options):
+        stamp = ctx["started"]
+        ctx["recipe_ids"] += seed_recipes(stamp, options["recipes"])
+        ctx["recipe_id"] = ctx["recipe_ids"][0]
+        ctx["consolidate_recipe_ids"] = ctx["recipe_ids"][:10]
+
+        main = seed_user(
+            f"bench-{stamp}",
+            recipe_ids=ctx["recipe_ids"],
+            saved_recipes=options["saved_recipes"],
+            pantry_items=options["pantry_items"],
+            grocery_lists=options["grocery_lists"],
+            items_per_list=options["items_per_list"],
+            meals=options["meals"],
+        )
+        staff = seed_user(f"bench-staff-{stamp}", is_staff=True)
+        ctx.update(
+            main=main["user"],
+            staff=staff["user"],
+            main_email=main["user"].email,
+            list_id=main["list_id"],
+            meal_id=main["meal_id"],
+            tokens={"main": main["token"], "staff": staff["token"]},
+        )
+
+        job = RecipeJob.objects.create(
+            user=main["user"],
+            kind=RecipeJob.KIND_GENERATE,
+            payload={"prompt": "benchmark"},
+            status=RecipeJob.STATUS_SUCCEEDED,
+            result=fake_recipe("benchmark job"),
+            finished_at=timezone.now(),
+        )
+        ctx["job_id"] = job.id
+
+    # --- requests ---------------------------------------------------------
+
+    def _request(self, client, case, ctx, values):
+        path = _fill(case.path, values)
+        headers = {}
+        if case.user:
+            headers["HTTP_AUTHORIZATION"] = f"Bearer {ctx['tokens'][case.user]}"
+        kwargs = dict(headers)
+        if case.data is not None:
+            data = _fill(case.data, values)
+            if case.content_type == "application/json":
+                data = json.dumps(data)
+            kwargs.update(data=data, content_type=case.content_type)
+
+        counter = QueryCounter()
+        started = time.perf_counter()
+        with ExitStack() as stack:
+            for alias in connections:
+                stack.enter_context(connections[alias].execute_wrapper(counter))
+            response = getattr(client, case.method.lower())(path, **kwargs)
+            if response.streaming:
+                # Streamed views do their work while the body is read.
+                b"".join(response.streaming_content)
+        elapsed_ms = (time.perf_counter() - started) * 1000
+        return path, response, elapsed_ms, counter.count
+
+    def _run(self, ctx, options):
+        client = Client()
+        results = []
+        for case in _cases():
+            if options["only"] and options["only"] not in case.path:
+                continue
+            timings, queries, failures = [], [], []
+            path = case.path
+            # Run 0 warms caches and connections and is not reported.
+            for run in range(options["runs"] + 1):
+                values = dict(ctx)
+                if case.setup is not None:
+                    values.update(case.setup(ctx, run))
+                path, response, elapsed_ms, count = self._request(client, case, ctx, values)
+                if response.status_code != case.status:
+                    failures.append(f"status {response.status_code}, expected {case.status}")
+                    break
+                if run:
+                    timings.append(elapsed_ms)
+                    queries.append(count)
+            if queries and max(queries) > case.budget:
+                failures.append(f"{max(queries)} queries, budget {case.budget}")
+            results.append({
+                "request": case.label,
+                "route": resolve(path.split("?")[0]).route,
+                "median_ms": round(statistics.median(timings), 1) if timings else None,
+                "max_ms": round(max(timings), 1) if timings else None,
+                "queries": max(queries) if queries else None,
+                "budget": case.budget,
+                "failures": failures,
+            })
+        return results
+
+    def _uncovered(self, results):
+        benchmarked = {result["route"] for result in results}
+        return sorted(
+            route
+            for route in _routes(get_resolver().url_patterns)
+            if route.startswith("api/") and route not in benchmarked
+        )
+
+    def _report(self, results, bedrock_calls):
+        width = max((len(result["request"]) for result in results), default=0)
+        self.stdout.write(f"{'request'.ljust(width)}  median ms   max ms  queries  budget")
+        for result in results:
+            line = (
+                f"{result['request'].ljust(width)}  {_num(result['median_ms']):>9}  "
+                f"{_num(result['max_ms']):>7}  {_num(result['queries']):>7}  {result['budget']:>6}"
+            )
+            if result["failures"]:
+                self.stdout.write(self.style.ERROR(f"{line}  {'; '.join(result['failures'])}"))
+            else:
+                self.stdout.write(line)
+        self.stdout.write(f"Fake Bedrock calls: {bedrock_calls}")
+
+
+def _num(value):
+    return "-" if value is None else f"{value:g}" if isinstance(value, float) else str(value)
@@ -0,0 +1,93 @@
+import time
+from collections import Counter
+
+from django.core.management.base import BaseCommand, CommandError
+
+from api.models import GroceryItem, Recipe
+from api.services import quantity
+
+
+def _rate(count, seconds):
+    return f"{count / seconds:,.0f}/s" if seconds > 0 else "n/a"
+
+
+class Command(BaseCommand):
+    help = (
+        "Measure quantity parser throughput on a corpus of recipe amounts and "
+        "grocery item quantities from the database."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--recipes", type=int, default=None, help="Only read this many recipes."
+        )
+        parser.add_argument(
+            "--repeat",
+            type=int,
+            default=1,
+            help="Repeat the corpus this many times, to simulate a larger workload.",
+        )
+
+    def _corpus(self, recipe_limit):
+        corpus = []
+        recipes = Recipe.objects.order_by("id").values_list("ingredients", flat=True)
+        if recipe_limit is not None:
+            recipes = recipes[:recipe_limit]
+        for ingredients in recipes.iterator(chunk_size=1000):
+            for ingredient in ingredients or []:
+                if isinstance(ingredient, dict):
+                    amount = str(ingredient.get("amount") or "").strip()
+                    unit = ingredient.get("unit") or ""
+                    # As parse_amount reads it: "500g" already has its unit.
+                    if unit and not quantity.parse_quantity(amount).unit:
+                        amount = f"{amount} {unit}".strip()
+                    corpus.append(amount)
+        corpus.extend(
+            GroceryItem.objects.values_list("quantity", flat=True).iterator(chunk_size=1000)
+        )
+        return corpus
+
+    def handle(self, *args, **options):
+        corpus = self._corpus(options["recipes"]) * max(options["repeat"], 1)
+        if not corpus:
+            raise CommandError("No recipe amounts or grocery quantities to benchmark.")
+        distinct = len(set(corpus))
+        self.stdout.write(f"Corpus: {len(corpus):,} strings, {distinct:,} distinct")
+
+        parse_text = quantity._parse_text.__wrapped__
+        started = time.perf_counter()
+        for text in corpus:
+            parse_text(text.strip())
+        uncached = time.perf_counter() - started
+
+        quantity.clear_cache()
+        started = time.perf_counter()
+        results = [quantity.parse_quantity(text) for text in corpus]
+        first_pass = time.perf_counter() - started
+
+        started = time.perf_counter()
+        for text in corpus:
+            quantity.parse_quantity(text)
+        warm = time.perf_counter() - started
+        info = quantity.cache_info()
+
+        quantity.clear_cache()
+        started = time.perf_counter()
+        quantity.parse_batch(corpus)
+        batch = time.perf_counter() - started
+
+        self.stdout.write(f"Grammar only (no memo): {_rate(len(corpus), uncached)}")
+        self.stdout.write(f"First pass (memo filling): {_rate(len(corpus), first_pass)}")
+        self.stdout.write(f"Warm memo: {_rate(len(corpus), warm)}")
+        self.stdout.write(f"parse_batch: {_rate(len(corpus), batch)}")
+        self.stdout.write(
+            f"Memo: {info.hits:,} hits, {info.misses:,} misses, "
+            f"{info.currsize:,}/{info.maxsize:,} entries"
+        )
+
+        dimensions = Counter(result.dimension for result in results)
+        parsed = len(results) - dimensions.pop(None, 0)
+        self.stdout.write(f"Parsed: {parsed / len(results):.1%}")
+        for dimension, count in dimensions.most_common(10):
+            self.stdout.write(f"  {dimension}: {count:,}")
+        self.stdout.write(self.style.SUCCESS("Done"))
@@ -0,0 +1,67 @@
+import sys
+
+from django.conf import settings
+from django.contrib.auth import get_user_model
+from django.core.management.base import BaseCommand, CommandError
+
+from api.services.pantry_import import (
+    FORMATS,
+    ImportFormatError,
+    detect_format,
+    import_pantry_items,
+    iter_rows,
+)
+
+
+class Command(BaseCommand):
+    help = "Import pantry items for a user from a CSV or NDJSON file, upserting on name."
+
+    def add_arguments(self, parser):
+        parser.add_argument("path", help="File to import, or - for stdin.")
+        parser.add_argument("--user", required=True, help="Email of the owning user.")
+        parser.add_argument("--format", choices=FORMATS)
+        parser.add_argument("--encoding", default="utf-8")
+        parser.add_argument(
+            "--chunk-size",
+            type=int,
+            default=getattr(settings, "PANTRY_IMPORT", {}).get("CHUNK_SIZE", 500),
+        )
+
+    def handle(self, *args, **options):
+        User = get_user_model()
+        try:
+            user = User.objects.get(email=options["user"])
+        except User.DoesNotExist:
+            raise CommandError(f"No user with email {options['user']}")
+
+        path = options["path"]
+        file_format = options["format"] or detect_format(filename=path)
+        if file_format is None:
+            raise CommandError("Can't tell the format from the file name; pass --format.")
+
+        try:
+            if path == "-":
+                report = self._import(user, sys.stdin.buffer, file_format, options)
+            else:
+                with open(path, "rb") as stream:
+                    report = self._import(user, stream, file_format, options)
+        except (OSError, ImportFormatError, LookupError) as e:
+            raise CommandError(str(e))
+
+        for error in report["errors"]:
+            self.stderr.write(f"line {error['line']}: {error['error']}")
+        self.stdout.write(
+            self.style.SUCCESS(
+                f"Imported {report['rows']} row(s): {report['inserted']} inserted, "
+                f"{report['updated']} updated, {report['skipped']} skipped "
+                f"in {report['elapsed_seconds']:.2f}s "
+                f"({report['rows_per_second'] or 0:.0f} rows/s)"
+            )
+        )
+
+    def _import(self, user, stream, file_format, options):
+        return import_pantry_items(
+            user,
+            iter_rows(stream, file_format, options["encoding"]),
+            chunk_size=options["chunk_size"],
+        )
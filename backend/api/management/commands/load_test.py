@@ -0,0 +1,374 @@
+import itertools
+import json
+import random
+import threading
+import time
+import urllib.error
+import urllib.request
+
+import numpy as np
+from django.core.management.base import BaseCommand, CommandError
+from django.db import close_old_connections, connection
+from django.test import Client
+from django.test.utils import setup_test_environment
+
+from api.services.bedrock_client import get_client_manager
+from api.services.bedrock_fake import SimulatedBedrockClient
+from api.services.benchmark_data import clean_up, next_recipe_id, seed_recipes, seed_user
+from api.services.job_queue import get_job_queue
+
+DEFAULT_MIX = "generate=2,stream=1,suggestions=2,pantry=4,grocery=4"
+
+
+# --- scenarios: each returns (label, method, path, data) for one request ---
+
+def _generate(user, rng, ctx):
+    return "POST /api/v1/recipes/generate/", "POST", "/api/v1/recipes/generate/", {
+        "prompt": rng.choice(ctx["prompts"])
+    }
+
+
+def _stream(user, rng, ctx):
+    return "POST /api/v1/recipes/generate/stream/", "POST", "/api/v1/recipes/generate/stream/", {
+        "prompt": rng.choice(ctx["prompts"])
+    }
+
+
+def _suggestions(user, rng, ctx):
+    return "GET /api/v1/recipes/pantry-suggestions/", "GET", "/api/v1/recipes/pantry-suggestions/", None
+
+
+def _pantry(user, rng, ctx):
+    # Mostly reads; an occasional new item also changes what suggestions see.
+    if rng.random() < 0.25:
+        name = f"load item {ctx['stamp']}-{next(ctx['serial'])}"
+        return "POST /api/v1/pantry/items/", "POST", "/api/v1/pantry/items/", {"name": name}
+    return "GET /api/v1/pantry/items/?limit=100", "GET", "/api/v1/pantry/items/?limit=100", None
+
+
+def _grocery(user, rng, ctx):
+    if rng.random() < 0.25:
+        data = {"grocery_list": user["list_id"], "ingredient": "capers", "quantity": "1 jar"}
+        return "POST /api/v1/grocery/grocery-item/", "POST", "/api/v1/grocery/grocery-item/", data
+    path = f"/api/v1/grocery/grocery-list/{user['list_id']}/"
+    return "GET /api/v1/grocery/grocery-list/{list_id}/", "GET", path, None
+
+
+SCENARIOS = {
+    "generate": _generate,
+    "stream": _stream,
+    "suggestions": _suggestions,
+    "pantry": _pantry,
+    "grocery": _grocery,
+}
+
+
+def _parse_mix(text):
+    """``"generate=2,pantry=4"`` -> ``{"generate": 2.0, "pantry": 4.0}``."""
+    mix = {}
+    for part in filter(None, (part.strip() for part in text.split(","))):
+        name, _, weight = part.partition("=")
+        name = name.strip()
+        if name not in SCENARIOS:
+            raise CommandError(f"Unknown scenario {name!r}; choose from {', '.join(SCENARIOS)}")
+        try:
+            mix[name] = float(weight) if weight else 1.0
+        except ValueError:
+            raise CommandError(f"Weight of {name!r} must be a number")
+        if mix[name] < 0:
+            raise CommandError(f"Weight of {name!r} must not be negative")
+    if not any(mix.values()):
+        raise CommandError("--mix must give at least one scenario a positive weight")
+    return mix
+
+
+def _stream_status(status, content_type, body):
+    # Streams fail after the 200 is sent, with an in-band error event.
+    if content_type.startswith("text/event-stream") and b"event: error" in body:
+        return "stream error"
+    return status
+
+
+class _InProcessTransport:
+    """Requests through Django's test client, one client per thread."""
+
+    def __init__(self):
+        self._local = threading.local()
+
+    def request(self, method, path, token, data):
+        client = getattr(self._local, "client", None)
+        if client is None:
+            client = self._local.client = Client(raise_request_exception=False)
+        kwargs = {"HTTP_AUTHORIZATION": f"Bearer {token}"}
+        if data is not None:
+            kwargs.update(data=json.dumps(data), content_type="application/json")
+        response = getattr(client, method.lower())(path, **kwargs)
+        if response.streaming:
+            # Streamed views do their work while the body is read.
+            body = b"".join(response.streaming_content)
+            return _stream_status(response.status_code, response["Content-Type"], body)
+        return response.status_code
+
+
+class _HttpTransport:
+    """Requests over HTTP to a running server that shares this database."""
+
+    def __init__(self, base_url, timeout):
+        self.base_url = base_url.rstrip("/")
+        self.timeout = timeout
+
+    def request(self, method, path, token, data):
+        body = None if data is None else json.dumps(data).encode()
+        request = urllib.request.Request(
+            self.base_url + path,
+            data=body,
+            method=method,
+            headers={"Authorization": f"Bearer {token}", "Content-Type": "application/json"},
+        )
+        try:
+            with urllib.request.urlopen(request, timeout=self.timeout) as response:
+                body = response.read()
+                return _stream_status(response.status, response.headers.get("Content-Type", ""), body)
+        except urllib.error.HTTPError as e:
+            return e.code
+
+
+def _percentiles(timings):
+    if not timings:
+        return {"p50": None, "p95": None, "p99": None, "max": None}
+    p50, p95, p99 = np.percentile(timings, [50, 95, 99])
+    return {
+        "p50": round(float(p50), 1),
+        "p95": round(float(p95), 1),
+        "p99": round(float(p99), 1),
+        "max": round(max(timings), 1),
+    }
+
+
+class Command(BaseCommand):
+    help = (
+        "Replay a weighted mix of generate, streaming, pantry suggestion, pantry "
+        "and grocery requests from concurrent clients and report throughput and "
+        "p50/p95/p99 latency per endpoint. Bedrock is the local simulator unless "
+        "--bedrock settings is given. Run it against a development database."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("--concurrency", type=int, default=8, help="Concurrent clients.")
+        parser.add_argument("--duration", type=float, default=30, help="Seconds to run for.")
+        parser.add_argument(
+            "--requests", type=int, default=0, help="Stop after this many requests (0 = no limit)."
+        )
+        parser.add_argument("--users", type=int, default=4, help="Benchmark accounts to spread load over.")
+        parser.add_argument(
+            "--mix",
+            default=DEFAULT_MIX,
+            help=f"Scenario weights, default {DEFAULT_MIX!r}. Scenarios: {', '.join(SCENARIOS)}.",
+        )
+        parser.add_argument(
+            "--distinct-prompts",
+            type=int,
+            default=50,
+            help="Size of the prompt pool; smaller pools raise the response cache hit ratio.",
+        )
+        parser.add_argument("--recipes", type=int, default=200, help="Stored recipes to seed.")
+        parser.add_argument("--pantry-items", type=int, default=40, help="Pantry items per account.")
+        parser.add_argument("--seed", type=int, default=None, help="Seed for the request mix.")
+        parser.add_argument(
+            "--bedrock",
+            choices=("simulator", "settings"),
+            default="simulator",
+            help="'simulator' (BEDROCK_SIMULATOR settings) or whatever BEDROCK_CLIENT builds.",
+        )
+        parser.add_argument("--ttfb-median-ms", type=float, help="Override the simulator's TTFB median.")
+        parser.add_argument("--throttle-rate", type=float, help="Override the simulator's throttle rate.")
+        parser.add_argument(
+            "--max-concurrency", type=int, help="Override the simulator's concurrent call quota."
+        )
+        parser.add_argument(
+            "--base-url",
+            help=(
+                "Send requests over HTTP to this server instead of in-process. It must "
+                "use this database and SECRET_KEY; --bedrock only applies in-process."
+            ),
+        )
+        parser.add_argument("--timeout", type=float, default=180, help="HTTP timeout in seconds.")
+        parser.add_argument("--json", dest="json_path", help="Also write the results to this file.")
+        parser.add_argument(
+            "--keep-data", action="store_true", help="Leave the benchmark users and recipes in place."
+        )
+
+    def handle(self, *args, **options):
+        mix = _parse_mix(options["mix"])
+        if options["concurrency"] < 1 or options["users"] < 1 or options["distinct_prompts"] < 1:
+            raise CommandError("--concurrency, --users and --distinct-prompts must be at least 1")
+        if options["duration"] <= 0 and options["requests"] <= 0:
+            raise CommandError("Give a positive --duration or --requests")
+
+        manager = get_client_manager()
+        simulator = None
+        if options["base_url"]:
+            transport = _HttpTransport(options["base_url"], options["timeout"])
+        else:
+            setup_test_environment()
+            transport = _InProcessTransport()
+            if options["bedrock"] == "simulator":
+                simulator = SimulatedBedrockClient.from_settings()
+                for option, attribute in (
+                    ("ttfb_median_ms", "ttfb_median_ms"),
+                    ("throttle_rate", "throttle_rate"),
+                    ("max_concurrency", "max_concurrency"),
+                ):
+                    if options[option] is not None:
+                        setattr(simulator, attribute, options[option])
+                manager.use_client(simulator)
+
+        stamp = int(time.time())
+        ctx = {
+            "prompts": [
+                f"load test dinner {stamp} {n}" for n in range(options["distinct_prompts"])
+            ],
+            "stamp": stamp,
+            "serial": itertools.count(),
+        }
+        first_new_recipe = next_recipe_id()
+        recipe_ids = []
+        try:
+            recipe_ids += seed_recipes(f"load {stamp}", options["recipes"])
+            users = [
+                seed_user(
+                    f"load-{stamp}-{n}",
+                    recipe_ids=recipe_ids,
+                    saved_recipes=50,
+                    pantry_items=options["pantry_items"],
+                    grocery_lists=3,
+                    items_per_list=25,
+                )
+                for n in range(options["users"])
+            ]
+            self.stdout.write(
+                f"Running {options['concurrency']} clients for "
+                + (f"{options['duration']:g}s" if options["duration"] > 0 else "as long as needed")
+                + (f" or {options['requests']} requests" if options["requests"] > 0 else "")
+            )
+            samples, elapsed = self._run(transport, users, mix, ctx, options)
+        finally:
+            get_job_queue().drain(timeout=30)
+            if simulator is not None:
+                manager.reset()
+            if not options["keep_data"]:
+                clean_up(recipe_ids, first_new_recipe)
+
+        results = self._summarise(samples, elapsed)
+        self._report(results, elapsed, simulator)
+        if options["json_path"]:
+            with open(options["json_path"], "w") as f:
+                json.dump(
+                    {
+                        "options": {key: options[key] for key in ("concurrency", "duration", "users", "mix")},
+                        "elapsed_seconds": round(elapsed, 3),
+                        "results": results,
+                        "simulator": simulator.stats() if simulator else None,
+                    },
+                    f,
+                    indent=2,
+                )
+
+    def _run(self, transport, users, mix, ctx, options):
+        names = list(mix)
+        weights = [mix[name] for name in names]
+        limit = options["requests"]
+        deadline = time.monotonic() + options["duration"] if options["duration"] > 0 else None
+        samples = []  # (label, elapsed ms, status)
+        lock = threading.Lock()
+        issued = [0]
+
+        def worker(index):
+            rng = random.Random(None if options["seed"] is None else options["seed"] + index)
+            user = users[index % len(users)]
+            close_old_connections()
+            try:
+                while deadline is None or time.monotonic() < deadline:
+                    with lock:
+                        if limit and issued[0] >= limit:
+                            return
+                        issued[0] += 1
+                    scenario = SCENARIOS[rng.choices(names, weights)[0]]
+                    label, method, path, data = scenario(user, rng, ctx)
+                    started = time.perf_counter()
+                    try:
+                        status = transport.request(method, path, user["token"], data)
+                    except Exception as e:
+                        # Timeouts and refused connections count as errors.
+                        status = f"{type(e).__name__}"
+                    elapsed_ms = (time.perf_counter() - started) * 1000
+                    with lock:
+                        samples.append((label, elapsed_ms, status))
+            finally:
+                connection.close()
+
+        threads = [
+            threading.Thread(target=worker, args=(n,), name=f"load-test-{n}", daemon=True)
+            for n in range(options["concurrency"])
+        ]
+        started = time.perf_counter()
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        return samples, time.perf_counter() - started
+
+    def _summarise(self, samples, elapsed):
+        by_label = {}
+        for label, elapsed_ms, status in samples:
+            by_label.setdefault(label, []).append((elapsed_ms, status))
+        results = []
+        for label in sorted(by_label):
+            rows = by_label[label]
+            errors = [status for _, status in rows if not isinstance(status, int) or status >= 400]
+            results.append({
+                "request": label,
+                "count": len(rows),
+                "errors": len(errors),
+                "error_statuses": sorted({str(status) for status in errors}),
+                "rps": round(len(rows) / elapsed, 2) if elapsed else None,
+                **_percentiles([elapsed_ms for elapsed_ms, _ in rows]),
+            })
+        all_rows = [(elapsed_ms, status) for _, elapsed_ms, status in samples]
+        results.append({
+            "request": "total",
+            "count": len(all_rows),
+            "errors": sum(1 for _, status in all_rows if not isinstance(status, int) or status >= 400),
+            "error_statuses": [],
+            "rps": round(len(all_rows) / elapsed, 2) if elapsed else None,
+            **_percentiles([elapsed_ms for elapsed_ms, _ in all_rows]),
+        })
+        return results
+
+    def _report(self, results, elapsed, simulator):
+        width = max(len(result["request"]) for result in results)
+        self.stdout.write(
+            f"{'request'.ljust(width)}  requests  errors    req/s   p50 ms   p95 ms   p99 ms   max ms"
+        )
+        for result in results:
+            line = (
+                f"{result['request'].ljust(width)}  {result['count']:>8}  {result['errors']:>6}  "
+                f"{_num(result['rps']):>7}  {_num(result['p50']):>7}  {_num(result['p95']):>7}  "
+                f"{_num(result['p99']):>7}  {_num(result['max']):>7}"
+            )
+            if result["errors"]:
+                line += f"  ({', '.join(result['error_statuses'])})" if result["error_statuses"] else ""
+                self.stdout.write(self.style.WARNING(line))
+            else:
+                self.stdout.write(line)
+        self.stdout.write(f"Elapsed: {elapsed:.1f}s")
+        if simulator is not None:
+            stats = simulator.stats()
+            self.stdout.write(
+                "Simulated Bedrock: "
+                + ", ".join(f"{key.replace('_', ' ')} {value}" for key, value in stats.items())
+            )
+
+
+def _num(value):
+    return "-" if value is None else f"{value:g}"
@@ -0,0 +1,37 @@
+from datetime import timedelta
+
+from django.core.management.base import BaseCommand
+from django.utils import timezone
+
+from api.services.job_queue import get_job_queue
+
+
+class Command(BaseCommand):
+    help = (
+        "Run queued recipe jobs, e.g. ones left behind when a web worker "
+        "restarted before its pool picked them up."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--limit", type=int, default=500, help="Maximum number of jobs to run."
+        )
+        parser.add_argument(
+            "--stale-seconds",
+            type=int,
+            default=600,
+            help="Requeue jobs that have been running for longer than this first.",
+        )
+
+    def handle(self, *args, **options):
+        queue = get_job_queue()
+        older_than = timezone.now() - timedelta(seconds=options["stale_seconds"])
+        requeued = queue.broker.requeue_stale(older_than)
+        if requeued:
+            self.stdout.write(f"Requeued {requeued} stale job(s)")
+
+        job_ids = queue.broker.queued_ids(options["limit"])
+        for job_id in job_ids:
+            queue.enqueue_existing(job_id)
+        queue.drain()
+        self.stdout.write(self.style.SUCCESS(f"Processed {len(job_ids)} job(s)"))
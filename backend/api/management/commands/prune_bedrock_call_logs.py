@@ -0,0 +1,23 @@
+from datetime import timedelta
+
+from django.core.management.base import BaseCommand
+from django.utils import timezone
+
+from api.models import BedrockCallLog
+
+
+class Command(BaseCommand):
+    help = "Delete persisted Bedrock call metrics older than the retention period."
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--days",
+            type=int,
+            default=30,
+            help="Keep this many days of call logs (default 30).",
+        )
+
+    def handle(self, *args, **options):
+        older_than = timezone.now() - timedelta(days=options["days"])
+        deleted, _ = BedrockCallLog.objects.filter(created_at__lt=older_than).delete()
+        self.stdout.write(self.style.SUCCESS(f"Deleted {deleted} Bedrock call log(s)"))
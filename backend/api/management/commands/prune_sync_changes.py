@@ -0,0 +1,24 @@
+from datetime import timedelta
+
+from django.core.management.base import BaseCommand
+from django.utils import timezone
+
+from api.services.sync import prune_changes
+
+
+class Command(BaseCommand):
+    help = "Delete delta-sync change log entries older than the retention period."
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--days",
+            type=int,
+            help="Keep this many days of changes instead of SYNC['RETENTION_DAYS'].",
+        )
+
+    def handle(self, *args, **options):
+        older_than = None
+        if options["days"] is not None:
+            older_than = timezone.now() - timedelta(days=options["days"])
+        deleted = prune_changes(older_than)
+        self.stdout.write(self.style.SUCCESS(f"Deleted {deleted} change log entr(ies)"))
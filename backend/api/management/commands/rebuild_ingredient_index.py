@@ -0,0 +1,22 @@
+import time
+
+from django.core.management.base import BaseCommand
+
+from api.services.ingredient_index import rebuild_index
+
+
+class Command(BaseCommand):
+    help = "Rebuild the ingredient -> recipe inverted index from Recipe.ingredients."
+
+    def add_arguments(self, parser):
+        parser.add_argument("--batch-size", type=int, default=500)
+
+    def handle(self, *args, **options):
+        started = time.monotonic()
+        recipes, rows = rebuild_index(batch_size=options["batch_size"])
+        elapsed = time.monotonic() - started
+        self.stdout.write(
+            self.style.SUCCESS(
+                f"Indexed {recipes} recipe(s) into {rows} row(s) in {elapsed:.2f}s"
+            )
+        )
@@ -0,0 +1,32 @@
+import time
+
+from django.contrib.auth import get_user_model
+from django.core.management.base import BaseCommand, CommandError
+
+from api.services.nutrition import rebuild_rollups
+
+
+class Command(BaseCommand):
+    help = "Recompute the daily nutrition rollups from MealHistory."
+
+    def add_arguments(self, parser):
+        parser.add_argument("--user", help="Only rebuild this user's rollups (email).")
+        parser.add_argument("--batch-size", type=int, default=2000)
+
+    def handle(self, *args, **options):
+        user = None
+        if options["user"]:
+            User = get_user_model()
+            try:
+                user = User.objects.get(email=options["user"])
+            except User.DoesNotExist:
+                raise CommandError(f"No user with email {options['user']}")
+
+        started = time.monotonic()
+        meals, days = rebuild_rollups(user=user, batch_size=options["batch_size"])
+        elapsed = time.monotonic() - started
+        self.stdout.write(
+            self.style.SUCCESS(
+                f"Rolled up {meals} meal(s) into {days} day(s) in {elapsed:.2f}s"
+            )
+        )
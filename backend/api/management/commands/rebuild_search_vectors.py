@@ -0,0 +1,22 @@
+import time
+
+from django.core.management.base import BaseCommand, CommandError
+
+from api.services.recipe_search import rebuild_search_vectors, search_supported
+
+
+class Command(BaseCommand):
+    help = "Recompute the stored full-text search vector for every recipe."
+
+    def add_arguments(self, parser):
+        parser.add_argument("--batch-size", type=int, default=5000)
+
+    def handle(self, *args, **options):
+        if not search_supported():
+            raise CommandError("Full-text search vectors require PostgreSQL.")
+        started = time.monotonic()
+        updated = rebuild_search_vectors(batch_size=options["batch_size"])
+        elapsed = time.monotonic() - started
+        self.stdout.write(
+            self.style.SUCCESS(f"Updated {updated} recipe(s) in {elapsed:.2f}s")
+        )
@@ -0,0 +1,224 @@
+import logging
+import random
+import time
+
+from asgiref.sync import iscoroutinefunction, markcoroutinefunction, sync_to_async
+from django.conf import settings
+from django.core.cache import caches
+from django.core.cache.backends.dummy import DummyCache
+from django.core.cache.backends.locmem import LocMemCache
+from rest_framework.exceptions import AuthenticationFailed
+from rest_framework.permissions import SAFE_METHODS
+from rest_framework_simplejwt.authentication import JWTAuthentication
+from rest_framework_simplejwt.settings import api_settings as jwt_settings
+
+from .db_router import begin_request, current_state, end_request, get_replica_pool
+from .services.request_metrics import (
+    UNMATCHED_ROUTE,
+    get_request_metrics,
+    start_counting,
+    stop_counting,
+)
+
+logger = logging.getLogger(__name__)
+
+
+class RequestMetricsMiddleware:
+    """
+    Record latency, query count and SQL time per route.
+
+    A ``SAMPLE_RATE`` share of requests is measured; the others pass straight
+    through, so turning the rate down makes the overhead negligible. Queries
+    are counted on every database, including those async views run on
+    executor threads. Requests over their latency or query budget are logged.
+
+    For streaming responses only the time until the response starts is
+    measured, not the stream itself.
+    """
+
+    sync_capable = True
+    async_capable = True
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+        self.async_mode = iscoroutinefunction(get_response)
+        if self.async_mode:
+            markcoroutinefunction(self)
+        options = getattr(settings, "REQUEST_METRICS", {})
+        self.enabled = options.get("ENABLED", True)
+        self.sample_rate = options.get("SAMPLE_RATE", 1.0)
+        self.log_over_budget = options.get("LOG_OVER_BUDGET", True)
+
+    def _sampled(self):
+        return self.enabled and (self.sample_rate >= 1.0 or random.random() < self.sample_rate)
+
+    def __call__(self, request):
+        if self.async_mode:
+            return self.__acall__(request)
+        if not self._sampled():
+            return self.get_response(request)
+
+        counter, token = start_counting()
+        started = time.perf_counter()
+        try:
+            response = self.get_response(request)
+        finally:
+            stop_counting(token)
+        self._finish(request, response, started, counter)
+        return response
+
+    async def __acall__(self, request):
+        if not self._sampled():
+            return await self.get_response(request)
+
+        counter, token = start_counting()
+        started = time.perf_counter()
+        try:
+            response = await self.get_response(request)
+        finally:
+            stop_counting(token)
+        self._finish(request, response, started, counter)
+        return response
+
+    def _finish(self, request, response, started, counter):
+        elapsed_ms = (time.perf_counter() - started) * 1000
+        try:
+            self._record(request, response, elapsed_ms, counter)
+        except Exception:
+            logger.exception("Recording request metrics failed")
+
+    def _record(self, request, response, elapsed_ms, counter):
+        match = getattr(request, "resolver_match", None)
+        route = match.route if match is not None else UNMATCHED_ROUTE
+        sql_ms = counter.seconds * 1000
+        exceeded = get_request_metrics().record(
+            request.method, route, response.status_code, elapsed_ms, counter.count, sql_ms
+        )
+        if exceeded and self.log_over_budget:
+            logger.warning(
+                "%s %s over %s budget: %.0f ms, %d queries (%.0f ms SQL)",
+                request.method,
+                route,
+                " and ".join(exceeded),
+                elapsed_ms,
+                counter.count,
+                sql_ms,
+            )
+
+
+class ReplicaRoutingMiddleware:
+    """
+    Route reads of safe requests to ``REPLICA_ROUTING["ROUTES"]`` to a replica.
+
+    A user who made a successful unsafe request within ``STICKY_SECONDS``
+    reads from the primary, so they see their own writes (read-your-writes).
+    Stickiness is kept in the ``STICKY_CACHE_ALIAS`` cache, which must be
+    shared between workers for it to hold across them. The user is taken
+    from the bearer token, before authentication, so the authentication
+    query is routed too.
+    """
+
+    sync_capable = True
+    async_capable = True
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+        self.async_mode = iscoroutinefunction(get_response)
+        if self.async_mode:
+            markcoroutinefunction(self)
+        options = getattr(settings, "REPLICA_ROUTING", {})
+        self.pool = get_replica_pool()
+        self.enabled = options.get("ENABLED", True) and bool(self.pool.aliases)
+        self.routes = tuple(options.get("ROUTES", ()))
+        self.sticky_seconds = options.get("STICKY_SECONDS", 5)
+        self.sticky_cache_alias = options.get("STICKY_CACHE_ALIAS", "bedrock")
+        self._authenticator = JWTAuthentication()
+        if self.enabled and isinstance(caches[self.sticky_cache_alias], (LocMemCache, DummyCache)):
+            logger.warning(
+                "REPLICA_ROUTING STICKY_CACHE_ALIAS %r is not shared between workers; "
+                "a user's reads on other workers may miss their own writes",
+                self.sticky_cache_alias,
+            )
+
+    def __call__(self, request):
+        if self.async_mode:
+            return self.__acall__(request)
+        if not self.enabled:
+            return self.get_response(request)
+
+        token = begin_request()
+        try:
+            response = self.get_response(request)
+        finally:
+            end_request(token)
+
+        user_id = self._sticky_user_id(request, response)
+        if user_id is not None:
+            self._set_sticky(user_id)
+        return response
+
+    async def __acall__(self, request):
+        if not self.enabled:
+            return await self.get_response(request)
+
+        token = begin_request()
+        try:
+            response = await self.get_response(request)
+        finally:
+            end_request(token)
+
+        user_id = self._sticky_user_id(request, response)
+        if user_id is not None:
+            await sync_to_async(self._set_sticky)(user_id)
+        return response
+
+    def process_view(self, request, view_func, view_args, view_kwargs):
+        state = current_state()
+        if state is None or request.method not in SAFE_METHODS:
+            return None
+        match = request.resolver_match
+        if match is None or not match.route.startswith(self.routes):
+            return None
+        user_id = self._user_id(request)
+        if user_id is not None and self._is_sticky(user_id):
+            self.pool.record_sticky()
+            return None
+        state.read_alias = self.pool.choose()
+        return None
+
+    def _sticky_user_id(self, request, response):
+        """The user to pin to the primary after this response, if any."""
+        if request.method in SAFE_METHODS or response.status_code >= 400:
+            return None
+        return self._user_id(request)
+
+    def _user_id(self, request):
+        if not hasattr(request, "_replica_user_id"):
+            user_id = None
+            header = self._authenticator.get_header(request)
+            try:
+                raw_token = header and self._authenticator.get_raw_token(header)
+                if raw_token:
+                    validated = self._authenticator.get_validated_token(raw_token)
+                    user_id = validated.get(jwt_settings.USER_ID_CLAIM)
+            except AuthenticationFailed:
+                pass
+            request._replica_user_id = user_id
+        return request._replica_user_id
+
+    def _sticky_key(self, user_id):
+        return f"replica:sticky:{user_id}"
+
+    def _is_sticky(self, user_id):
+        try:
+            return caches[self.sticky_cache_alias].get(self._sticky_key(user_id)) is not None
+        except Exception as e:
+            # Without the marker we can't rule out a recent write.
+            logger.warning("Replica stickiness lookup failed: %s", e)
+            return True
+
+    def _set_sticky(self, user_id):
+        try:
+            caches[self.sticky_cache_alias].set(self._sticky_key(user_id), 1, timeout=self.sticky_seconds)
+        except Exception as e:
+            logger.warning("Replica stickiness update failed: %s", e)
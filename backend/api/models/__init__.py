@@ -1,13 +1,25 @@
-from .recipe import Recipe, UserSavedRecipe
+from .recipe import Recipe, RecipeIngredient, UserSavedRecipe
 from .grocery import GroceryList, GroceryItem
 from .pantry import PantryItem
 from .history import MealHistory
+from .nutrition import DailyNutrition
+from .job import RecipeJob
+from .meal_plan import MealPlan, MealPlanEntry
+from .sync import SyncChange
+from .bedrock import BedrockCallLog
 
 __all__ = [
     "Recipe",
     "UserSavedRecipe",
+    "RecipeIngredient",
     "GroceryList",
     "GroceryItem",
     "PantryItem",
     "MealHistory",
+    "DailyNutrition",
+    "RecipeJob",
+    "MealPlan",
+    "MealPlanEntry",
+    "SyncChange",
+    "BedrockCallLog",
 ]
@@ -0,0 +1,46 @@
+from django.conf import settings
+from django.db import models
+
+
+class BedrockCallLog(models.Model):
+    """One instrumented Bedrock call, kept when BEDROCK_METRICS["PERSIST"] is on"""
+
+    STATUS_OK = "ok"
+    STATUS_ERROR = "error"
+    STATUS_PARSE_ERROR = "parse_error"
+    STATUS_CANCELLED = "cancelled"
+    STATUS_CHOICES = [
+        (STATUS_OK, "OK"),
+        (STATUS_ERROR, "Error"),
+        (STATUS_PARSE_ERROR, "Unparseable Response"),
+        (STATUS_CANCELLED, "Cancelled"),
+    ]
+
+    created_at = models.DateTimeField(auto_now_add=True)
+    endpoint = models.CharField(max_length=100)  # e.g. "recipes/generate"
+    operation = models.CharField(max_length=50)  # e.g. "generate_recipe"
+    model_id = models.CharField(max_length=255)
+    user = models.ForeignKey(
+        settings.AUTH_USER_MODEL,
+        null=True,
+        blank=True,
+        on_delete=models.SET_NULL,
+        related_name="+",
+    )
+    status = models.CharField(max_length=16, choices=STATUS_CHOICES)
+    wall_ms = models.FloatField()
+    ttfb_ms = models.FloatField(null=True, blank=True)
+    input_tokens = models.PositiveIntegerField(null=True, blank=True)
+    output_tokens = models.PositiveIntegerField(null=True, blank=True)
+    retries = models.PositiveSmallIntegerField(default=0)
+    cost_usd = models.DecimalField(max_digits=12, decimal_places=6, null=True, blank=True)
+    error = models.TextField(blank=True)
+
+    class Meta:
+        indexes = [
+            models.Index(fields=["created_at"], name="bedrockcall_created_idx"),
+            models.Index(fields=["endpoint", "created_at"], name="bedrockcall_endpoint_idx"),
+        ]
+
+    def __str__(self):
+        return f"{self.endpoint} {self.status} ({self.wall_ms:.0f} ms)"
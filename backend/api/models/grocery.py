@@ -1,6 +1,8 @@
 from django.db import models
 from django.conf import settings
 
+from .macros import MacroColumnsMixin
+
 
 class GroceryList(models.Model):
     """User's personal grocery list or pantry"""
@@ -8,12 +10,20 @@ class GroceryList(models.Model):
     user = models.ForeignKey(settings.AUTH_USER_MODEL, on_delete=models.CASCADE)
     name = models.CharField(max_length=255)
     created_at = models.DateTimeField(auto_now_add=True)
+    updated_at = models.DateTimeField(auto_now=True)
+
+    class Meta:
+        indexes = [
+            models.Index(
+                fields=["user", "created_at", "id"], name="grocerylist_user_created_idx"
+            ),
+        ]
 
     def __str__(self):
         return f"{self.user.email} - {self.name}"
 
 
-class GroceryItem(models.Model):
+class GroceryItem(MacroColumnsMixin, models.Model):
     """An item in a user's grocery list or pantry"""
 
     grocery_list = models.ForeignKey(
@@ -29,7 +39,17 @@ class GroceryItem(models.Model):
     macros = models.JSONField(
         null=True, blank=True
     )  # {"protein": 10, "carbs": 20, "fat": 5}
+    # protein_g / carbs_g / fat_g: numeric copies of macros (MacroColumnsMixin)
     created_at = models.DateTimeField(auto_now_add=True)
+    updated_at = models.DateTimeField(auto_now=True)
+
+    class Meta:
+        indexes = [
+            models.Index(
+                fields=["grocery_list", "created_at", "id"],
+                name="groceryitem_list_created_idx",
+            ),
+        ]
 
     def __str__(self):
         list_name = self.grocery_list.name if self.grocery_list else "No List"
@@ -11,5 +11,10 @@ class MealHistory(models.Model):
     macros_consumed = models.JSONField()  # {"protein": 25, "carbs": 50, "fat": 15}
     eaten_at = models.DateTimeField()
     
+    class Meta:
+        indexes = [
+            models.Index(fields=['user', '-eaten_at', '-id'], name='mealhistory_user_eaten_idx'),
+        ]
+    
     def __str__(self):
         return f"{self.user.email} - {self.recipe_name} ({self.eaten_at})"
@@ -0,0 +1,72 @@
+import uuid
+
+from django.conf import settings
+from django.db import models
+
+
+class RecipeJob(models.Model):
+    """A queued recipe generation or pantry suggestion request"""
+
+    KIND_GENERATE = "generate"
+    KIND_PANTRY_SUGGESTIONS = "pantry_suggestions"
+    KIND_CHOICES = [
+        (KIND_GENERATE, "Generate Recipe"),
+        (KIND_PANTRY_SUGGESTIONS, "Pantry Suggestions"),
+    ]
+
+    STATUS_QUEUED = "queued"
+    STATUS_RUNNING = "running"
+    STATUS_SUCCEEDED = "succeeded"
+    STATUS_FAILED = "failed"
+    STATUS_CHOICES = [
+        (STATUS_QUEUED, "Queued"),
+        (STATUS_RUNNING, "Running"),
+        (STATUS_SUCCEEDED, "Succeeded"),
+        (STATUS_FAILED, "Failed"),
+    ]
+    FINISHED_STATUSES = (STATUS_SUCCEEDED, STATUS_FAILED)
+
+    id = models.UUIDField(primary_key=True, default=uuid.uuid4, editable=False)
+    user = models.ForeignKey(
+        settings.AUTH_USER_MODEL,
+        on_delete=models.CASCADE,
+        related_name="recipe_jobs",
+    )
+    kind = models.CharField(max_length=32, choices=KIND_CHOICES)
+    payload = models.JSONField(default=dict)  # snapshot of the request inputs
+    status = models.CharField(
+        max_length=16, choices=STATUS_CHOICES, default=STATUS_QUEUED
+    )
+    result = models.JSONField(null=True, blank=True)
+    error = models.TextField(blank=True)
+    created_at = models.DateTimeField(auto_now_add=True)
+    started_at = models.DateTimeField(null=True, blank=True)
+    finished_at = models.DateTimeField(null=True, blank=True)
+
+    class Meta:
+        indexes = [
+            models.Index(fields=["status", "created_at"], name="recipejob_status_created_idx"),
+            models.Index(fields=["user", "-created_at"], name="recipejob_user_created_idx"),
+        ]
+        ordering = ["-created_at"]
+
+    @property
+    def is_finished(self):
+        return self.status in self.FINISHED_STATUSES
+
+    @property
+    def queue_ms(self):
+        """Time spent waiting for a worker"""
+        if not self.started_at or not self.created_at:
+            return None
+        return round((self.started_at - self.created_at).total_seconds() * 1000, 1)
+
+    @property
+    def run_ms(self):
+        """Time spent executing"""
+        if not self.finished_at or not self.started_at:
+            return None
+        return round((self.finished_at - self.started_at).total_seconds() * 1000, 1)
+
+    def __str__(self):
+        return f"{self.kind} job {self.id} ({self.status})"
@@ -0,0 +1,58 @@
+from django.db import models
+
+from ..services.quantity import COUNT, MASS, parse_quantity
+
+MACRO_KEYS = ("protein", "carbs", "fat")
+
+
+def parse_grams(value):
+    """
+    Grams from a free-form macro value, or ``None`` if there's no amount.
+
+    Accepts numbers and strings such as ``"25g"``, ``"25 g"``, ``"500mg"``
+    or ``"1.5 oz"``; a bare number is taken as grams. Strings go through the
+    memoized quantity parser, since the same few hundred values repeat
+    across recipes.
+    """
+    if isinstance(value, bool):
+        return None
+    if isinstance(value, (int, float)):
+        return float(value)
+    if not isinstance(value, str):
+        return None
+    quantity = parse_quantity(value)
+    if quantity.dimension == MASS:
+        return quantity.amount
+    if quantity.dimension == COUNT and not quantity.unit:
+        return quantity.value
+    return None
+
+
+class MacroColumnsMixin(models.Model):
+    """
+    Numeric copies of the ``macros`` JSON, refreshed on every ``save()``.
+
+    Bulk writes (``bulk_create``/``bulk_update``) skip ``save()`` and must
+    call ``sync_macro_columns()`` themselves.
+    """
+
+    MACRO_COLUMNS = tuple(f"{key}_g" for key in MACRO_KEYS)
+
+    protein_g = models.FloatField(null=True, blank=True, editable=False)
+    carbs_g = models.FloatField(null=True, blank=True, editable=False)
+    fat_g = models.FloatField(null=True, blank=True, editable=False)
+
+    class Meta:
+        abstract = True
+
+    def sync_macro_columns(self):
+        macros = self.macros if isinstance(self.macros, dict) else {}
+        for key, column in zip(MACRO_KEYS, self.MACRO_COLUMNS):
+            setattr(self, column, parse_grams(macros.get(key)))
+
+    def save(self, *args, **kwargs):
+        self.sync_macro_columns()
+        update_fields = kwargs.get("update_fields")
+        if update_fields is not None and "macros" in update_fields:
+            kwargs["update_fields"] = set(update_fields) | set(self.MACRO_COLUMNS)
+        super().save(*args, **kwargs)
@@ -0,0 +1,89 @@
+from django.conf import settings
+from django.db import models
+
+
+class MealPlan(models.Model):
+    """A multi-day plan of generated recipes, one per day and meal slot"""
+
+    MEAL_CHOICES = ("breakfast", "lunch", "dinner", "snack")
+    DEFAULT_MEALS = ("breakfast", "lunch", "dinner")
+
+    STATUS_GENERATING = "generating"
+    STATUS_COMPLETE = "complete"
+    STATUS_PARTIAL = "partial"
+    STATUS_FAILED = "failed"
+    STATUS_CHOICES = [
+        (STATUS_GENERATING, "Generating"),
+        (STATUS_COMPLETE, "Complete"),
+        (STATUS_PARTIAL, "Partially Generated"),
+        (STATUS_FAILED, "Failed"),
+    ]
+
+    user = models.ForeignKey(
+        settings.AUTH_USER_MODEL,
+        on_delete=models.CASCADE,
+        related_name="meal_plans",
+    )
+    name = models.CharField(max_length=255, blank=True)
+    start_date = models.DateField()
+    days = models.PositiveSmallIntegerField()
+    meals = models.JSONField(default=list)  # slot names, e.g. ["breakfast", "lunch", "dinner"]
+    goal = models.CharField(max_length=50, blank=True)  # profile goal when generated
+    status = models.CharField(
+        max_length=16, choices=STATUS_CHOICES, default=STATUS_GENERATING
+    )
+    created_at = models.DateTimeField(auto_now_add=True)
+    updated_at = models.DateTimeField(auto_now=True)
+
+    class Meta:
+        indexes = [
+            models.Index(fields=["user", "-created_at", "-id"], name="mealplan_user_created_idx"),
+        ]
+
+    def __str__(self):
+        return f"{self.days}-day plan from {self.start_date} ({self.status})"
+
+
+class MealPlanEntry(models.Model):
+    """One day/meal slot of a meal plan and the recipe generated for it"""
+
+    STATUS_PENDING = "pending"
+    STATUS_READY = "ready"
+    STATUS_FAILED = "failed"
+    STATUS_CHOICES = [
+        (STATUS_PENDING, "Pending"),
+        (STATUS_READY, "Ready"),
+        (STATUS_FAILED, "Failed"),
+    ]
+
+    SOURCE_CACHE = "cache"
+    SOURCE_BEDROCK = "bedrock"
+    SOURCE_CHOICES = [
+        (SOURCE_CACHE, "Recipe Cache"),
+        (SOURCE_BEDROCK, "Bedrock"),
+    ]
+
+    plan = models.ForeignKey(MealPlan, related_name="entries", on_delete=models.CASCADE)
+    day = models.PositiveSmallIntegerField()  # 0-based offset from plan.start_date
+    meal = models.CharField(max_length=32)
+    prompt = models.TextField()
+    recipe = models.ForeignKey(
+        "api.Recipe", null=True, blank=True, on_delete=models.SET_NULL
+    )
+    status = models.CharField(
+        max_length=16, choices=STATUS_CHOICES, default=STATUS_PENDING
+    )
+    source = models.CharField(max_length=16, choices=SOURCE_CHOICES, blank=True)
+    error = models.TextField(blank=True)
+    generation_ms = models.FloatField(null=True, blank=True)
+
+    class Meta:
+        constraints = [
+            models.UniqueConstraint(
+                fields=["plan", "day", "meal"], name="unique_meal_plan_slot"
+            )
+        ]
+        ordering = ["plan", "day", "id"]
+
+    def __str__(self):
+        return f"Day {self.day + 1} {self.meal} ({self.status})"
@@ -0,0 +1,31 @@
+from django.conf import settings
+from django.db import models
+
+
+class DailyNutrition(models.Model):
+    """Per-user, per-day totals of MealHistory, kept up to date by api.signals"""
+
+    user = models.ForeignKey(
+        settings.AUTH_USER_MODEL,
+        on_delete=models.CASCADE,
+        related_name="daily_nutrition",
+    )
+    date = models.DateField()  # in settings.TIME_ZONE
+    meals = models.PositiveIntegerField(default=0)
+    calories = models.BigIntegerField(default=0)
+    protein_g = models.FloatField(default=0)
+    carbs_g = models.FloatField(default=0)
+    fat_g = models.FloatField(default=0)
+    updated_at = models.DateTimeField(auto_now=True)
+
+    class Meta:
+        constraints = [
+            models.UniqueConstraint(
+                fields=["user", "date"],
+                name="unique_daily_nutrition_per_user",
+            )
+        ]
+        ordering = ["date"]
+
+    def __str__(self):
+        return f"{self.user.email} - {self.date} ({self.calories} kcal)"
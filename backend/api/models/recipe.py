@@ -1,9 +1,13 @@
+from django.contrib.postgres.indexes import GinIndex
+from django.contrib.postgres.search import SearchVectorField
 from django.db import models
 from django.conf import settings
 import hashlib
 
+from .macros import MacroColumnsMixin
 
-class Recipe(models.Model):
+
+class Recipe(MacroColumnsMixin, models.Model):
     """Recipe model for storing unique recipe details"""
     
     DIFFICULTY_CHOICES = [
@@ -17,17 +21,34 @@ class Recipe(models.Model):
     difficulty = models.CharField(max_length=50, choices=DIFFICULTY_CHOICES, null=True, blank=True)
     calories = models.PositiveIntegerField(null=True, blank=True)
     macros = models.JSONField(null=True, blank=True)  # {"protein": "22g", "carbs": "45g", "fat": "12g"}
+    # protein_g / carbs_g / fat_g: numeric copies of macros (MacroColumnsMixin)
     ingredients = models.JSONField()  # [{"item": "Chicken", "amount": "500g", "unit": "g"}]
     steps = models.JSONField()  # ["Step 1: ...", "Step 2: ..."]
     image_url = models.URLField(blank=True, null=True)
     source_hash = models.CharField(max_length=255, unique=True)
     created_at = models.DateTimeField(auto_now_add=True)
+    # Weighted tsvector over name (A), ingredients (B) and steps (C),
+    # maintained on save by api.signals
+    search_vector = SearchVectorField(null=True, editable=False)
+    
+    class Meta:
+        indexes = [
+            GinIndex(fields=['search_vector'], name='recipe_search_vector_gin'),
+            models.Index(fields=['difficulty', 'id'], name='recipe_difficulty_idx'),
+            models.Index(fields=['calories'], name='recipe_calories_idx'),
+            models.Index(fields=['time_taken_minutes'], name='recipe_time_idx'),
+        ]
     
+    @staticmethod
+    def content_hash(name, ingredients, steps):
+        """The source_hash a recipe with this content gets when saved without one"""
+        content = f"{name}{ingredients}{steps}"
+        return hashlib.md5(content.encode()).hexdigest()
+
     def save(self, *args, **kwargs):
         # Generate source_hash from recipe content if not provided
         if not self.source_hash:
-            content = f"{self.name}{self.ingredients}{self.steps}"
-            self.source_hash = hashlib.md5(content.encode()).hexdigest()
+            self.source_hash = self.content_hash(self.name, self.ingredients, self.steps)
         super().save(*args, **kwargs)
     
     def __str__(self):
@@ -43,8 +64,30 @@ class UserSavedRecipe(models.Model):
     
     class Meta:
         unique_together = ('user', 'recipe')
+        indexes = [
+            # Keyset pagination of a user's saved recipes, newest first
+            models.Index(fields=['user', '-saved_at', '-id'], name='savedrecipe_user_saved_idx'),
+        ]
     
     def __str__(self):
         u = getattr(self.user, "email", str(self.user))
         return f"{u} saved {self.recipe.name}"
 
+
+class RecipeIngredient(models.Model):
+    """Inverted index row: one normalized, non-staple ingredient of a recipe"""
+    
+    recipe = models.ForeignKey(Recipe, related_name='ingredient_index', on_delete=models.CASCADE)
+    ingredient = models.CharField(max_length=255)  # normalized, e.g. "tomato"
+    recipe_size = models.PositiveIntegerField()  # indexed ingredients in the recipe
+    
+    class Meta:
+        constraints = [
+            models.UniqueConstraint(
+                fields=['ingredient', 'recipe'],
+                name='unique_ingredient_per_recipe',
+            )
+        ]
+    
+    def __str__(self):
+        return f"{self.ingredient} -> {self.recipe_id}"
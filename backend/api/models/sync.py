@@ -0,0 +1,47 @@
+from django.conf import settings
+from django.db import models
+
+
+class SyncChange(models.Model):
+    """One create, update or delete of a user's synced row, for delta sync"""
+
+    KIND_PANTRY_ITEM = "pantry_item"
+    KIND_GROCERY_LIST = "grocery_list"
+    KIND_GROCERY_ITEM = "grocery_item"
+    KIND_SAVED_RECIPE = "saved_recipe"
+    KIND_CHOICES = [
+        (KIND_PANTRY_ITEM, "Pantry Item"),
+        (KIND_GROCERY_LIST, "Grocery List"),
+        (KIND_GROCERY_ITEM, "Grocery Item"),
+        (KIND_SAVED_RECIPE, "Saved Recipe"),
+    ]
+
+    OP_UPSERT = "upsert"
+    OP_DELETE = "delete"
+    OP_CHOICES = [
+        (OP_UPSERT, "Created or Updated"),
+        (OP_DELETE, "Deleted"),
+    ]
+
+    # The auto-increment id is the sync cursor: changes are read in id order.
+    # Ids follow insert rather than commit order, so changes_since also
+    # re-reads recent entries below the cursor by changed_at.
+    user = models.ForeignKey(
+        settings.AUTH_USER_MODEL,
+        on_delete=models.CASCADE,
+        related_name="sync_changes",
+    )
+    kind = models.CharField(max_length=20, choices=KIND_CHOICES)
+    object_id = models.BigIntegerField()
+    op = models.CharField(max_length=10, choices=OP_CHOICES)
+    changed_at = models.DateTimeField(auto_now_add=True)
+
+    class Meta:
+        indexes = [
+            models.Index(fields=["user", "id"], name="syncchange_user_id_idx"),
+            models.Index(fields=["changed_at"], name="syncchange_changed_at_idx"),
+            models.Index(fields=["user", "changed_at"], name="syncchange_user_changed_idx"),
+        ]
+
+    def __str__(self):
+        return f"{self.op} {self.kind} {self.object_id}"
@@ -0,0 +1,131 @@
+import base64
+import binascii
+import json
+from datetime import datetime
+
+from django.conf import settings
+from django.core.exceptions import FieldDoesNotExist, ValidationError
+from django.db.models import Q
+from rest_framework import status
+from rest_framework.response import Response
+
+
+class InvalidCursor(ValueError):
+    """Raised when a client sends a cursor we didn't issue."""
+
+
+def encode_cursor(values):
+    """Opaque, URL-safe cursor for the last row of a page."""
+    raw = json.dumps(values, separators=(",", ":"), default=str).encode("utf-8")
+    return base64.urlsafe_b64encode(raw).decode("ascii").rstrip("=")
+
+
+def decode_cursor(cursor):
+    """Inverse of ``encode_cursor``; raises ``InvalidCursor`` on garbage."""
+    try:
+        padded = cursor + "=" * (-len(cursor) % 4)
+        values = json.loads(base64.urlsafe_b64decode(padded.encode("ascii")))
+    except (binascii.Error, UnicodeError, ValueError) as e:
+        raise InvalidCursor("Invalid cursor") from e
+    if not isinstance(values, list):
+        raise InvalidCursor("Invalid cursor")
+    return values
+
+
+def parse_limit(raw, default, maximum):
+    """Page size from a query parameter, clamped to ``[1, maximum]``."""
+    if raw in (None, ""):
+        return default
+    try:
+        return max(1, min(int(raw), maximum))
+    except (TypeError, ValueError):
+        return default
+
+
+def _cursor_value(value):
+    if isinstance(value, datetime):
+        return value.isoformat()
+    return value
+
+
+def _keyset_filter(fields, values):
+    """
+    Rows strictly after ``values`` in the ordering described by ``fields``.
+
+    For ``[(saved_at, desc), (id, desc)]`` this is
+    ``saved_at < v0 OR (saved_at = v0 AND id < v1)``.
+    """
+    condition = Q()
+    equal = {}
+    for (name, descending), value in zip(fields, values):
+        lookup = "lt" if descending else "gt"
+        condition |= Q(**equal, **{f"{name}__{lookup}": value})
+        equal[name] = value
+    return condition
+
+
+def keyset_paginate(queryset, ordering, cursor=None, limit=50):
+    """
+    Slice ``queryset`` with a keyset (seek) cursor instead of an OFFSET.
+
+    ``ordering`` uses ``order_by`` syntax and must end with a unique field
+    (normally ``id``) so every row has a distinct position. The cursor
+    holds the ordering values of the last row served, so each page is a
+    single index range scan no matter how deep the client has paged.
+
+    Returns ``(rows, next_cursor)``; ``next_cursor`` is ``None`` on the last
+    page. Raises ``InvalidCursor`` for a malformed cursor.
+    """
+    fields = [(name.lstrip("-"), name.startswith("-")) for name in ordering]
+    queryset = queryset.order_by(*ordering)
+
+    if cursor:
+        values = decode_cursor(cursor)
+        if len(values) != len(fields):
+            raise InvalidCursor("Invalid cursor")
+        model = queryset.model
+        try:
+            values = [
+                model._meta.get_field(name).to_python(value)
+                for (name, _), value in zip(fields, values)
+            ]
+        except (ValidationError, FieldDoesNotExist) as e:
+            raise InvalidCursor("Invalid cursor") from e
+        queryset = queryset.filter(_keyset_filter(fields, values))
+
+    rows = list(queryset[: limit + 1])
+    next_cursor = None
+    if len(rows) > limit:
+        rows = rows[:limit]
+        last = rows[-1]
+        next_cursor = encode_cursor(
+            [_cursor_value(getattr(last, name)) for name, _ in fields]
+        )
+    return rows, next_cursor
+
+
+def wants_pagination(request):
+    """
+    List endpoints paginate when the client sends ``cursor`` or ``limit``.
+
+    Clients that send neither keep getting the full, unwrapped list.
+    """
+    return "cursor" in request.query_params or "limit" in request.query_params
+
+
+def paginate_request(request, queryset, ordering):
+    """``keyset_paginate`` driven by ``?cursor=`` and ``?limit=``."""
+    options = getattr(settings, "KEYSET_PAGINATION", {})
+    limit = parse_limit(
+        request.query_params.get("limit"),
+        default=options.get("DEFAULT_LIMIT", 50),
+        maximum=options.get("MAX_LIMIT", 200),
+    )
+    return keyset_paginate(queryset, ordering, request.query_params.get("cursor"), limit)
+
+
+def paginated_response(results, next_cursor):
+    """The envelope shared by every cursor-paginated endpoint."""
+    return Response(
+        {"results": results, "next_cursor": next_cursor}, status=status.HTTP_200_OK
+    )
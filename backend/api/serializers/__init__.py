@@ -1,11 +1,40 @@
-from .recipe_serializers import RecipeSerializer, UserSavedRecipeSerializer
-from .grocery_serializers import GroceryItemSerializer, GroceryListSerializer
+from .recipe_serializers import (
+    RecipeSerializer,
+    RecipeSummarySerializer,
+    UserSavedRecipeSerializer,
+    UserSavedRecipeSummarySerializer,
+)
+from .grocery_serializers import (
+    GroceryItemBulkSerializer,
+    GroceryItemSerializer,
+    GroceryListSerializer,
+    GroceryListSyncSerializer,
+)
 from .pantry_serializers import PantryItemSerializer
+from .job_serializers import RecipeJobSerializer
+from .nutrition_serializers import DailyNutritionSerializer, MealHistorySerializer
+from .meal_plan_serializers import (
+    MealPlanEntrySerializer,
+    MealPlanRequestSerializer,
+    MealPlanSerializer,
+    MealPlanSummarySerializer,
+)
 
 __all__ = [
     "RecipeSerializer",
+    "RecipeSummarySerializer",
     "UserSavedRecipeSerializer",
+    "UserSavedRecipeSummarySerializer",
     "GroceryListSerializer",
+    "GroceryListSyncSerializer",
     "GroceryItemSerializer",
+    "GroceryItemBulkSerializer",
     "PantryItemSerializer",
+    "RecipeJobSerializer",
+    "MealHistorySerializer",
+    "DailyNutritionSerializer",
+    "MealPlanSerializer",
+    "MealPlanSummarySerializer",
+    "MealPlanEntrySerializer",
+    "MealPlanRequestSerializer",
 ]
@@ -16,8 +16,15 @@ class GroceryItemSerializer(serializers.ModelSerializer):
             "price",
             "macros",
             "created_at",
+            "updated_at",
         ]
-        read_only_fields = ["id", "created_at"]
+        read_only_fields = ["id", "created_at", "updated_at"]
+
+
+class GroceryItemBulkSerializer(GroceryItemSerializer):
+    """Validates one bulk operation; the list id is checked by the caller in one query."""
+
+    grocery_list = serializers.IntegerField(required=False)
 
 
 class GroceryListSerializer(serializers.ModelSerializer):
@@ -27,5 +34,14 @@ class GroceryListSerializer(serializers.ModelSerializer):
 
     class Meta:
         model = GroceryList
-        fields = ["id", "name", "created_at", "items"]
-        read_only_fields = ["id", "created_at", "items"]
+        fields = ["id", "name", "created_at", "updated_at", "items"]
+        read_only_fields = ["id", "created_at", "updated_at", "items"]
+
+
+class GroceryListSyncSerializer(serializers.ModelSerializer):
+    """Grocery list without nested items; sync sends items separately."""
+
+    class Meta:
+        model = GroceryList
+        fields = ["id", "name", "created_at", "updated_at"]
+        read_only_fields = fields
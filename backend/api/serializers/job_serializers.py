@@ -0,0 +1,26 @@
+from rest_framework import serializers
+
+from ..models import RecipeJob
+
+
+class RecipeJobSerializer(serializers.ModelSerializer):
+    """Serializer for queued recipe jobs and their results."""
+
+    queue_ms = serializers.FloatField(read_only=True)
+    run_ms = serializers.FloatField(read_only=True)
+
+    class Meta:
+        model = RecipeJob
+        fields = [
+            "id",
+            "kind",
+            "status",
+            "result",
+            "error",
+            "created_at",
+            "started_at",
+            "finished_at",
+            "queue_ms",
+            "run_ms",
+        ]
+        read_only_fields = fields
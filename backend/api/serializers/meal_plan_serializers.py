@@ -0,0 +1,77 @@
+from datetime import timedelta
+
+from django.conf import settings
+from django.utils import timezone
+from rest_framework import serializers
+
+from ..models import MealPlan, MealPlanEntry
+from .recipe_serializers import RecipeSerializer
+
+
+class MealPlanEntrySerializer(serializers.ModelSerializer):
+    """Serializer for one day/meal slot of a meal plan"""
+
+    date = serializers.SerializerMethodField()
+    recipe = RecipeSerializer(read_only=True)
+
+    class Meta:
+        model = MealPlanEntry
+        fields = [
+            "id", "day", "date", "meal", "status", "source", "error",
+            "generation_ms", "recipe",
+        ]
+        read_only_fields = fields
+
+    def get_date(self, obj):
+        return (obj.plan.start_date + timedelta(days=obj.day)).isoformat()
+
+
+class MealPlanSummarySerializer(serializers.ModelSerializer):
+    """Serializer for a meal plan without its entries"""
+
+    class Meta:
+        model = MealPlan
+        fields = [
+            "id", "name", "start_date", "days", "meals", "goal", "status",
+            "created_at", "updated_at",
+        ]
+        read_only_fields = fields
+
+
+class MealPlanSerializer(MealPlanSummarySerializer):
+    """Serializer for a meal plan with every slot and its recipe"""
+
+    entries = MealPlanEntrySerializer(many=True, read_only=True)
+
+    class Meta(MealPlanSummarySerializer.Meta):
+        fields = MealPlanSummarySerializer.Meta.fields + ["entries"]
+        read_only_fields = fields
+
+
+class MealPlanRequestSerializer(serializers.Serializer):
+    """Validates the body of a meal plan generation request"""
+
+    name = serializers.CharField(max_length=255, required=False, allow_blank=True, default="")
+    start_date = serializers.DateField(required=False)
+    days = serializers.IntegerField(min_value=1, required=False, default=7)
+    meals = serializers.ListField(
+        child=serializers.ChoiceField(choices=MealPlan.MEAL_CHOICES),
+        allow_empty=False,
+        required=False,
+        default=list(MealPlan.DEFAULT_MEALS),
+    )
+
+    def validate_days(self, value):
+        max_days = getattr(settings, "MEAL_PLANS", {}).get("MAX_DAYS", 14)
+        if value > max_days:
+            raise serializers.ValidationError(f"A plan can cover at most {max_days} days.")
+        return value
+
+    def validate_meals(self, value):
+        if len(set(value)) != len(value):
+            raise serializers.ValidationError("Each meal may only appear once.")
+        return value
+
+    def validate(self, attrs):
+        attrs.setdefault("start_date", timezone.localdate())
+        return attrs
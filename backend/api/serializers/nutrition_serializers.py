@@ -0,0 +1,33 @@
+from rest_framework import serializers
+
+from ..models import DailyNutrition, MealHistory
+
+
+class MealHistorySerializer(serializers.ModelSerializer):
+    """Serializer for logged meals"""
+
+    class Meta:
+        model = MealHistory
+        fields = ["id", "recipe_name", "calories_consumed", "macros_consumed", "eaten_at"]
+        read_only_fields = ["id"]
+
+    def validate_calories_consumed(self, value):
+        if value < 0:
+            raise serializers.ValidationError("Calories cannot be negative.")
+        return value
+
+    def validate_macros_consumed(self, value):
+        if not isinstance(value, dict):
+            raise serializers.ValidationError(
+                'Expected an object such as {"protein": 25, "carbs": 50, "fat": 15}.'
+            )
+        return value
+
+
+class DailyNutritionSerializer(serializers.ModelSerializer):
+    """Serializer for one day's nutrition rollup"""
+
+    class Meta:
+        model = DailyNutrition
+        fields = ["date", "meals", "calories", "protein_g", "carbs_g", "fat_g"]
+        read_only_fields = fields
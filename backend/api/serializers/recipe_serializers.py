@@ -23,6 +23,15 @@ class RecipeSerializer(serializers.ModelSerializer):
         return value
 
 
+class RecipeSummarySerializer(serializers.ModelSerializer):
+    """Serializer for the list-screen fields of a Recipe (no ingredients or steps)"""
+    
+    class Meta:
+        model = Recipe
+        fields = ['id', 'name', 'time_taken_minutes', 'difficulty', 'calories', 'image_url']
+        read_only_fields = fields
+
+
 
 class UserSavedRecipeSerializer(serializers.ModelSerializer):
     """Serializer for UserSavedRecipe with nested recipe data"""
@@ -33,3 +42,14 @@ class UserSavedRecipeSerializer(serializers.ModelSerializer):
         model = UserSavedRecipe
         fields = ['id', 'recipe', 'saved_at']
         read_only_fields = ('id', 'saved_at')
+
+
+class UserSavedRecipeSummarySerializer(serializers.ModelSerializer):
+    """Serializer for UserSavedRecipe with the recipe summary only"""
+    
+    recipe = RecipeSummarySerializer(read_only=True)
+    
+    class Meta:
+        model = UserSavedRecipe
+        fields = ['id', 'recipe', 'saved_at']
+        read_only_fields = ('id', 'saved_at')
@@ -1,6 +1,21 @@
-from .aws_bedrock import generate_recipe, suggest_recipes_from_pantry
+from .aws_bedrock import (
+    agenerate_recipe,
+    asuggest_recipes_from_pantry,
+    generate_recipe,
+    stream_recipe,
+    suggest_recipes_from_pantry,
+)
+from .bedrock_client import get_client_manager
+from .recipe_cache import get_recipe_cache
+from .single_flight import get_single_flight
 
 __all__ = [
+    "agenerate_recipe",
+    "asuggest_recipes_from_pantry",
     "generate_recipe",
+    "stream_recipe",
     "suggest_recipes_from_pantry",
+    "get_client_manager",
+    "get_recipe_cache",
+    "get_single_flight",
 ]
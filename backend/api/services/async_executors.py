@@ -0,0 +1,146 @@
+import asyncio
+import contextvars
+import functools
+import os
+import threading
+from concurrent.futures import ThreadPoolExecutor
+
+from django.conf import settings
+from django.db import close_old_connections
+
+
+def _run_with_fresh_connections(fn, args, kwargs):
+    # Pool threads outlive requests, so they clean up connections themselves.
+    close_old_connections()
+    try:
+        return fn(*args, **kwargs)
+    finally:
+        close_old_connections()
+
+
+class BlockingExecutor:
+    """
+    Bounded thread pool that runs blocking calls for async views.
+
+    ``run`` awaits ``fn(*args, **kwargs)`` on one of at most ``max_workers``
+    threads, with the caller's context variables (Bedrock call attribution,
+    request metrics, replica routing) and with stale database connections
+    closed before and after. The pool is created lazily and again after a
+    fork.
+    """
+
+    def __init__(self, max_workers, name):
+        self.max_workers = max_workers
+        self.name = name
+        self._pool = None
+        self._pid = None
+        self._lock = threading.Lock()
+
+    def _get_pool(self):
+        pid = os.getpid()
+        if self._pool is None or self._pid != pid:
+            with self._lock:
+                if self._pool is None or self._pid != pid:
+                    self._pool = ThreadPoolExecutor(
+                        max_workers=self.max_workers, thread_name_prefix=self.name
+                    )
+                    self._pid = pid
+        return self._pool
+
+    async def run(self, fn, *args, **kwargs):
+        context = contextvars.copy_context()
+        call = functools.partial(context.run, _run_with_fresh_connections, fn, args, kwargs)
+        return await asyncio.get_running_loop().run_in_executor(self._get_pool(), call)
+
+    async def iterate(self, iterable):
+        """
+        Async iterator over a blocking ``iterable``, one item per pool call.
+
+        Items are yielded as soon as each step returns, so a streaming
+        response sends them as they are produced. Every step runs in the
+        same copy of the caller's context, so context variables the
+        iterator sets (``call_context``) last from one item to the next.
+        The iterator is closed on the pool when iteration stops early.
+        """
+        iterator = iter(iterable)
+        context = contextvars.copy_context()
+        loop = asyncio.get_running_loop()
+        done = object()
+
+        def step(fn, *args):
+            call = functools.partial(context.run, _run_with_fresh_connections, fn, args, {})
+            return loop.run_in_executor(self._get_pool(), call)
+
+        try:
+            while True:
+                item = await step(next, iterator, done)
+                if item is done:
+                    return
+                yield item
+        finally:
+            close = getattr(iterator, "close", None)
+            if close is not None:
+                await step(close)
+
+    def shutdown(self):
+        with self._lock:
+            if self._pool is not None:
+                self._pool.shutdown(wait=False)
+            self._pool = None
+            self._pid = None
+
+
+_executors = {}
+_executors_lock = threading.Lock()
+
+
+def _executor(name, max_workers):
+    executor = _executors.get(name)
+    if executor is None:
+        with _executors_lock:
+            executor = _executors.get(name)
+            if executor is None:
+                executor = _executors[name] = BlockingExecutor(max_workers, name)
+    return executor
+
+
+def get_db_executor():
+    """
+    Executor for ORM work from async views, configured from ``settings.ASYNC_VIEWS``.
+
+    Each of its ``DB_THREADS`` threads holds at most one connection, so the
+    pool caps the connections async views open however many requests are in
+    flight.
+    """
+    options = getattr(settings, "ASYNC_VIEWS", {})
+    return _executor("async-db", options.get("DB_THREADS", 8))
+
+
+def get_bedrock_executor():
+    """
+    Executor for blocking Bedrock calls from async views.
+
+    boto3 has no async API, so each in-flight call holds a thread; threads
+    waiting on a socket are cheap and never block the event loop.
+    ``BEDROCK_MAX_IN_FLIGHT`` defaults to the client's connection pool size.
+    """
+    options = getattr(settings, "ASYNC_VIEWS", {})
+    max_workers = options.get("BEDROCK_MAX_IN_FLIGHT") or getattr(
+        settings, "BEDROCK_CLIENT", {}
+    ).get("MAX_POOL_CONNECTIONS", 50)
+    return _executor("async-bedrock", max_workers)
+
+
+async def run_db(fn, *args, **kwargs):
+    """Await ``fn(*args, **kwargs)`` on the database executor."""
+    return await get_db_executor().run(fn, *args, **kwargs)
+
+
+async def run_bedrock(fn, *args, **kwargs):
+    """Await ``fn(*args, **kwargs)`` on the Bedrock executor."""
+    return await get_bedrock_executor().run(fn, *args, **kwargs)
+
+
+def iterate_bedrock(iterable):
+    """Iterate a blocking, Bedrock-bound ``iterable`` on the Bedrock executor."""
+    return get_bedrock_executor().iterate(iterable)
@@ -1,31 +1,30 @@
 import json
-import boto3
-from django.conf import settings
 from botocore.exceptions import ClientError
 
+from .async_executors import run_bedrock, run_db
+from .bedrock_client import get_client_manager
+from .bedrock_metrics import track
+from .recipe_cache import (
+    get_recipe_cache,
+    pantry_cache_key,
+    recipe_cache_enabled,
+    recipe_cache_key,
+)
+from .recipe_stream import iter_recipe_events, iter_text_deltas, replay_recipe_events
+from .single_flight import get_single_flight, single_flight_enabled
+
+
+MODEL_ID = 'anthropic.claude-3-sonnet-20240229-v1:0'  # Replace with your model
+
 
 def get_bedrock_client():
-    """Initialize and return AWS Bedrock client"""
-    return boto3.client(
-        'bedrock-runtime',
-        region_name=settings.AWS_BEDROCK_REGION
-    )
+    """Return the pooled, process-wide AWS Bedrock client"""
+    return get_client_manager().get_client()
 
 
-def generate_recipe(prompt, user_profile=None):
-    """
-    Generate a recipe using AWS Bedrock
-    
-    Args:
-        prompt (str): User's recipe request
-        user_profile (dict): User's profile data including preferences and allergies
-    
-    Returns:
-        dict: Generated recipe data
-    """
-    try:
-        # Construct detailed prompt including user data
-        full_prompt = f"""
+def build_recipe_prompt(prompt, user_profile):
+    """Construct detailed prompt including user data"""
+    return f"""
         Generate a recipe based on the following request: {prompt}
         
         User Profile:
@@ -57,37 +56,105 @@ def generate_recipe(prompt, user_profile=None):
         
         Make sure to consider the user's preferences and avoid any allergens.
         """
+
+
+def build_request_body(full_prompt, max_tokens):
+    """Prepare the request body for Bedrock"""
+    return json.dumps({
+        "messages": [
+            {
+                "role": "user",
+                "content": full_prompt
+            }
+        ],
+        "max_tokens": max_tokens,       # now correct field name for Messages API
+        "temperature": 0.7,
+        "top_p": 0.9,
+        "anthropic_version": "bedrock-2023-05-31",
+    })
+
+
+def _invoke_model(call, body, **kwargs):
+    """Call ``invoke_model`` and return the decoded body; timing, retries and usage go on ``call``"""
+    response = get_bedrock_client().invoke_model(modelId=MODEL_ID, body=body, **kwargs)
+    call.first_byte()
+    call.record_response(response)
+    response_body = json.loads(response['body'].read())
+    call.record_usage(response_body.get("usage"))
+    return response_body
+
+
+def _coalesced(cache_key, invoke):
+    """Run ``invoke`` once for all concurrent callers sharing ``cache_key``"""
+    if not single_flight_enabled():
+        return invoke()
+    lookup = get_recipe_cache().peek if recipe_cache_enabled() else None
+    return get_single_flight().do(cache_key, invoke, lookup=lookup)
+
+
+def generate_recipe(prompt, user_profile=None):
+    """
+    Generate a recipe using AWS Bedrock
+    
+    Responses are cached on the normalized prompt plus the profile fields
+    that are interpolated into the prompt, so repeated requests skip Bedrock.
+    Concurrent identical requests share a single Bedrock call.
+    
+    Args:
+        prompt (str): User's recipe request
+        user_profile (dict): User's profile data including preferences and allergies
+    
+    Returns:
+        dict: Generated recipe data
+    """
+    user_profile = user_profile or {}
+    cache_key = recipe_cache_key(prompt, user_profile)
+    if recipe_cache_enabled():
+        cached = get_recipe_cache().get(cache_key)
+        if cached is not None:
+            return cached
+    
+    return _coalesced(
+        cache_key, lambda: _invoke_generate_recipe(prompt, user_profile, cache_key)
+    )
+
+
+async def agenerate_recipe(prompt, user_profile=None):
+    """
+    ``generate_recipe`` for async views
+    
+    The cache lookup runs on the database executor and the Bedrock call
+    (with coalescing and the cache write) on the Bedrock executor, so the
+    event loop is never blocked.
+    """
+    user_profile = user_profile or {}
+    cache_key = recipe_cache_key(prompt, user_profile)
+    if recipe_cache_enabled():
+        cached = await run_db(get_recipe_cache().get, cache_key)
+        if cached is not None:
+            return cached
+    
+    return await run_bedrock(
+        _coalesced, cache_key, lambda: _invoke_generate_recipe(prompt, user_profile, cache_key)
+    )
+
+
+def _invoke_generate_recipe(prompt, user_profile, cache_key):
+    try:
+        full_prompt = build_recipe_prompt(prompt, user_profile)
+        body = build_request_body(full_prompt, max_tokens=2000)
         
-        client = get_bedrock_client()
-        
-        # Prepare the request body for Bedrock
-        body = json.dumps({
-            "messages": [
-                {
-                    "role": "user",
-                    "content": full_prompt
-                }
-            ],
-            "max_tokens": 2000,       # now correct field name for Messages API
-            "temperature": 0.7,
-            "top_p": 0.9,
-            "anthropic_version": "bedrock-2023-05-31",
-        })
-        
-        # Call Bedrock (replace 'model-id' with your actual model ID)
-        response = client.invoke_model(
-            modelId='anthropic.claude-3-sonnet-20240229-v1:0',  # Replace with your model
-            body=body,
-            contentType='application/json',
+        with track("generate_recipe", MODEL_ID) as call:
+            response_body = _invoke_model(
+                call,
+                body,
+                contentType='application/json',
                 accept="application/json"
-        )
-        
-        # Parse the response
-        response_body = json.loads(response['body'].read())
-        model_output = response_body["content"][0]["text"]
-        recipe_data = json.loads(model_output)
-        
-        return recipe_data
+            )
+            
+            # Parse the response
+            model_output = response_body["content"][0]["text"]
+            recipe_data = json.loads(model_output)
         
     except ClientError as e:
         raise Exception(f"AWS Bedrock error: {str(e)}")
@@ -95,21 +162,56 @@ def generate_recipe(prompt, user_profile=None):
         raise Exception(f"Failed to parse recipe response: {str(e)}")
     except Exception as e:
         raise Exception(f"Recipe generation failed: {str(e)}")
+    
+    # Only successfully parsed responses are cached
+    if recipe_cache_enabled():
+        get_recipe_cache().set(cache_key, recipe_data)
+    return recipe_data
 
 
 def suggest_recipes_from_pantry(grocery_items):
     """
     Suggest recipes based on available ingredients
     
+    Responses are cached on the normalized, order-independent ingredient set,
+    and concurrent identical requests share a single Bedrock call.
+    
     Args:
         grocery_items (list): List of grocery items from user's pantry
     
     Returns:
         list: List of suggested recipe data
     """
+    ingredient_names = [item['ingredient_name'] for item in grocery_items]
+    cache_key = pantry_cache_key(ingredient_names)
+    if recipe_cache_enabled():
+        cached = get_recipe_cache().get(cache_key)
+        if cached is not None:
+            return cached
+    
+    return _coalesced(
+        cache_key, lambda: _invoke_suggest_recipes(ingredient_names, cache_key)
+    )
+
+
+async def asuggest_recipes_from_pantry(grocery_items):
+    """``suggest_recipes_from_pantry`` for async views; see ``agenerate_recipe``"""
+    ingredient_names = [item['ingredient_name'] for item in grocery_items]
+    cache_key = pantry_cache_key(ingredient_names)
+    if recipe_cache_enabled():
+        cached = await run_db(get_recipe_cache().get, cache_key)
+        if cached is not None:
+            return cached
+    
+    return await run_bedrock(
+        _coalesced, cache_key, lambda: _invoke_suggest_recipes(ingredient_names, cache_key)
+    )
+
+
+def _invoke_suggest_recipes(ingredient_names, cache_key):
     try:
         # Format grocery items for the prompt
-        ingredients_text = ", ".join([item['ingredient_name'] for item in grocery_items])
+        ingredients_text = ", ".join(ingredient_names)
         
         full_prompt = f"""
         Suggest 2-3 recipes that can be made with these ingredients: {ingredients_text}
@@ -139,36 +241,82 @@ def suggest_recipes_from_pantry(grocery_items):
         Only use ingredients from the provided list and common pantry staples.
         """
         
-        client = get_bedrock_client()
+        body = build_request_body(full_prompt, max_tokens=3000)
         
-        body = json.dumps({
-            "messages": [
-                {
-                    "role": "user",
-                    "content": full_prompt
-                }
-            ],
-            "max_tokens": 3000,       # now correct field name for Messages API
-            "temperature": 0.7,
-            "top_p": 0.9,
-            "anthropic_version": "bedrock-2023-05-31",
-        })
+        with track("suggest_recipes", MODEL_ID) as call:
+            response_body = _invoke_model(call, body, contentType='application/json')
+            model_output = response_body["content"][0]["text"]
+            recipes_data = json.loads(model_output)
         
-        response = client.invoke_model(
-            modelId='anthropic.claude-3-sonnet-20240229-v1:0',  # Replace with your model
-            body=body,
-            contentType='application/json'
-        )
+    except ClientError as e:
+        raise Exception(f"AWS Bedrock error: {str(e)}")
+    except json.JSONDecodeError as e:
+        raise Exception(f"Failed to parse recipes response: {str(e)}")
+    except Exception as e:
+        raise Exception(f"Recipe suggestion failed: {str(e)}")
+    
+    if recipe_cache_enabled():
+        get_recipe_cache().set(cache_key, recipes_data)
+    return recipes_data
+
+
+def stream_recipe(prompt, user_profile=None):
+    """
+    Generate a recipe using Bedrock's response stream
+    
+    Yields ``(event, data)`` tuples as soon as the recipe name, each
+    ingredient and each step are complete, then ``("recipe", dict)`` with the
+    full object. Cached recipes are replayed without calling Bedrock, and
+    completed recipes are written back to the cache.
+    
+    Args:
+        prompt (str): User's recipe request
+        user_profile (dict): User's profile data including preferences and allergies
+    
+    Yields:
+        tuple: (event name, event data)
+    """
+    user_profile = user_profile or {}
+    cache_key = recipe_cache_key(prompt, user_profile)
+    if recipe_cache_enabled():
+        cached = get_recipe_cache().get(cache_key)
+        if cached is not None:
+            yield from replay_recipe_events(cached)
+            return
+    
+    try:
+        full_prompt = build_recipe_prompt(prompt, user_profile)
         
-        response_body = json.loads(response['body'].read())
-        model_output = response_body["content"][0]["text"]
-        recipes_data = json.loads(model_output)
+        client = get_bedrock_client()
+        body = build_request_body(full_prompt, max_tokens=2000)
         
-        return recipes_data
+        with track("stream_recipe", MODEL_ID) as call:
+            response = client.invoke_model_with_response_stream(
+                modelId=MODEL_ID,
+                body=body,
+                contentType='application/json',
+                accept="application/json"
+            )
+            call.record_response(response)
+            
+            # Time to first byte is the first text delta, not the stream headers
+            usage = {}
+            deltas = iter_text_deltas(response['body'], usage=usage, on_first=call.first_byte)
+            recipe_data = None
+            try:
+                for event, data in iter_recipe_events(deltas):
+                    if event == "recipe":
+                        recipe_data = data
+                    yield event, data
+            finally:
+                call.record_usage(usage)
         
     except ClientError as e:
         raise Exception(f"AWS Bedrock error: {str(e)}")
     except json.JSONDecodeError as e:
-        raise Exception(f"Failed to parse recipes response: {str(e)}")
+        raise Exception(f"Failed to parse recipe response: {str(e)}")
     except Exception as e:
-        raise Exception(f"Recipe suggestion failed: {str(e)}")
+        raise Exception(f"Recipe generation failed: {str(e)}")
+    
+    if recipe_cache_enabled():
+        get_recipe_cache().set(cache_key, recipe_data)
@@ -0,0 +1,200 @@
+import logging
+import os
+import threading
+import time
+
+import boto3
+from botocore.config import Config
+from django.conf import settings
+
+logger = logging.getLogger(__name__)
+
+
+class BedrockClientManager:
+    """
+    Process-wide owner of the ``bedrock-runtime`` client.
+
+    boto3 clients are thread-safe once created, so one client (and its
+    urllib3 connection pool) is shared by every thread in a worker. The client
+    is built lazily on first use and rebuilt automatically after a fork so
+    pre-forking servers never share sockets between workers.
+    """
+
+    def __init__(
+        self,
+        region_name,
+        max_pool_connections=50,
+        connect_timeout=5,
+        read_timeout=120,
+        tcp_keepalive=True,
+        max_attempts=3,
+        backend="aws",
+    ):
+        self.region_name = region_name
+        self.backend = backend
+        self.config = Config(
+            region_name=region_name,
+            max_pool_connections=max_pool_connections,
+            connect_timeout=connect_timeout,
+            read_timeout=read_timeout,
+            tcp_keepalive=tcp_keepalive,
+            retries={"max_attempts": max_attempts, "mode": "standard"},
+        )
+        self._client = None
+        self._pid = None
+        self._lock = threading.Lock()
+        self._created_at = None
+        self._counters = {
+            "clients_created": 0,
+            "requests": 0,
+            "errors": 0,
+            "in_flight": 0,
+            "max_in_flight": 0,
+        }
+
+    # The call's botocore context records that it was counted, so a call
+    # whose before-call hook was skipped (e.g. answered by another handler)
+    # never decrements in_flight.
+    _COUNTED = "_pool_in_flight"
+
+    def _on_before_call(self, context=None, **kwargs):
+        if context is not None:
+            context[self._COUNTED] = True
+        with self._lock:
+            self._counters["requests"] += 1
+            self._counters["in_flight"] += 1
+            self._counters["max_in_flight"] = max(
+                self._counters["max_in_flight"], self._counters["in_flight"]
+            )
+
+    def _finish_call(self, context, error):
+        counted = context is not None and context.pop(self._COUNTED, False)
+        with self._lock:
+            if counted:
+                self._counters["in_flight"] -= 1
+            if error:
+                self._counters["errors"] += 1
+
+    def _on_after_call(self, parsed=None, context=None, **kwargs):
+        self._finish_call(context, bool(parsed and "Error" in parsed))
+
+    def _on_after_call_error(self, context=None, **kwargs):
+        self._finish_call(context, True)
+
+    def _build_client(self):
+        if self.backend == "simulator":
+            # Imported here so production workers never load the simulator.
+            from .bedrock_fake import SimulatedBedrockClient
+
+            return SimulatedBedrockClient.from_settings()
+        # A dedicated session keeps credential resolution off the global
+        # default session, which is not thread-safe.
+        session = boto3.session.Session()
+        client = session.client("bedrock-runtime", config=self.config)
+        events = client.meta.events
+        # before-call fires after parameter validation, so every call it
+        # counts reaches after-call or after-call-error.
+        events.register("before-call.bedrock-runtime", self._on_before_call)
+        events.register("after-call.bedrock-runtime", self._on_after_call)
+        events.register("after-call-error.bedrock-runtime", self._on_after_call_error)
+        return client
+
+    def get_client(self):
+        """Return the shared client, creating it on first use in this process."""
+        pid = os.getpid()
+        client = self._client
+        if client is not None and self._pid == pid:
+            return client
+
+        with self._lock:
+            if self._client is None or self._pid != pid:
+                self._client = self._build_client()
+                self._pid = pid
+                self._created_at = time.time()
+                self._counters["clients_created"] += 1
+                self._counters["in_flight"] = 0
+            return self._client
+
+    def warm_up(self):
+        """
+        Build the client ahead of the first request.
+
+        Resolving credentials and loading the endpoint/service model is most
+        of the cold-start cost; doing it at app start keeps it off the first
+        user's request.
+        """
+        started = time.monotonic()
+        self.get_client()
+        elapsed_ms = (time.monotonic() - started) * 1000
+        logger.info("Bedrock client warmed up in %.1f ms", elapsed_ms)
+        return elapsed_ms
+
+    def use_client(self, client):
+        """
+        Serve ``client`` instead of a boto3 client in this process.
+
+        For benchmarks and local runs with ``FakeBedrockClient``; ``reset``
+        goes back to building the real client.
+        """
+        with self._lock:
+            self._client = client
+            self._pid = os.getpid()
+            self._created_at = time.time()
+
+    def reset(self):
+        """Drop the cached client; the next call builds a fresh one."""
+        with self._lock:
+            self._client = None
+            self._pid = None
+
+    def _pool_stats(self):
+        # urllib3 internals are not public API, so every lookup is guarded.
+        client = self._client
+        stats = {"open_pools": 0, "idle_connections": 0}
+        if client is None:
+            return stats
+        http_session = getattr(getattr(client, "_endpoint", None), "http_session", None)
+        manager = getattr(http_session, "_manager", None)
+        pools = getattr(manager, "pools", None)
+        if pools is None:
+            return stats
+        for key in list(pools.keys()):
+            pool = pools.get(key)
+            if pool is None:
+                continue
+            stats["open_pools"] += 1
+            queue = getattr(pool, "pool", None)
+            if queue is not None:
+                stats["idle_connections"] += sum(1 for conn in list(queue.queue) if conn)
+        return stats
+
+    def metrics(self):
+        with self._lock:
+            metrics = dict(self._counters)
+            metrics["created_at"] = self._created_at
+        metrics["max_pool_connections"] = self.config.max_pool_connections
+        metrics.update(self._pool_stats())
+        return metrics
+
+
+_manager = None
+_manager_lock = threading.Lock()
+
+
+def get_client_manager():
+    """Return the process-wide manager configured from ``settings.BEDROCK_CLIENT``."""
+    global _manager
+    if _manager is None:
+        with _manager_lock:
+            if _manager is None:
+                options = getattr(settings, "BEDROCK_CLIENT", {})
+                _manager = BedrockClientManager(
+                    region_name=settings.AWS_BEDROCK_REGION,
+                    max_pool_connections=options.get("MAX_POOL_CONNECTIONS", 50),
+                    connect_timeout=options.get("CONNECT_TIMEOUT", 5),
+                    read_timeout=options.get("READ_TIMEOUT", 120),
+                    tcp_keepalive=options.get("TCP_KEEPALIVE", True),
+                    max_attempts=options.get("MAX_ATTEMPTS", 3),
+                    backend=options.get("BACKEND", "aws"),
+                )
+    return _manager
@@ -0,0 +1,281 @@
+import hashlib
+import io
+import json
+import math
+import random
+import re
+import threading
+import time
+
+from botocore.exceptions import ClientError
+from django.conf import settings
+
+INGREDIENTS = (
+    ("chicken breast", "400", "g"),
+    ("salmon fillet", "300", "g"),
+    ("tofu", "250", "g"),
+    ("rice", "200", "g"),
+    ("quinoa", "150", "g"),
+    ("spinach", "100", "g"),
+    ("broccoli", "1", "head"),
+    ("onion", "1", ""),
+    ("garlic", "2", "cloves"),
+    ("tomato", "3", ""),
+    ("olive oil", "2", "tbsp"),
+    ("lemon", "1", ""),
+    ("oats", "1", "cup"),
+    ("greek yogurt", "200", "g"),
+    ("egg", "2", ""),
+    ("bell pepper", "1", ""),
+)
+DIFFICULTIES = ("Easy", "Medium", "Hard")
+
+_PANTRY_RE = re.compile(r"made with these ingredients: (?P<names>[^\n]*)")
+
+
+def _digest(text):
+    return hashlib.sha256(text.encode()).digest()
+
+
+def fake_recipe(prompt, ingredient_names=None):
+    """
+    A valid recipe derived only from ``prompt``, so equal prompts give equal recipes.
+
+    ``ingredient_names`` restricts the ingredients, as a pantry suggestion would.
+    """
+    digest = _digest(prompt)
+    if ingredient_names:
+        ingredients = [
+            {"item": name, "amount": str(1 + digest[i % len(digest)] % 4), "unit": ""}
+            for i, name in enumerate(ingredient_names[:6])
+        ]
+    else:
+        picks = sorted({digest[i] % len(INGREDIENTS) for i in range(5)})
+        ingredients = [
+            {"item": item, "amount": amount, "unit": unit}
+            for item, amount, unit in (INGREDIENTS[i] for i in picks)
+        ]
+    protein, carbs, fat = 10 + digest[5] % 40, 20 + digest[6] % 60, 5 + digest[7] % 25
+    return {
+        "name": f"Recipe {digest.hex()[:8]}",
+        "time_taken_minutes": 10 + digest[8] % 50,
+        "difficulty": DIFFICULTIES[digest[9] % len(DIFFICULTIES)],
+        "calories": protein * 4 + carbs * 4 + fat * 9,
+        "macros": {"protein": f"{protein}g", "carbs": f"{carbs}g", "fat": f"{fat}g"},
+        "ingredients": ingredients,
+        "steps": [f"Step {n}: Prepare the {i['item']}." for n, i in enumerate(ingredients, 1)],
+    }
+
+
+def _tokens(text):
+    # Roughly four characters per token, as for English text.
+    return max(1, len(text) // 4)
+
+
+def _event(payload):
+    return {"chunk": {"bytes": json.dumps(payload).encode()}}
+
+
+class FakeBedrockClient:
+    """
+    In-process stand-in for a ``bedrock-runtime`` client.
+
+    Implements ``invoke_model`` and ``invoke_model_with_response_stream``
+    for the Messages API, answering with recipes derived from the prompt
+    (see ``fake_recipe``), so benchmarks are repeatable and need no AWS
+    account. ``latency_ms`` is slept once per call; streams spread it over
+    their chunks.
+    """
+
+    def __init__(self, latency_ms=0, chunk_size=40):
+        self.latency_ms = latency_ms
+        self.chunk_size = chunk_size
+        self.calls = 0
+
+    def _answer(self, body):
+        request = json.loads(body)
+        prompt = request["messages"][0]["content"]
+        match = _PANTRY_RE.search(prompt)
+        if match:
+            names = [name.strip() for name in match.group("names").split(",") if name.strip()]
+            output = [fake_recipe(f"{prompt}#{n}", names) for n in range(2)]
+        else:
+            output = fake_recipe(prompt)
+        return prompt, json.dumps(output)
+
+    def _chunks(self, text):
+        return [text[i:i + self.chunk_size] for i in range(0, len(text), self.chunk_size)]
+
+    def _response(self, body, retries=0):
+        return {
+            "ResponseMetadata": {"HTTPStatusCode": 200, "RetryAttempts": retries},
+            "contentType": "application/json",
+            "body": body,
+        }
+
+    def _message_body(self, model_id, prompt, text):
+        payload = {
+            "id": f"msg_fake_{self.calls}",
+            "type": "message",
+            "role": "assistant",
+            "model": model_id,
+            "content": [{"type": "text", "text": text}],
+            "stop_reason": "end_turn",
+            "usage": {"input_tokens": _tokens(prompt), "output_tokens": _tokens(text)},
+        }
+        return io.BytesIO(json.dumps(payload).encode())
+
+    def invoke_model(self, modelId, body, **kwargs):
+        self.calls += 1
+        prompt, text = self._answer(body)
+        if self.latency_ms:
+            time.sleep(self.latency_ms / 1000)
+        return self._response(self._message_body(modelId, prompt, text))
+
+    def invoke_model_with_response_stream(self, modelId, body, **kwargs):
+        self.calls += 1
+        prompt, text = self._answer(body)
+        chunks = self._chunks(text)
+        delay = self.latency_ms / 1000 / (len(chunks) + 1) if self.latency_ms else 0
+        return self._response(self._stream(prompt, text, chunks, [delay] * len(chunks)))
+
+    def _stream(self, prompt, text, chunks, delays):
+        """Stream events for ``chunks``, sleeping ``delays[i]`` before chunk ``i``."""
+        yield _event({"type": "message_start", "message": {"usage": {"input_tokens": _tokens(prompt)}}})
+        for chunk, delay in zip(chunks, delays):
+            if delay:
+                time.sleep(delay)
+            yield _event(
+                {"type": "content_block_delta", "index": 0, "delta": {"type": "text_delta", "text": chunk}}
+            )
+        yield _event({"type": "message_delta", "usage": {"output_tokens": _tokens(text)}})
+        yield _event({"type": "message_stop"})
+
+
+class SimulatedBedrockClient(FakeBedrockClient):
+    """
+    A ``FakeBedrockClient`` that behaves like Bedrock under load.
+
+    The time to first byte is drawn from a log-normal distribution around
+    ``ttfb_median_ms``. After that, output arrives at
+    ``output_tokens_per_second``, all at once for ``invoke_model`` and paced
+    chunk by chunk for streams. A call is throttled with probability
+    ``throttle_rate``, and also whenever ``max_concurrency`` calls are
+    already in flight (0 means no limit), like an account quota.
+    Throttled attempts are retried with boto3's "standard" backoff up to
+    ``max_attempts``. After that a ``ThrottlingException`` ``ClientError``
+    is raised.
+    """
+
+    def __init__(
+        self,
+        ttfb_median_ms=700,
+        ttfb_sigma=0.4,
+        output_tokens_per_second=80,
+        throttle_rate=0.0,
+        max_concurrency=0,
+        max_attempts=3,
+        seed=None,
+        chunk_size=40,
+    ):
+        super().__init__(chunk_size=chunk_size)
+        self.ttfb_median_ms = ttfb_median_ms
+        self.ttfb_sigma = ttfb_sigma
+        self.output_tokens_per_second = output_tokens_per_second
+        self.throttle_rate = throttle_rate
+        self.max_concurrency = max_concurrency
+        self.max_attempts = max(1, max_attempts)
+        self._random = random.Random(seed)
+        self._lock = threading.Lock()
+        self._in_flight = 0
+        self._counters = {"calls": 0, "attempts": 0, "throttled": 0, "failed": 0, "max_in_flight": 0}
+
+    @classmethod
+    def from_settings(cls):
+        """Configured from ``settings.BEDROCK_SIMULATOR`` and ``BEDROCK_CLIENT["MAX_ATTEMPTS"]``."""
+        options = getattr(settings, "BEDROCK_SIMULATOR", {})
+        return cls(
+            ttfb_median_ms=options.get("TTFB_MEDIAN_MS", 700),
+            ttfb_sigma=options.get("TTFB_SIGMA", 0.4),
+            output_tokens_per_second=options.get("OUTPUT_TOKENS_PER_SECOND", 80),
+            throttle_rate=options.get("THROTTLE_RATE", 0.0),
+            max_concurrency=options.get("MAX_CONCURRENCY", 0),
+            max_attempts=getattr(settings, "BEDROCK_CLIENT", {}).get("MAX_ATTEMPTS", 3),
+            seed=options.get("SEED"),
+        )
+
+    def _ttfb_seconds(self):
+        with self._lock:
+            sample = self._random.lognormvariate(math.log(self.ttfb_median_ms), self.ttfb_sigma)
+        return sample / 1000
+
+    def _generation_seconds(self, text):
+        if not self.output_tokens_per_second:
+            return 0.0
+        return _tokens(text) / self.output_tokens_per_second
+
+    def _acquire(self, operation):
+        """Take a concurrency slot, retrying throttled attempts; returns the retry count."""
+        for attempt in range(self.max_attempts):
+            with self._lock:
+                self._counters["attempts"] += 1
+                throttled = self._random.random() < self.throttle_rate or (
+                    self.max_concurrency and self._in_flight >= self.max_concurrency
+                )
+                if not throttled:
+                    self._in_flight += 1
+                    self._counters["max_in_flight"] = max(
+                        self._counters["max_in_flight"], self._in_flight
+                    )
+                    return attempt
+                self._counters["throttled"] += 1
+                backoff = min(20.0, self._random.random() * 2 ** attempt)
+            if attempt + 1 < self.max_attempts:
+                time.sleep(backoff)
+        with self._lock:
+            self._counters["failed"] += 1
+        raise ClientError(
+            {
+                "Error": {"Code": "ThrottlingException", "Message": "Too many requests (simulated)"},
+                "ResponseMetadata": {"HTTPStatusCode": 429, "RetryAttempts": self.max_attempts - 1},
+            },
+            operation,
+        )
+
+    def _release(self):
+        with self._lock:
+            self._in_flight -= 1
+
+    def invoke_model(self, modelId, body, **kwargs):
+        with self._lock:
+            self._counters["calls"] += 1
+            self.calls += 1
+        prompt, text = self._answer(body)
+        retries = self._acquire("InvokeModel")
+        try:
+            time.sleep(self._ttfb_seconds() + self._generation_seconds(text))
+        finally:
+            self._release()
+        return self._response(self._message_body(modelId, prompt, text), retries)
+
+    def invoke_model_with_response_stream(self, modelId, body, **kwargs):
+        with self._lock:
+            self._counters["calls"] += 1
+            self.calls += 1
+        prompt, text = self._answer(body)
+        retries = self._acquire("InvokeModelWithResponseStream")
+        chunks = self._chunks(text)
+        per_chunk = self._generation_seconds(text) / max(len(chunks), 1)
+        delays = [self._ttfb_seconds()] + [per_chunk] * (len(chunks) - 1)
+        return self._response(self._released_stream(prompt, text, chunks, delays), retries)
+
+    def _released_stream(self, prompt, text, chunks, delays):
+        # The slot is held until the stream ends or the caller drops it.
+        try:
+            yield from self._stream(prompt, text, chunks, delays)
+        finally:
+            self._release()
+
+    def stats(self):
+        with self._lock:
+            return {**self._counters, "in_flight": self._in_flight}
@@ -0,0 +1,256 @@
+import json
+import logging
+import os
+import threading
+import time
+from collections import OrderedDict
+from contextlib import contextmanager
+from contextvars import ContextVar
+from decimal import Decimal
+
+from django.conf import settings
+
+from .histogram import INF, Histogram
+
+logger = logging.getLogger(__name__)
+
+# Upper bounds (ms) of the latency histogram buckets; the last is open-ended.
+LATENCY_BUCKETS_MS = (
+    50, 100, 250, 500, 1000, 2500, 5000, 10000, 20000, 30000, 60000, INF,
+)
+
+# Same values as BedrockCallLog.STATUS_*; api.models can't be imported here
+# because it imports api.services.
+STATUS_OK = "ok"
+STATUS_ERROR = "error"
+STATUS_PARSE_ERROR = "parse_error"
+STATUS_CANCELLED = "cancelled"
+
+# (endpoint, user id) of the request a Bedrock call is made for.
+_context = ContextVar("bedrock_call_context", default=(None, None))
+
+
+@contextmanager
+def call_context(endpoint, user_id=None):
+    """Attribute Bedrock calls made inside this block to ``endpoint`` and ``user_id``."""
+    token = _context.set((endpoint, user_id))
+    try:
+        yield
+    finally:
+        _context.reset(token)
+
+
+def _options():
+    return getattr(settings, "BEDROCK_METRICS", {})
+
+
+def metrics_enabled():
+    return _options().get("ENABLED", True)
+
+
+def call_cost(model_id, input_tokens, output_tokens):
+    """USD cost from ``BEDROCK_METRICS["PRICING"]``, or ``None`` if the model isn't priced."""
+    pricing = _options().get("PRICING", {}).get(model_id)
+    if not pricing or input_tokens is None or output_tokens is None:
+        return None
+    return (
+        input_tokens / 1000 * pricing["INPUT_PER_1K"]
+        + output_tokens / 1000 * pricing["OUTPUT_PER_1K"]
+    )
+
+
+class BedrockCall:
+    """Measurements for one Bedrock request, filled in while it runs."""
+
+    def __init__(self, operation, model_id):
+        self.endpoint, self.user_id = _context.get()
+        self.endpoint = self.endpoint or operation
+        self.operation = operation
+        self.model_id = model_id
+        self.status = STATUS_OK
+        self.error = ""
+        self.retries = 0
+        self.input_tokens = None
+        self.output_tokens = None
+        self.ttfb_ms = None
+        self.wall_ms = None
+        self._started = time.perf_counter()
+
+    def first_byte(self):
+        """Mark the first response byte (headers, or the first streamed chunk)."""
+        if self.ttfb_ms is None:
+            self.ttfb_ms = (time.perf_counter() - self._started) * 1000
+
+    def record_response(self, response):
+        """Read the retry count boto3 reports for a response."""
+        self.retries = response.get("ResponseMetadata", {}).get("RetryAttempts", 0) or 0
+
+    def record_usage(self, usage):
+        """Token counts from a Messages API ``usage`` block."""
+        if not isinstance(usage, dict):
+            return
+        if usage.get("input_tokens") is not None:
+            self.input_tokens = usage["input_tokens"]
+        if usage.get("output_tokens") is not None:
+            self.output_tokens = usage["output_tokens"]
+
+    def finish(self):
+        self.wall_ms = (time.perf_counter() - self._started) * 1000
+
+    @property
+    def cost_usd(self):
+        return call_cost(self.model_id, self.input_tokens, self.output_tokens)
+
+
+class CallStats:
+    """Counters and latency histograms for one endpoint, user or model."""
+
+    def __init__(self):
+        self.calls = 0
+        self.statuses = {}
+        self.retries = 0
+        self.input_tokens = 0
+        self.output_tokens = 0
+        self.cost_usd = 0.0
+        self.wall_ms = Histogram(LATENCY_BUCKETS_MS)
+        self.ttfb_ms = Histogram(LATENCY_BUCKETS_MS)
+
+    def add(self, call):
+        self.calls += 1
+        self.statuses[call.status] = self.statuses.get(call.status, 0) + 1
+        self.retries += call.retries
+        self.input_tokens += call.input_tokens or 0
+        self.output_tokens += call.output_tokens or 0
+        self.cost_usd += call.cost_usd or 0.0
+        self.wall_ms.observe(call.wall_ms)
+        if call.ttfb_ms is not None:
+            self.ttfb_ms.observe(call.ttfb_ms)
+
+    def snapshot(self):
+        return {
+            "calls": self.calls,
+            "errors": self.statuses.get(STATUS_ERROR, 0),
+            "parse_failures": self.statuses.get(STATUS_PARSE_ERROR, 0),
+            "cancelled": self.statuses.get(STATUS_CANCELLED, 0),
+            "retries": self.retries,
+            "input_tokens": self.input_tokens,
+            "output_tokens": self.output_tokens,
+            "cost_usd": round(self.cost_usd, 6),
+            "wall_ms": self.wall_ms.snapshot(),
+            "ttfb_ms": self.ttfb_ms.snapshot(),
+        }
+
+
+class BedrockMetrics:
+    """
+    In-process aggregation of instrumented Bedrock calls.
+
+    Calls are grouped by endpoint, by model and by user. Only the
+    ``max_users`` most recently active users are kept, so memory stays
+    bounded. Each worker process aggregates its own calls; persist them
+    with ``BEDROCK_METRICS["PERSIST"]`` to see every worker together.
+    """
+
+    def __init__(self, max_users=1000):
+        self.max_users = max_users
+        self._lock = threading.Lock()
+        self.reset()
+
+    def reset(self):
+        with self._lock:
+            self._started_at = time.time()
+            self._total = CallStats()
+            self._endpoints = {}
+            self._models = {}
+            self._users = OrderedDict()
+
+    def record(self, call):
+        with self._lock:
+            self._total.add(call)
+            self._endpoints.setdefault(call.endpoint, CallStats()).add(call)
+            self._models.setdefault(call.model_id, CallStats()).add(call)
+            if call.user_id is not None:
+                stats = self._users.pop(call.user_id, None) or CallStats()
+                stats.add(call)
+                self._users[call.user_id] = stats
+                while len(self._users) > self.max_users:
+                    self._users.popitem(last=False)
+
+    def snapshot(self, top_users=20):
+        """Aggregates since start (or ``reset``); users are the top ``top_users`` by calls."""
+        with self._lock:
+            users = sorted(self._users.items(), key=lambda item: -item[1].calls)[:top_users]
+            return {
+                "pid": os.getpid(),
+                "since": self._started_at,
+                "total": self._total.snapshot(),
+                "endpoints": {name: stats.snapshot() for name, stats in self._endpoints.items()},
+                "models": {name: stats.snapshot() for name, stats in self._models.items()},
+                "users": {str(user_id): stats.snapshot() for user_id, stats in users},
+            }
+
+
+_metrics = None
+_metrics_lock = threading.Lock()
+
+
+def get_bedrock_metrics():
+    """Return the process-wide aggregator configured from ``settings.BEDROCK_METRICS``."""
+    global _metrics
+    if _metrics is None:
+        with _metrics_lock:
+            if _metrics is None:
+                _metrics = BedrockMetrics(max_users=_options().get("MAX_USERS", 1000))
+    return _metrics
+
+
+def _persist(call):
+    from ..models import BedrockCallLog
+
+    cost = call.cost_usd
+    BedrockCallLog.objects.create(
+        endpoint=call.endpoint[:100],
+        operation=call.operation,
+        model_id=call.model_id,
+        user_id=call.user_id,
+        status=call.status,
+        wall_ms=call.wall_ms,
+        ttfb_ms=call.ttfb_ms,
+        input_tokens=call.input_tokens,
+        output_tokens=call.output_tokens,
+        retries=call.retries,
+        cost_usd=None if cost is None else Decimal(str(round(cost, 6))),
+        error=call.error,
+    )
+
+
+@contextmanager
+def track(operation, model_id):
+    """
+    Time a Bedrock call and record it when the block exits.
+
+    ``json.JSONDecodeError`` counts as a parse failure, ``GeneratorExit`` (a
+    streaming client that went away) as cancelled and anything else as an
+    error. Recording never raises into the caller.
+    """
+    call = BedrockCall(operation, model_id)
+    try:
+        yield call
+    except json.JSONDecodeError as e:
+        call.status, call.error = STATUS_PARSE_ERROR, str(e)
+        raise
+    except GeneratorExit:
+        call.status = STATUS_CANCELLED
+        raise
+    except BaseException as e:
+        call.status, call.error = STATUS_ERROR, str(e)
+        raise
+    finally:
+        call.finish()
+        if metrics_enabled():
+            try:
+                get_bedrock_metrics().record(call)
+                if _options().get("PERSIST"):
+                    _persist(call)
+            except Exception:
+                logger.exception("Recording Bedrock call metrics failed")
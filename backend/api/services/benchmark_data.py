@@ -0,0 +1,123 @@
+from datetime import timedelta
+
+from django.contrib.auth import get_user_model
+from django.db.models import Max
+from django.utils import timezone
+
+from users.models import UserProfile
+from users.tokens import UserRefreshToken
+
+from ..models import GroceryItem, GroceryList, MealHistory, PantryItem, Recipe, UserSavedRecipe
+from .bedrock_fake import INGREDIENTS, fake_recipe
+from .nutrition import rebuild_rollups
+
+# Benchmark accounts use this domain so they are easy to find and remove.
+EMAIL_DOMAIN = "benchmark.invalid"
+PASSWORD = "benchmark-password-1"
+
+PANTRY_NAMES = [item for item, _, _ in INGREDIENTS] + [
+    "flour", "sugar", "salt", "black pepper", "butter", "milk", "honey", "soy sauce",
+    "vinegar", "cumin", "paprika", "oregano", "basil", "carrot", "potato", "lentils",
+]
+
+
+def next_recipe_id():
+    """Lowest id a recipe created from now on can have; pass it to ``clean_up``."""
+    return (Recipe.objects.aggregate(last=Max("id"))["last"] or 0) + 1
+
+
+def seed_recipes(stamp, count):
+    """Create ``count`` stored recipes and return their ids."""
+    # Recipes go through save() so the ingredient index, search vector
+    # and macro columns are maintained as in production.
+    return [
+        Recipe.objects.create(**fake_recipe(f"benchmark recipe {stamp} {n}")).id
+        for n in range(count)
+    ]
+
+
+def seed_user(
+    username,
+    recipe_ids=(),
+    saved_recipes=0,
+    pantry_items=0,
+    grocery_lists=0,
+    items_per_list=0,
+    meals=0,
+    is_staff=False,
+):
+    """
+    Create a benchmark account with realistic data.
+
+    Returns a dict with the ``user``, an access ``token`` and the ids of its
+    first grocery list (``list_id``) and meal (``meal_id``), when seeded.
+    """
+    user = get_user_model().objects.create_user(
+        username=username, email=f"{username}@{EMAIL_DOMAIN}", password=PASSWORD, is_staff=is_staff
+    )
+    if is_staff:
+        UserProfile.objects.create(user=user)
+    else:
+        UserProfile.objects.create(
+            user=user, goal="lose_fat", preferences=["high protein"], allergies=["peanuts"]
+        )
+    seeded = {"user": user, "list_id": None, "meal_id": None}
+
+    UserSavedRecipe.objects.bulk_create(
+        UserSavedRecipe(user=user, recipe_id=recipe_id) for recipe_id in recipe_ids[:saved_recipes]
+    )
+    PantryItem.objects.bulk_create(
+        PantryItem(user=user, name=f"{PANTRY_NAMES[n % len(PANTRY_NAMES)]} {n // len(PANTRY_NAMES) or ''}".strip())
+        for n in range(pantry_items)
+    )
+    lists = GroceryList.objects.bulk_create(
+        GroceryList(user=user, name=f"List {n}") for n in range(grocery_lists)
+    )
+    GroceryItem.objects.bulk_create(
+        GroceryItem(
+            grocery_list=grocery_list,
+            ingredient=PANTRY_NAMES[n % len(PANTRY_NAMES)],
+            quantity=f"{n % 5 + 1}00 g",
+            price=1.5,
+            macros={"protein": "5g", "carbs": "10g", "fat": "2g"},
+        )
+        for grocery_list in lists
+        for n in range(items_per_list)
+    )
+    if lists:
+        seeded["list_id"] = lists[0].id
+
+    if meals:
+        now = timezone.now()
+        history = MealHistory.objects.bulk_create(
+            MealHistory(
+                user=user,
+                recipe_name=f"Meal {n}",
+                calories_consumed=400 + n % 300,
+                macros_consumed={"protein": 30, "carbs": 45, "fat": 12},
+                eaten_at=now - timedelta(hours=8 * n),
+            )
+            for n in range(meals)
+        )
+        rebuild_rollups(user=user)
+        seeded["meal_id"] = history[0].id
+
+    seeded["token"] = str(UserRefreshToken.for_user(user).access_token)
+    return seeded
+
+
+def clean_up(recipe_ids, first_new_recipe):
+    """
+    Delete every benchmark account, the seeded ``recipe_ids`` and the
+    recipes created since ``first_new_recipe`` that no other account uses.
+    """
+    User = get_user_model()
+    others = User.objects.exclude(email__endswith=f"@{EMAIL_DOMAIN}")
+    created = (
+        Recipe.objects.filter(id__gte=first_new_recipe)
+        .exclude(usersavedrecipe__user__in=others)
+        .exclude(mealplanentry__plan__user__in=others)
+    )
+    User.objects.filter(email__endswith=f"@{EMAIL_DOMAIN}").delete()
+    Recipe.objects.filter(id__in=recipe_ids).delete()
+    created.delete()
@@ -0,0 +1,175 @@
+from django.db import transaction
+from django.utils import timezone
+
+from ..models import GroceryItem, GroceryList, SyncChange
+from ..serializers import GroceryItemBulkSerializer, GroceryItemSerializer
+from . import sync
+
+OP_CREATE = "create"
+OP_UPDATE = "update"
+OP_DELETE = "delete"
+OPERATIONS = (OP_CREATE, OP_UPDATE, OP_DELETE)
+
+
+class BulkOperationError(Exception):
+    """The request body is not a list of operations at all."""
+
+
+def _parse(operations, max_operations):
+    if not isinstance(operations, list):
+        raise BulkOperationError("operations must be a list")
+    if not operations:
+        raise BulkOperationError("operations must not be empty")
+    if len(operations) > max_operations:
+        raise BulkOperationError(f"At most {max_operations} operations per request")
+    return operations
+
+
+def apply_grocery_item_operations(user, operations, max_operations=500):
+    """
+    Validate and apply a batch of grocery item operations for ``user``.
+
+    Each operation is ``{"op": "create", "data": {...}}``,
+    ``{"op": "update", "id": <item id>, "data": {...}}`` (partial) or
+    ``{"op": "delete", "id": <item id>}``. Items and grocery lists are loaded
+    with one query each, so ownership is checked once per referenced list
+    rather than once per item.
+
+    The batch is all-or-nothing: if any operation is invalid nothing is
+    written. Returns ``(applied, results)`` where ``results`` has one entry
+    per operation, in request order. Raises ``BulkOperationError`` if
+    ``operations`` is not a non-empty list.
+    """
+    operations = _parse(operations, max_operations)
+    results = [{"index": index} for index in range(len(operations))]
+
+    # First pass: shape and field validation, collecting the ids to look up.
+    item_ids = set()
+    list_ids = set()
+    validated = {}
+    for result, operation in zip(results, operations):
+        op = operation.get("op") if isinstance(operation, dict) else None
+        result["op"] = op
+        if op not in OPERATIONS:
+            result["errors"] = {"op": [f"Must be one of {', '.join(OPERATIONS)}."]}
+            continue
+        if op != OP_CREATE:
+            item_id = operation.get("id")
+            if not isinstance(item_id, int) or isinstance(item_id, bool):
+                result["errors"] = {"id": ["An integer item id is required."]}
+                continue
+            if item_id in item_ids:
+                result["errors"] = {"id": ["Item is referenced by more than one operation."]}
+                continue
+            result["id"] = item_id
+            item_ids.add(item_id)
+        if op == OP_DELETE:
+            continue
+
+        serializer = GroceryItemBulkSerializer(
+            data=operation.get("data"), partial=op == OP_UPDATE
+        )
+        if not serializer.is_valid():
+            result["errors"] = serializer.errors
+            continue
+        fields = dict(serializer.validated_data)
+        if op == OP_CREATE and fields.get("grocery_list") is None:
+            result["errors"] = {"grocery_list": ["This field is required."]}
+            continue
+        if "grocery_list" in fields:
+            list_ids.add(fields["grocery_list"])
+        validated[result["index"]] = fields
+
+    items = GroceryItem.objects.filter(id__in=item_ids, grocery_list__user=user).in_bulk()
+    list_owners = dict(
+        GroceryList.objects.filter(id__in=list_ids).values_list("id", "user_id")
+    )
+
+    # Second pass: existence and ownership, without further queries.
+    to_create = []
+    to_update = []
+    to_delete = []
+    for result in results:
+        if "errors" in result:
+            continue
+        op = result["op"]
+        instance = None
+        if op != OP_CREATE:
+            instance = items.get(result["id"])
+            if instance is None:
+                result["errors"] = {"id": ["Grocery item not found."]}
+                continue
+        if op == OP_DELETE:
+            to_delete.append((result, instance))
+            continue
+
+        fields = validated[result["index"]]
+        if "grocery_list" in fields:
+            list_id = fields.pop("grocery_list")
+            if list_id not in list_owners:
+                result["errors"] = {
+                    "grocery_list": [f'Invalid pk "{list_id}" - object does not exist.']
+                }
+                continue
+            if list_owners[list_id] != user.id:
+                result["errors"] = {
+                    "grocery_list": ["You cannot use another user's grocery list."]
+                }
+                continue
+            fields["grocery_list_id"] = list_id
+
+        # bulk writes skip save(), so refresh the numeric macro columns here.
+        if op == OP_CREATE:
+            item = GroceryItem(**fields)
+            item.sync_macro_columns()
+            to_create.append((result, item))
+        else:
+            for name, value in fields.items():
+                setattr(instance, name, value)
+            changed = set(fields)
+            if "macros" in changed:
+                instance.sync_macro_columns()
+                changed |= set(GroceryItem.MACRO_COLUMNS)
+            to_update.append((result, instance, changed))
+
+    if any("errors" in result for result in results):
+        for result in results:
+            result["status"] = "invalid" if "errors" in result else "not_applied"
+        return False, results
+
+    with transaction.atomic():
+        created = GroceryItem.objects.bulk_create([item for _, item in to_create])
+        if to_update:
+            # bulk_update skips auto_now, and conditional GETs rely on it.
+            now = timezone.now()
+            for _, instance, _ in to_update:
+                instance.updated_at = now
+            update_fields = set().union(*(fields for _, _, fields in to_update))
+            GroceryItem.objects.bulk_update(
+                [instance for _, instance, _ in to_update],
+                sorted(update_fields | {"updated_at"}),
+            )
+        deleted_ids = [item.pk for _, item in to_delete]
+        if deleted_ids:
+            with sync.recorded_explicitly():
+                GroceryItem.objects.filter(id__in=deleted_ids).delete()
+        # bulk_create/bulk_update send no signals, so log the batch here.
+        sync.record_changes(
+            user.id,
+            SyncChange.KIND_GROCERY_ITEM,
+            [item.pk for item in created] + [instance.pk for _, instance, _ in to_update],
+            SyncChange.OP_UPSERT,
+        )
+        sync.record_changes(
+            user.id, SyncChange.KIND_GROCERY_ITEM, deleted_ids, SyncChange.OP_DELETE
+        )
+
+    for (result, _), item in zip(to_create, created):
+        result["status"] = "created"
+        result["item"] = GroceryItemSerializer(item).data
+    for result, instance, _ in to_update:
+        result["status"] = "updated"
+        result["item"] = GroceryItemSerializer(instance).data
+    for result, _ in to_delete:
+        result["status"] = "deleted"
+    return True, results
@@ -0,0 +1,273 @@
+import time
+
+from django.db import transaction
+from django.utils import timezone
+
+from ..models import GroceryItem, PantryItem, Recipe, SyncChange
+from ..models.macros import parse_grams
+from . import sync
+from .ingredients import normalize_ingredient
+from .quantity import COUNT, MASS, format_quantity, parse_amount, parse_quantity
+
+# Typical weight of one item, used to fold counts into grams when the same
+# ingredient is also listed by weight ("1 onion" + "200 g onion").
+PIECE_GRAMS = {
+    "onion": 150.0,
+    "red onion": 150.0,
+    "shallot": 40.0,
+    "tomato": 120.0,
+    "potato": 210.0,
+    "sweet potato": 200.0,
+    "carrot": 60.0,
+    "bell pepper": 150.0,
+    "zucchini": 200.0,
+    "cucumber": 300.0,
+    "avocado": 170.0,
+    "apple": 180.0,
+    "banana": 120.0,
+    "lemon": 100.0,
+    "lime": 65.0,
+    "egg": 50.0,
+    "chicken breast": 200.0,
+}
+
+
+class RecipeNotFound(Exception):
+    """Some of the recipes to add don't exist."""
+
+
+class QuantityTooLong(Exception):
+    """A combined quantity doesn't fit ``GroceryItem.quantity``."""
+
+
+class MergedIngredient:
+    """Everything on the list for one normalized ingredient name."""
+
+    __slots__ = ("name", "display_name", "amounts", "unparsed", "items", "sources")
+
+    def __init__(self, name, display_name):
+        self.name = name
+        self.display_name = display_name
+        self.amounts = {}  # dimension -> total in the canonical unit
+        self.unparsed = []
+        self.items = []  # existing GroceryItems folded into this row
+        self.sources = 0
+
+    def add(self, quantity, raw_text):
+        self.sources += 1
+        self._add(quantity, raw_text)
+
+    def add_text(self, text):
+        """Add a stored quantity, which may itself be combined ("200 g + to taste")."""
+        self.sources += 1
+        for part in (text or "").split(" + "):
+            self._add(parse_quantity(part), part)
+
+    def _add(self, quantity, raw_text):
+        if quantity.amount is None:
+            # Kept as a note next to the totals ("to taste", "1 bunch").
+            note = (raw_text or "").strip()
+            if note and note not in self.unparsed:
+                self.unparsed.append(note)
+            return
+        self.amounts[quantity.dimension] = (
+            self.amounts.get(quantity.dimension, 0.0) + quantity.amount
+        )
+
+    def quantity(self):
+        amounts = dict(self.amounts)
+        piece_grams = PIECE_GRAMS.get(self.name)
+        if piece_grams and MASS in amounts and COUNT in amounts:
+            amounts[MASS] += amounts.pop(COUNT) * piece_grams
+        parts = [format_quantity(amounts)] if amounts else []
+        return " + ".join(parts + self.unparsed) or "as needed"
+
+    def price(self):
+        """Combined price of the merged rows, ``None`` if none has one."""
+        prices = [item.price for item in self.items if item.price is not None]
+        return round(sum(prices), 2) if prices else None
+
+    def macros(self):
+        """
+        Combined macros of the merged rows.
+
+        Amounts that parse (``25``, ``"25g"``) are summed per key; a key with
+        no parseable amount keeps the first row's value.
+        """
+        totals, others = {}, {}
+        for item in self.items:
+            if not isinstance(item.macros, dict):
+                continue
+            for key, value in item.macros.items():
+                grams = parse_grams(value)
+                if grams is None:
+                    others.setdefault(key, value)
+                else:
+                    totals[key] = totals.get(key, 0.0) + grams
+        if not totals and not others:
+            return None
+        return {**others, **{key: round(value, 1) for key, value in totals.items()}}
+
+
+def consolidate_lines(existing_items, recipe_ingredients, pantry_names=()):
+    """
+    Merge grocery items and recipe ingredients by normalized name.
+
+    ``existing_items`` are ``GroceryItem`` instances; ``recipe_ingredients``
+    are ``Recipe.ingredients`` entries (``{"item", "amount", "unit"}``).
+    Recipe ingredients the pantry already holds are left out; items the user
+    put on the list themselves are always kept. Returns
+    ``(merged, in_pantry)``: ``{name: MergedIngredient}`` in first-seen
+    order, and the sorted names skipped because of the pantry.
+    """
+    names = {}
+
+    def normalized(raw):
+        # The same few names repeat across recipes; normalize each once.
+        if raw not in names:
+            names[raw] = normalize_ingredient(raw)
+        return names[raw]
+
+    pantry = {normalized(name) for name in pantry_names}
+    merged = {}
+    in_pantry = set()
+
+    for item in existing_items:
+        name = normalized(item.ingredient) or item.ingredient.strip().lower()
+        entry = merged.get(name)
+        if entry is None:
+            entry = merged[name] = MergedIngredient(name, item.ingredient)
+        entry.add_text(item.quantity)
+        entry.items.append(item)
+
+    for ingredient in recipe_ingredients:
+        if isinstance(ingredient, dict):
+            raw = ingredient.get("item") or ingredient.get("name") or ""
+            amount, unit = ingredient.get("amount"), ingredient.get("unit")
+        else:
+            raw, amount, unit = str(ingredient), None, None
+        name = normalized(raw)
+        if not name:
+            continue
+        if name in pantry:
+            in_pantry.add(name)
+            continue
+        entry = merged.get(name)
+        if entry is None:
+            entry = merged[name] = MergedIngredient(name, name)
+        entry.add(parse_amount(amount, unit), f"{amount or ''} {unit or ''}".strip())
+
+    return merged, sorted(in_pantry)
+
+
+def _recipe_ingredients(recipe_ids):
+    """Ingredients of each requested recipe, in one query; a repeated id counts twice."""
+    found = dict(Recipe.objects.filter(id__in=set(recipe_ids)).values_list("id", "ingredients"))
+    missing = sorted(set(recipe_ids) - set(found))
+    ingredients = []
+    for recipe_id in recipe_ids:
+        ingredients.extend(found.get(recipe_id) or [])
+    return ingredients, missing
+
+
+def consolidate_grocery_list(grocery_list, recipe_ids=(), dry_run=False):
+    """
+    Add the ingredients of ``recipe_ids`` to ``grocery_list`` and merge duplicates.
+
+    The list ends up with one item per ingredient. Existing rows keep their
+    id: the first row for a name gets the combined quantity, price and
+    macros, and the others are deleted. A row nothing was merged into keeps
+    its quantity as the user wrote it. Amounts that don't parse ("to
+    taste") stay in the quantity text as notes. New ingredients are created.
+    Everything is written in one transaction with one ``bulk_update``, one
+    ``bulk_create`` and one delete; ``dry_run`` returns the same report
+    without writing. Raises ``RecipeNotFound`` for unknown recipe ids and
+    ``QuantityTooLong`` if a combined quantity would not fit, before
+    anything is written.
+    """
+    started = time.perf_counter()
+    ingredients, missing = _recipe_ingredients(list(recipe_ids))
+    if missing:
+        raise RecipeNotFound(f"Recipes not found: {', '.join(map(str, missing))}")
+
+    existing = list(GroceryItem.objects.filter(grocery_list=grocery_list).order_by("id"))
+    pantry_names = PantryItem.objects.filter(user_id=grocery_list.user_id).values_list(
+        "name", flat=True
+    )
+    merged, in_pantry = consolidate_lines(existing, ingredients, pantry_names)
+
+    now = timezone.now()
+    max_length = GroceryItem._meta.get_field("quantity").max_length
+    # Only rows that absorbed another row or a recipe line are rewritten.
+    quantities = {
+        name: entry.quantity() if entry.sources > 1 or not entry.items else entry.items[0].quantity
+        for name, entry in merged.items()
+    }
+    too_long = sorted(
+        merged[name].display_name
+        for name, quantity in quantities.items()
+        if len(quantity) > max_length
+    )
+    if too_long:
+        raise QuantityTooLong(
+            f"Combined quantity longer than {max_length} characters for: {', '.join(too_long)}"
+        )
+
+    to_create, to_update, to_delete = [], [], []
+    for name, entry in merged.items():
+        quantity = quantities[name]
+        if not entry.items:
+            to_create.append(
+                GroceryItem(grocery_list=grocery_list, ingredient=entry.display_name, quantity=quantity)
+            )
+            continue
+        keep, *duplicates = entry.items
+        to_delete.extend(duplicates)
+        if duplicates:
+            keep.price = entry.price()
+            keep.macros = entry.macros()
+            keep.sync_macro_columns()
+        if duplicates or keep.quantity != quantity:
+            keep.quantity = quantity
+            keep.updated_at = now
+            to_update.append(keep)
+
+    if not dry_run:
+        with transaction.atomic(), sync.recorded_explicitly():
+            if to_update:
+                GroceryItem.objects.bulk_update(
+                    to_update,
+                    ["quantity", "price", "macros", *GroceryItem.MACRO_COLUMNS, "updated_at"],
+                )
+            if to_create:
+                GroceryItem.objects.bulk_create(to_create)
+            if to_delete:
+                GroceryItem.objects.filter(id__in=[item.id for item in to_delete]).delete()
+            user_id = grocery_list.user_id
+            sync.record_changes(
+                user_id,
+                SyncChange.KIND_GROCERY_ITEM,
+                [item.id for item in to_update + to_create],
+                SyncChange.OP_UPSERT,
+            )
+            sync.record_changes(
+                user_id,
+                SyncChange.KIND_GROCERY_ITEM,
+                [item.id for item in to_delete],
+                SyncChange.OP_DELETE,
+            )
+
+    return {
+        "recipes": len(recipe_ids),
+        "lines": sum(entry.sources for entry in merged.values()),
+        "items": [
+            {"ingredient": entry.display_name, "quantity": quantities[name], "merged": entry.sources}
+            for name, entry in merged.items()
+        ],
+        "created": len(to_create),
+        "updated": len(to_update),
+        "deleted": len(to_delete),
+        "in_pantry": in_pantry,
+        "dry_run": dry_run,
+        "elapsed_ms": round((time.perf_counter() - started) * 1000, 1),
+    }
@@ -0,0 +1,65 @@
+import bisect
+
+INF = float("inf")
+
+
+def _round(value):
+    return None if value is None else round(value, 1)
+
+
+class Histogram:
+    """
+    Fixed-bucket histogram; percentiles are interpolated within a bucket.
+
+    ``bounds`` are the ascending upper bounds of the buckets and should end
+    with ``INF`` so every observation lands in one. Not thread-safe: callers
+    hold their own lock.
+    """
+
+    def __init__(self, bounds):
+        self.bounds = tuple(bounds)
+        self.counts = [0] * len(self.bounds)
+        self.count = 0
+        self.total = 0.0
+
+    def observe(self, value):
+        self.counts[bisect.bisect_left(self.bounds, value)] += 1
+        self.count += 1
+        self.total += value
+
+    def percentile(self, fraction):
+        if not self.count:
+            return None
+        rank = fraction * self.count
+        seen = 0
+        for index, count in enumerate(self.counts):
+            if count and seen + count >= rank:
+                lower = self.bounds[index - 1] if index else 0.0
+                upper = self.bounds[index]
+                if upper == INF:
+                    return lower
+                return lower + (upper - lower) * (rank - seen) / count
+            seen += count
+        return None
+
+    def cumulative(self):
+        """``(upper bound, observations <= bound)`` pairs, as Prometheus buckets expect."""
+        total = 0
+        pairs = []
+        for bound, count in zip(self.bounds, self.counts):
+            total += count
+            pairs.append((bound, total))
+        return pairs
+
+    def snapshot(self):
+        return {
+            "count": self.count,
+            "mean": round(self.total / self.count, 1) if self.count else None,
+            "p50": _round(self.percentile(0.5)),
+            "p95": _round(self.percentile(0.95)),
+            "p99": _round(self.percentile(0.99)),
+            "buckets": {
+                ("+Inf" if bound == INF else str(bound)): count
+                for bound, count in zip(self.bounds, self.counts)
+            },
+        }
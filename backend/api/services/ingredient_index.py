@@ -0,0 +1,107 @@
+from django.conf import settings
+from django.db import transaction
+from django.db.models import Count, F, FloatField
+from django.db.models.functions import Cast
+
+from ..models import Recipe, RecipeIngredient
+from ..serializers import RecipeSerializer
+from .ingredients import normalize_ingredient, recipe_ingredient_names
+
+
+def index_recipe(recipe):
+    """Replace the inverted index rows for ``recipe``."""
+    names = recipe_ingredient_names(recipe.ingredients)
+    with transaction.atomic():
+        RecipeIngredient.objects.filter(recipe_id=recipe.pk).delete()
+        RecipeIngredient.objects.bulk_create(
+            RecipeIngredient(recipe_id=recipe.pk, ingredient=name, recipe_size=len(names))
+            for name in names
+        )
+    return len(names)
+
+
+def rebuild_index(batch_size=500):
+    """Re-index every recipe in batches; returns ``(recipes, rows)``."""
+    recipes = rows = 0
+    recipe_ids = []
+    batch = []
+
+    def flush():
+        with transaction.atomic():
+            RecipeIngredient.objects.filter(recipe_id__in=recipe_ids).delete()
+            RecipeIngredient.objects.bulk_create(batch, batch_size=batch_size)
+
+    queryset = Recipe.objects.order_by("id").values_list("id", "ingredients")
+    for recipe_id, ingredients in queryset.iterator(chunk_size=batch_size):
+        names = recipe_ingredient_names(ingredients)
+        recipe_ids.append(recipe_id)
+        batch.extend(
+            RecipeIngredient(recipe_id=recipe_id, ingredient=name, recipe_size=len(names))
+            for name in names
+        )
+        recipes += 1
+        rows += len(names)
+        if len(recipe_ids) >= batch_size:
+            flush()
+            recipe_ids, batch = [], []
+    if recipe_ids:
+        flush()
+    return recipes, rows
+
+
+def pantry_coverage_candidates(pantry_names, limit=3, min_coverage=0.0):
+    """
+    Stored recipes ranked by how much of them the pantry covers.
+
+    Coverage is the fraction of a recipe's non-staple ingredients found in
+    the pantry. Only index rows for ingredients the user has are read, so the
+    cost depends on the pantry size rather than the number of recipes.
+
+    Returns a list of ``(recipe_id, coverage, matched)`` tuples.
+    """
+    pantry = {normalize_ingredient(name) for name in pantry_names}
+    pantry.discard("")
+    if not pantry:
+        return []
+
+    rows = (
+        RecipeIngredient.objects.filter(ingredient__in=pantry)
+        .values("recipe_id", "recipe_size")
+        .annotate(matched=Count("id"))
+        .annotate(
+            coverage=Cast(F("matched"), FloatField()) / Cast(F("recipe_size"), FloatField())
+        )
+        .filter(coverage__gte=min_coverage)
+        .order_by("-coverage", "-matched", "recipe_id")[:limit]
+    )
+    return [(row["recipe_id"], row["coverage"], row["matched"]) for row in rows]
+
+
+def suggest_from_index(pantry_names, limit=None, min_coverage=None):
+    """
+    Recipe dicts for stored recipes that the pantry covers well enough.
+
+    ``limit`` and ``min_coverage`` default to ``settings.PANTRY_SUGGESTIONS``.
+    Returns an empty list when no recipe reaches ``min_coverage``; callers
+    should fall back to Bedrock in that case.
+    """
+    options = getattr(settings, "PANTRY_SUGGESTIONS", {})
+    if limit is None:
+        limit = options.get("LIMIT", 3)
+    if min_coverage is None:
+        min_coverage = options.get("MIN_COVERAGE", 0.75)
+
+    candidates = pantry_coverage_candidates(pantry_names, limit, min_coverage)
+    if not candidates:
+        return []
+
+    recipes = Recipe.objects.in_bulk([recipe_id for recipe_id, _, _ in candidates])
+    suggestions = []
+    for recipe_id, coverage, _ in candidates:
+        recipe = recipes.get(recipe_id)
+        if recipe is None:
+            continue
+        data = RecipeSerializer(recipe).data
+        data["pantry_coverage"] = round(coverage, 3)
+        suggestions.append(data)
+    return suggestions
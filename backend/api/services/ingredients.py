@@ -0,0 +1,104 @@
+import re
+
+# Ingredients nearly every kitchen has. They are ignored when measuring how
+# much of a recipe a pantry covers.
+STAPLES = frozenset({
+    "salt",
+    "pepper",
+    "black pepper",
+    "salt and pepper",
+    "water",
+    "oil",
+    "olive oil",
+    "vegetable oil",
+    "cooking spray",
+    "sugar",
+    "flour",
+    "butter",
+    "ice",
+})
+
+# Preparation words that don't change what the ingredient is.
+DESCRIPTORS = frozenset({
+    "fresh",
+    "freshly",
+    "chopped",
+    "diced",
+    "minced",
+    "sliced",
+    "grated",
+    "shredded",
+    "crushed",
+    "ground",
+    "large",
+    "medium",
+    "small",
+    "boneless",
+    "skinless",
+    "ripe",
+    "raw",
+    "cooked",
+    "frozen",
+    "dried",
+    "organic",
+    "optional",
+})
+
+_PARENTHETICAL_RE = re.compile(r"\([^)]*\)")
+_NON_WORD_RE = re.compile(r"[^a-z\s]")
+_WHITESPACE_RE = re.compile(r"\s+")
+
+# Words that end in "s" but are not plurals.
+_SINGULAR_EXCEPTIONS = frozenset({
+    "asparagus", "couscous", "hummus", "molasses", "swiss", "citrus",
+    "lemongrass", "grass", "bass", "brussels", "series", "species",
+})
+
+
+def _singularize(word):
+    if word in _SINGULAR_EXCEPTIONS or len(word) <= 3:
+        return word
+    if word.endswith("ies"):
+        return word[:-3] + "y"
+    if word.endswith("oes") or word.endswith("ches") or word.endswith("shes"):
+        return word[:-2]
+    if word.endswith("ss"):
+        return word
+    if word.endswith("s"):
+        return word[:-1]
+    return word
+
+
+def normalize_ingredient(name):
+    """
+    Canonical form of an ingredient name for matching.
+
+    "Fresh Tomatoes (diced)" and "tomato" both become "tomato".
+    """
+    text = _PARENTHETICAL_RE.sub(" ", str(name or "").lower())
+    text = text.split(",")[0]  # "chicken breast, cut into strips"
+    text = _NON_WORD_RE.sub(" ", text)
+    words = [
+        _singularize(word)
+        for word in _WHITESPACE_RE.split(text)
+        if word and word not in DESCRIPTORS
+    ]
+    return " ".join(words)
+
+
+def is_staple(normalized_name):
+    return normalized_name in STAPLES
+
+
+def recipe_ingredient_names(ingredients):
+    """Distinct normalized, non-staple names from a ``Recipe.ingredients`` list."""
+    names = set()
+    for ingredient in ingredients or []:
+        if isinstance(ingredient, dict):
+            raw = ingredient.get("item") or ingredient.get("name")
+        else:
+            raw = ingredient
+        name = normalize_ingredient(raw)
+        if name and not is_staple(name):
+            names.add(name)
+    return names
@@ -0,0 +1,271 @@
+import logging
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+from django.conf import settings
+from django.db import close_old_connections
+from django.utils import timezone
+
+from ..models import RecipeJob
+from .aws_bedrock import generate_recipe, suggest_recipes_from_pantry
+from .bedrock_metrics import call_context
+from .ingredient_index import suggest_from_index
+
+logger = logging.getLogger(__name__)
+
+
+class QueueFull(Exception):
+    """Raised when the queue already holds ``max_pending`` unfinished jobs."""
+
+
+def _run_generate(payload):
+    return generate_recipe(payload["prompt"], payload.get("user_profile"))
+
+
+def _run_pantry_suggestions(payload):
+    grocery_items = payload["grocery_items"]
+    names = [item["ingredient_name"] for item in grocery_items]
+    return suggest_from_index(names) or suggest_recipes_from_pantry(grocery_items)
+
+
+JOB_HANDLERS = {
+    RecipeJob.KIND_GENERATE: _run_generate,
+    RecipeJob.KIND_PANTRY_SUGGESTIONS: _run_pantry_suggestions,
+}
+
+
+class DatabaseBroker:
+    """Stores jobs as ``RecipeJob`` rows so any worker process can report on them."""
+
+    def create(self, job):
+        job.save()
+        return job
+
+    def get(self, job_id, user_id=None):
+        qs = RecipeJob.objects.filter(id=job_id)
+        if user_id is not None:
+            qs = qs.filter(user_id=user_id)
+        return qs.first()
+
+    def claim(self, job_id):
+        """Move a queued job to running; returns ``None`` if someone else got it."""
+        now = timezone.now()
+        claimed = RecipeJob.objects.filter(
+            id=job_id, status=RecipeJob.STATUS_QUEUED
+        ).update(status=RecipeJob.STATUS_RUNNING, started_at=now)
+        return self.get(job_id) if claimed else None
+
+    def finish(self, job_id, status, result=None, error=""):
+        RecipeJob.objects.filter(id=job_id).update(
+            status=status, result=result, error=error, finished_at=timezone.now()
+        )
+
+    def queued_ids(self, limit):
+        """Queued job ids, oldest first. ``claim`` decides who actually runs each one."""
+        return list(
+            RecipeJob.objects.filter(status=RecipeJob.STATUS_QUEUED)
+            .order_by("created_at")
+            .values_list("id", flat=True)[:limit]
+        )
+
+    def requeue_stale(self, older_than):
+        """Return jobs stuck in ``running`` since before ``older_than`` to the queue."""
+        return RecipeJob.objects.filter(
+            status=RecipeJob.STATUS_RUNNING, started_at__lt=older_than
+        ).update(status=RecipeJob.STATUS_QUEUED, started_at=None)
+
+
+class InMemoryBroker:
+    """
+    Keeps unsaved ``RecipeJob`` instances in a dict.
+
+    Useful for local development and single-process deployments; jobs are
+    lost on restart and only visible to the process that created them.
+    """
+
+    def __init__(self, max_finished=1000):
+        self.max_finished = max_finished
+        self._jobs = {}
+        self._lock = threading.Lock()
+
+    def create(self, job):
+        with self._lock:
+            self._jobs[job.id] = job
+            self._trim()
+        return job
+
+    def _trim(self):
+        finished = [job for job in self._jobs.values() if job.is_finished]
+        overflow = len(finished) - self.max_finished
+        if overflow > 0:
+            finished.sort(key=lambda job: job.finished_at)
+            for job in finished[:overflow]:
+                del self._jobs[job.id]
+
+    def get(self, job_id, user_id=None):
+        with self._lock:
+            job = self._jobs.get(job_id)
+        if job is None or (user_id is not None and job.user_id != user_id):
+            return None
+        return job
+
+    def claim(self, job_id):
+        with self._lock:
+            job = self._jobs.get(job_id)
+            if job is None or job.status != RecipeJob.STATUS_QUEUED:
+                return None
+            job.status = RecipeJob.STATUS_RUNNING
+            job.started_at = timezone.now()
+            return job
+
+    def finish(self, job_id, status, result=None, error=""):
+        with self._lock:
+            job = self._jobs.get(job_id)
+            if job is not None:
+                job.status = status
+                job.result = result
+                job.error = error
+                job.finished_at = timezone.now()
+
+    def requeue_stale(self, older_than):
+        return 0
+
+    def queued_ids(self, limit):
+        with self._lock:
+            queued = [
+                job for job in self._jobs.values()
+                if job.status == RecipeJob.STATUS_QUEUED
+            ]
+        queued.sort(key=lambda job: job.created_at)
+        return [job.id for job in queued[:limit]]
+
+
+class JobQueue:
+    """
+    Bounded in-process worker pool for recipe jobs.
+
+    ``submit`` records the job with the broker and hands it to a thread pool
+    of ``max_workers`` threads, so the HTTP worker returns immediately.
+    At most ``max_pending`` jobs may be waiting or running at once.
+    """
+
+    def __init__(self, broker, max_workers=4, max_pending=100):
+        self.broker = broker
+        self.max_workers = max_workers
+        self.max_pending = max_pending
+        self._executor = ThreadPoolExecutor(
+            max_workers=max_workers, thread_name_prefix="recipe-job"
+        )
+        self._pending = 0
+        self._lock = threading.Lock()
+        self._finished = threading.Condition(self._lock)
+
+    def submit(self, user, kind, payload):
+        if kind not in JOB_HANDLERS:
+            raise ValueError(f"Unknown job kind: {kind}")
+        with self._lock:
+            if self._pending >= self.max_pending:
+                raise QueueFull("Recipe job queue is full")
+            self._pending += 1
+        try:
+            job = self.broker.create(
+                RecipeJob(user=user, kind=kind, payload=payload, created_at=timezone.now())
+            )
+            self._executor.submit(self._run, job.id)
+        except Exception:
+            with self._lock:
+                self._pending -= 1
+            raise
+        return job
+
+    def enqueue_existing(self, job_id):
+        """Hand a job that is already stored as queued to the pool (crash recovery)."""
+        with self._lock:
+            self._pending += 1
+        self._executor.submit(self._run, job_id)
+
+    def _run(self, job_id):
+        try:
+            job = self.broker.claim(job_id)
+            if job is None:
+                return
+            handler = JOB_HANDLERS[job.kind]
+            try:
+                with call_context(f"recipes/jobs/{job.kind}", job.user_id):
+                    result = handler(job.payload)
+            except Exception as e:
+                logger.warning("Recipe job %s failed: %s", job_id, e)
+                self.broker.finish(job_id, RecipeJob.STATUS_FAILED, error=str(e))
+            else:
+                self.broker.finish(job_id, RecipeJob.STATUS_SUCCEEDED, result=result)
+        except Exception:
+            logger.exception("Recipe job %s could not be processed", job_id)
+        finally:
+            # Worker threads keep their own DB connection; don't leak it.
+            close_old_connections()
+            with self._finished:
+                self._pending -= 1
+                self._finished.notify_all()
+
+    def drain(self, timeout=None):
+        """Block until every job handed to this queue has finished."""
+        deadline = None if timeout is None else time.monotonic() + timeout
+        with self._finished:
+            while self._pending:
+                remaining = None if deadline is None else deadline - time.monotonic()
+                if remaining is not None and remaining <= 0:
+                    return False
+                self._finished.wait(remaining)
+        return True
+
+    def wait(self, job_id, user_id=None, timeout=0, poll_interval=0.5):
+        """
+        Long-poll for a job to finish.
+
+        Returns the job as soon as it is finished or ``timeout`` seconds have
+        passed. Jobs finishing in this process wake waiters immediately; the
+        broker is re-read every ``poll_interval`` seconds to pick up jobs
+        finished by other workers.
+        """
+        deadline = time.monotonic() + max(timeout, 0)
+        while True:
+            job = self.broker.get(job_id, user_id)
+            if job is None or job.is_finished:
+                return job
+            remaining = deadline - time.monotonic()
+            if remaining <= 0:
+                return job
+            with self._finished:
+                self._finished.wait(min(poll_interval, remaining))
+
+    def stats(self):
+        with self._lock:
+            return {
+                "pending": self._pending,
+                "max_pending": self.max_pending,
+                "max_workers": self.max_workers,
+            }
+
+
+_queue = None
+_queue_lock = threading.Lock()
+
+
+def get_job_queue():
+    """Return the process-wide queue configured from ``settings.RECIPE_JOBS``."""
+    global _queue
+    if _queue is None:
+        with _queue_lock:
+            if _queue is None:
+                options = getattr(settings, "RECIPE_JOBS", {})
+                if options.get("BROKER", "database") == "memory":
+                    broker = InMemoryBroker()
+                else:
+                    broker = DatabaseBroker()
+                _queue = JobQueue(
+                    broker,
+                    max_workers=options.get("MAX_WORKERS", 4),
+                    max_pending=options.get("MAX_PENDING", 100),
+                )
+    return _queue
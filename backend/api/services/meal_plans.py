@@ -0,0 +1,302 @@
+import logging
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor, TimeoutError, as_completed
+from datetime import timedelta
+
+from django.conf import settings
+from django.db import close_old_connections, transaction
+
+from ..models import MealPlan, MealPlanEntry, Recipe
+from ..serializers import RecipeSerializer
+from .aws_bedrock import generate_recipe
+from .bedrock_metrics import call_context
+from .ingredients import normalize_ingredient
+from .recipe_cache import get_recipe_cache, recipe_cache_enabled, recipe_cache_key
+
+logger = logging.getLogger(__name__)
+
+# How each profile goal is phrased in the per-slot prompt. Allergies and
+# preferences reach the model through the profile section of the prompt.
+GOAL_STYLES = {
+    "lose_fat": "high-protein, lower-calorie",
+    "gain_muscle": "high-protein, energy-dense",
+    "maintain": "balanced",
+    "general_health": "wholesome, balanced",
+}
+
+
+class PoolFull(Exception):
+    """Raised when a plan would push the pool past ``max_pending`` queued slots."""
+
+
+class GenerationPool:
+    """
+    Bounded thread pool that runs recipe generations for meal plans.
+
+    Every plan in the worker process shares ``max_workers`` threads, which
+    caps concurrent Bedrock calls from meal plans however many are being
+    generated. At most ``max_pending`` slots may be queued or running.
+    """
+
+    def __init__(self, max_workers=12, max_pending=200):
+        self.max_workers = max_workers
+        self.max_pending = max_pending
+        self._executor = ThreadPoolExecutor(
+            max_workers=max_workers, thread_name_prefix="meal-plan"
+        )
+        self._pending = 0
+        self._lock = threading.Lock()
+
+    def reserve(self, count):
+        with self._lock:
+            if self._pending + count > self.max_pending:
+                raise PoolFull("Meal plan generation is at capacity")
+            self._pending += count
+
+    def _release(self, future):
+        with self._lock:
+            self._pending -= 1
+
+    def submit(self, fn, *args):
+        """Run ``fn(*args)`` on the pool; call ``reserve`` for it first."""
+        future = self._executor.submit(self._run, fn, *args)
+        # Also fires for futures cancelled before they started.
+        future.add_done_callback(self._release)
+        return future
+
+    def _run(self, fn, *args):
+        try:
+            return fn(*args)
+        finally:
+            # The shared cache tier may have opened a connection on this thread.
+            close_old_connections()
+
+    def stats(self):
+        with self._lock:
+            return {
+                "pending": self._pending,
+                "max_pending": self.max_pending,
+                "max_workers": self.max_workers,
+            }
+
+
+_pool = None
+_pool_lock = threading.Lock()
+
+
+def _options():
+    return getattr(settings, "MEAL_PLANS", {})
+
+
+def get_generation_pool():
+    """Return the process-wide pool configured from ``settings.MEAL_PLANS``."""
+    global _pool
+    if _pool is None:
+        with _pool_lock:
+            if _pool is None:
+                options = _options()
+                _pool = GenerationPool(
+                    max_workers=options.get("MAX_WORKERS", 12),
+                    max_pending=options.get("MAX_PENDING", 200),
+                )
+    return _pool
+
+
+def slot_prompt(day_date, meal, goal=None):
+    """
+    Generation prompt for one slot.
+
+    It depends only on the weekday, the meal and the goal, so a user's next
+    plan (and anyone else's with the same profile) is served from the
+    recipe cache.
+    """
+    style = GOAL_STYLES.get(goal, "balanced")
+    return f"A {style} {meal} recipe for {day_date:%A} of a weekly meal plan"
+
+
+def allergen_conflicts(recipe_data, allergies):
+    """Ingredients of a generated recipe that match one of ``allergies``."""
+    allergens = [set(normalize_ingredient(a).split()) for a in allergies or []]
+    allergens = [words for words in allergens if words]
+    conflicts = []
+    for ingredient in recipe_data.get("ingredients") or []:
+        if isinstance(ingredient, dict):
+            raw = ingredient.get("item") or ingredient.get("name")
+        else:
+            raw = ingredient
+        words = set(normalize_ingredient(raw).split())
+        # "peanut" matches "peanut butter"; "nut" does not match "peanut".
+        if any(allergen <= words for allergen in allergens):
+            conflicts.append(raw)
+    return conflicts
+
+
+def create_plan(user, start_date, days=7, meals=MealPlan.DEFAULT_MEALS, goal=None, name=""):
+    """Store a plan with one pending entry per day and meal."""
+    with transaction.atomic():
+        plan = MealPlan.objects.create(
+            user=user,
+            name=name,
+            start_date=start_date,
+            days=days,
+            meals=list(meals),
+            goal=goal or "",
+        )
+        MealPlanEntry.objects.bulk_create(
+            MealPlanEntry(
+                plan=plan,
+                day=day,
+                meal=meal,
+                prompt=slot_prompt(start_date + timedelta(days=day), meal, goal),
+            )
+            for day in range(days)
+            for meal in meals
+        )
+    return plan
+
+
+def _generate(prompt, user_profile, user_id):
+    started = time.monotonic()
+    with call_context("meal-plans", user_id):
+        recipe_data = generate_recipe(prompt, user_profile)
+    return recipe_data, (time.monotonic() - started) * 1000
+
+
+def _store_recipe(validated_data):
+    """The stored ``Recipe`` with this content, created if it's new."""
+    source_hash = Recipe.content_hash(
+        validated_data["name"], validated_data["ingredients"], validated_data["steps"]
+    )
+    recipe, _ = Recipe.objects.get_or_create(source_hash=source_hash, defaults=validated_data)
+    return recipe
+
+
+def _fail(entry, error):
+    entry.status = MealPlanEntry.STATUS_FAILED
+    entry.error = error
+    entry.save(update_fields=["status", "error", "generation_ms", "source"])
+    return entry
+
+
+def _fill(entry, recipe_data, allergies, source, elapsed_ms):
+    entry.source = source
+    entry.generation_ms = round(elapsed_ms, 1)
+    serializer = RecipeSerializer(data=recipe_data)
+    if not serializer.is_valid():
+        return _fail(entry, f"Generated recipe failed validation: {serializer.errors}")
+    conflicts = allergen_conflicts(serializer.validated_data, allergies)
+    if conflicts:
+        return _fail(entry, f"Generated recipe contains allergens: {', '.join(conflicts)}")
+    entry.recipe = _store_recipe(serializer.validated_data)
+    entry.status = MealPlanEntry.STATUS_READY
+    entry.error = ""
+    entry.save(update_fields=["recipe", "status", "error", "generation_ms", "source"])
+    return entry
+
+
+def finish_plan(plan):
+    """Set the plan's status from its entries."""
+    statuses = set(plan.entries.values_list("status", flat=True))
+    if statuses == {MealPlanEntry.STATUS_READY}:
+        plan.status = MealPlan.STATUS_COMPLETE
+    elif MealPlanEntry.STATUS_READY in statuses:
+        plan.status = MealPlan.STATUS_PARTIAL
+    else:
+        plan.status = MealPlan.STATUS_FAILED
+    plan.save(update_fields=["status", "updated_at"])
+    return plan
+
+
+class PlanGeneration:
+    """
+    Generation of one plan's pending entries.
+
+    Slots whose prompt is already in the recipe cache are filled without a
+    Bedrock call; the rest are submitted to the shared ``GenerationPool``
+    straight away, so the wall-clock time is roughly the slowest generation
+    when the pool has a thread per slot. ``events()`` yields each entry as
+    it finishes, in completion order.
+
+    Workers only call Bedrock. Validating and storing recipes happens in the
+    thread consuming ``events()``, so the database is written from one place.
+    """
+
+    def __init__(self, plan, user_profile, pool=None, timeout=None):
+        self.plan = plan
+        self.user_profile = user_profile or {}
+        self.pool = pool or get_generation_pool()
+        self.timeout = timeout if timeout is not None else _options().get("TIMEOUT_SECONDS", 300)
+        self._cached = []
+        self._futures = {}
+        self._start()
+
+    def _start(self):
+        entries = list(self.plan.entries.filter(status=MealPlanEntry.STATUS_PENDING))
+        misses = []
+        for entry in entries:
+            cached = None
+            if recipe_cache_enabled():
+                cached = get_recipe_cache().get(recipe_cache_key(entry.prompt, self.user_profile))
+            if cached is not None:
+                self._cached.append((entry, cached))
+            else:
+                misses.append(entry)
+        # Raises PoolFull before anything has been submitted.
+        self.pool.reserve(len(misses))
+        for entry in misses:
+            future = self.pool.submit(
+                _generate, entry.prompt, self.user_profile, self.plan.user_id
+            )
+            self._futures[future] = entry
+
+    def events(self):
+        """Yield ``("entry", MealPlanEntry)`` per slot, then ``("plan", MealPlan)``."""
+        allergies = self.user_profile.get("allergies") or []
+        try:
+            for entry, recipe_data in self._cached:
+                yield "entry", _fill(entry, recipe_data, allergies, MealPlanEntry.SOURCE_CACHE, 0)
+            try:
+                for future in as_completed(list(self._futures), timeout=self.timeout):
+                    entry = self._futures.pop(future)
+                    try:
+                        recipe_data, elapsed_ms = future.result()
+                    except Exception as e:
+                        logger.warning("Meal plan %s slot %s failed: %s", self.plan.id, entry.id, e)
+                        yield "entry", _fail(entry, str(e))
+                        continue
+                    yield "entry", _fill(
+                        entry, recipe_data, allergies, MealPlanEntry.SOURCE_BEDROCK, elapsed_ms
+                    )
+            except TimeoutError:
+                while self._futures:
+                    future, entry = self._futures.popitem()
+                    future.cancel()
+                    yield "entry", _fail(entry, "Generation timed out")
+        finally:
+            self.close()
+        yield "plan", self.plan
+
+    def close(self):
+        """
+        Cancel whatever ``events()`` hasn't reported and settle the plan's status.
+
+        Called when the stream ends, including when the client disconnects
+        part way. Generations already running still finish and populate the
+        recipe cache, so a retry is fast.
+        """
+        for future in self._futures:
+            future.cancel()
+        self._futures.clear()
+        self._cached = []
+        if self.plan.status == MealPlan.STATUS_GENERATING:
+            self.plan.entries.filter(status=MealPlanEntry.STATUS_PENDING).update(
+                status=MealPlanEntry.STATUS_FAILED, error="Generation was cancelled"
+            )
+            finish_plan(self.plan)
+
+    def run(self):
+        """Consume ``events()`` and return the finished plan."""
+        for _ in self.events():
+            pass
+        return self.plan
@@ -0,0 +1,182 @@
+from django.db import IntegrityError, transaction
+from django.db.models import F, Sum
+from django.db.models.functions import TruncMonth, TruncWeek
+from django.utils import timezone
+
+from ..models import DailyNutrition, MealHistory
+from ..models.macros import MACRO_KEYS as MACROS, parse_grams
+
+TOTAL_FIELDS = ("calories", "protein_g", "carbs_g", "fat_g")
+PERIODS = {"day": None, "week": TruncWeek, "month": TruncMonth}
+
+
+def macro_grams(value):
+    """Grams from a stored macro value such as ``25`` or ``"25g"``; 0 if unreadable."""
+    grams = parse_grams(value)
+    return 0.0 if grams is None else grams
+
+
+def meal_totals(calories, macros):
+    """The amounts one meal contributes to its day's rollup."""
+    macros = macros if isinstance(macros, dict) else {}
+    totals = {"calories": int(calories or 0)}
+    for macro in MACROS:
+        totals[f"{macro}_g"] = macro_grams(macros.get(macro))
+    return totals
+
+
+def meal_day(eaten_at):
+    """Rollup date of a meal, in ``settings.TIME_ZONE``."""
+    if timezone.is_aware(eaten_at):
+        return timezone.localtime(eaten_at).date()
+    return eaten_at.date()
+
+
+def meal_state(meal):
+    """``(user_id, day, totals)`` for a meal instance or a ``values()`` dict."""
+    if isinstance(meal, dict):
+        fields = meal
+    else:
+        fields = {
+            "user_id": meal.user_id,
+            "eaten_at": meal.eaten_at,
+            "calories_consumed": meal.calories_consumed,
+            "macros_consumed": meal.macros_consumed,
+        }
+    return (
+        fields["user_id"],
+        meal_day(fields["eaten_at"]),
+        meal_totals(fields["calories_consumed"], fields["macros_consumed"]),
+    )
+
+
+def _adjust(user_id, day, deltas, meals_delta):
+    """Add ``deltas`` to one rollup row with ``F()`` updates, creating or dropping it."""
+    changes = {field: F(field) + value for field, value in deltas.items()}
+    rollup = DailyNutrition.objects.filter(user_id=user_id, date=day)
+    updated = rollup.update(
+        meals=F("meals") + meals_delta, updated_at=timezone.now(), **changes
+    )
+    if not updated and meals_delta > 0:
+        try:
+            with transaction.atomic():
+                DailyNutrition.objects.create(
+                    user_id=user_id, date=day, meals=meals_delta, **deltas
+                )
+        except IntegrityError:
+            # Another request created the day's row first.
+            rollup.update(
+                meals=F("meals") + meals_delta, updated_at=timezone.now(), **changes
+            )
+    elif meals_delta < 0:
+        rollup.filter(meals__lte=0).delete()
+
+
+def apply_meal_change(previous, current):
+    """
+    Update rollups for one meal going from ``previous`` to ``current``.
+
+    Both are ``meal_state`` tuples, or ``None`` for a created (no previous)
+    or deleted (no current) meal. An edit that stays on the same day is a
+    single row update of the differences.
+    """
+    with transaction.atomic():
+        if previous and current and previous[:2] == current[:2]:
+            user_id, day, new = current
+            old = previous[2]
+            deltas = {field: new[field] - old[field] for field in TOTAL_FIELDS}
+            if any(deltas.values()):
+                _adjust(user_id, day, deltas, 0)
+            return
+        if previous:
+            user_id, day, old = previous
+            _adjust(user_id, day, {field: -old[field] for field in TOTAL_FIELDS}, -1)
+        if current:
+            user_id, day, new = current
+            _adjust(user_id, day, new, 1)
+
+
+def _round(values):
+    return {
+        field: round(value, 1) if isinstance(value, float) else value
+        for field, value in values.items()
+    }
+
+
+def nutrition_summary(user, start, end, period="day"):
+    """
+    Totals between ``start`` and ``end`` (inclusive dates), bucketed by ``period``.
+
+    Reads only ``DailyNutrition`` rows, at most one per day in the range,
+    so the cost doesn't depend on how many meals were logged.
+    """
+    rollups = DailyNutrition.objects.filter(user=user, date__gte=start, date__lte=end)
+    sums = {field: Sum(field) for field in ("meals",) + TOTAL_FIELDS}
+
+    trunc = PERIODS[period]
+    if trunc is None:
+        buckets = rollups.order_by("date").values("date", "meals", *TOTAL_FIELDS)
+        buckets = [
+            _round({"period_start": row.pop("date"), **row}) for row in buckets
+        ]
+    else:
+        buckets = [
+            _round(row)
+            for row in rollups.annotate(period_start=trunc("date"))
+            .values("period_start")
+            .annotate(**sums)
+            .order_by("period_start")
+        ]
+
+    totals = rollups.aggregate(**sums)
+    totals = {field: value or 0 for field, value in totals.items()}
+    days = (end - start).days + 1
+    return {
+        "start": start,
+        "end": end,
+        "period": period,
+        "buckets": buckets,
+        "totals": _round(totals),
+        "daily_average": {
+            field: round(totals[field] / days, 1) for field in TOTAL_FIELDS
+        },
+    }
+
+
+def rebuild_rollups(user=None, batch_size=2000):
+    """
+    Recompute ``DailyNutrition`` from ``MealHistory``; returns ``(meals, days)``.
+
+    Meals are streamed in ``(user, eaten_at)`` order, so each day is
+    finished before the next starts and only one day is held in memory.
+    """
+    meals_qs = MealHistory.objects.order_by("user_id", "eaten_at").values(
+        "user_id", "eaten_at", "calories_consumed", "macros_consumed"
+    )
+    rollups_qs = DailyNutrition.objects.all()
+    if user is not None:
+        meals_qs = meals_qs.filter(user=user)
+        rollups_qs = rollups_qs.filter(user=user)
+
+    meals = days = 0
+    batch = []
+    current = None
+    with transaction.atomic():
+        rollups_qs.delete()
+        for row in meals_qs.iterator(chunk_size=batch_size):
+            user_id, day, totals = meal_state(row)
+            if current is None or (current.user_id, current.date) != (user_id, day):
+                current = DailyNutrition(user_id=user_id, date=day, meals=0)
+                batch.append(current)
+                days += 1
+            current.meals += 1
+            for field in TOTAL_FIELDS:
+                setattr(current, field, getattr(current, field) + totals[field])
+            meals += 1
+            # Keep the day being filled; everything before it is final.
+            if len(batch) > batch_size:
+                DailyNutrition.objects.bulk_create(batch[:-1])
+                batch = batch[-1:]
+        DailyNutrition.objects.bulk_create(batch)
+    return meals, days
+
@@ -0,0 +1,137 @@
+import numpy as np
+
+from ..models import GroceryItem, Recipe
+
+COLUMNS = ("calories", "protein_g", "carbs_g", "fat_g")
+KCAL_PER_GRAM = np.array([4.0, 4.0, 9.0])  # protein, carbs, fat
+
+# Share of energy from protein / carbs / fat that each profile goal aims for.
+GOAL_SPLITS = {
+    "lose_fat": (0.35, 0.35, 0.30),
+    "gain_muscle": (0.30, 0.45, 0.25),
+    "maintain": (0.25, 0.50, 0.25),
+    "general_health": (0.20, 0.55, 0.25),
+}
+DEFAULT_GOAL = "general_health"
+
+
+class NutritionMatrix:
+    """
+    Calories and macro grams for a set of rows as one ``(n, 4)`` float array.
+
+    Columns follow ``COLUMNS``; unknown values are NaN so totals can report
+    how many rows actually contributed to each column.
+    """
+
+    def __init__(self, ids, values, labels=None):
+        self.ids = ids
+        self.values = values
+        self.labels = labels
+
+    def __len__(self):
+        return len(self.ids)
+
+    @classmethod
+    def from_rows(cls, rows, labelled=False):
+        """Build from ``(id, [label,] calories, protein_g, carbs_g, fat_g)`` tuples."""
+        rows = list(rows)
+        offset = 2 if labelled else 1
+        ids = np.fromiter((row[0] for row in rows), dtype=np.int64, count=len(rows))
+        labels = [row[1] for row in rows] if labelled else None
+        values = np.array(
+            [row[offset:] for row in rows], dtype=np.float64
+        ).reshape(len(rows), len(COLUMNS))
+        return cls(ids, values, labels)
+
+    def with_macro_calories(self):
+        """Fill unknown calories from macro grams (4/4/9 kcal per gram)."""
+        values = self.values.copy()
+        macros = values[:, 1:]
+        known_macros = ~np.isnan(macros).all(axis=1)
+        derived = np.nansum(macros * KCAL_PER_GRAM, axis=1)
+        missing = np.isnan(values[:, 0]) & known_macros
+        values[missing, 0] = derived[missing]
+        return NutritionMatrix(self.ids, values, self.labels)
+
+    def totals(self, servings=1):
+        """Column sums, per-serving values and per-row averages, ignoring unknowns."""
+        sums = np.nansum(self.values, axis=0)
+        known = np.count_nonzero(~np.isnan(self.values), axis=0)
+        with np.errstate(invalid="ignore", divide="ignore"):
+            averages = sums / known
+        return {
+            "rows": len(self),
+            "totals": _as_dict(sums),
+            "per_serving": _as_dict(sums / servings),
+            "average": _as_dict(averages),
+            "known": dict(zip(COLUMNS, known.tolist())),
+        }
+
+    def goal_fit(self, goal=None, calorie_target=None):
+        """
+        Score each row from 0 to 1 for how well it suits ``goal``.
+
+        The score is one minus half the L1 distance between the row's
+        protein/carbs/fat energy split and the goal's split. With
+        ``calorie_target`` it is further scaled down by how far the row's
+        calories are from the target. Rows without macros score NaN.
+        """
+        target = np.array(GOAL_SPLITS.get(goal or DEFAULT_GOAL, GOAL_SPLITS[DEFAULT_GOAL]))
+        energy = np.nan_to_num(self.values[:, 1:]) * KCAL_PER_GRAM
+        total_energy = energy.sum(axis=1, keepdims=True)
+        with np.errstate(invalid="ignore", divide="ignore"):
+            split = energy / total_energy
+        scores = 1.0 - 0.5 * np.abs(split - target).sum(axis=1)
+        if calorie_target:
+            calories = self.values[:, 0]
+            scores = scores * np.exp(-np.abs(calories - calorie_target) / calorie_target)
+        return scores
+
+
+def _as_dict(values):
+    return {
+        column: None if np.isnan(value) else round(float(value), 1)
+        for column, value in zip(COLUMNS, values)
+    }
+
+
+def grocery_list_matrix(grocery_list):
+    """Items of one grocery list, with calories derived from their macros."""
+    rows = GroceryItem.objects.filter(grocery_list=grocery_list).values_list(
+        "id", "ingredient", "protein_g", "carbs_g", "fat_g"
+    )
+    # Grocery items carry no calorie column; insert NaN and derive it.
+    rows = ((i, label, None, p, c, f) for i, label, p, c, f in rows)
+    return NutritionMatrix.from_rows(rows, labelled=True).with_macro_calories()
+
+
+def recipe_matrix(recipes):
+    """Stored recipes (a ``Recipe`` queryset) using their numeric macro columns."""
+    rows = recipes.values_list("id", "name", *COLUMNS)
+    return NutritionMatrix.from_rows(rows, labelled=True)
+
+
+def saved_recipes_matrix(user):
+    return recipe_matrix(Recipe.objects.filter(usersavedrecipe__user=user).order_by("id"))
+
+
+def ranked_goal_fit(matrix, goal=None, calorie_target=None):
+    """``[{"id", "name", "goal_fit"}]`` best first; rows without macros last."""
+    scores = matrix.goal_fit(goal, calorie_target)
+    order = np.argsort(np.nan_to_num(-scores, nan=np.inf), kind="stable")
+    return [
+        {
+            "id": int(matrix.ids[i]),
+            "name": matrix.labels[i],
+            "goal_fit": None if np.isnan(scores[i]) else round(float(scores[i]), 3),
+        }
+        for i in order
+    ]
+
+
+def meal_plan_matrix(plan):
+    """One row per filled slot of a meal plan, so repeated recipes count each time."""
+    rows = plan.entries.filter(recipe__isnull=False).order_by("day", "id").values_list(
+        "id", "recipe__name", *(f"recipe__{column}" for column in COLUMNS)
+    )
+    return NutritionMatrix.from_rows(rows, labelled=True)
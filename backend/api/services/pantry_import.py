@@ -0,0 +1,215 @@
+import codecs
+import csv
+import json
+import time
+
+from django.db import transaction
+
+from ..models import PantryItem, SyncChange
+from . import sync
+
+FORMAT_CSV = "csv"
+FORMAT_NDJSON = "ndjson"
+FORMATS = (FORMAT_CSV, FORMAT_NDJSON)
+
+_CONTENT_TYPES = {
+    "text/csv": FORMAT_CSV,
+    "application/csv": FORMAT_CSV,
+    "application/x-ndjson": FORMAT_NDJSON,
+    "application/ndjson": FORMAT_NDJSON,
+    "application/jsonl": FORMAT_NDJSON,
+}
+_EXTENSIONS = {
+    ".csv": FORMAT_CSV,
+    ".ndjson": FORMAT_NDJSON,
+    ".jsonl": FORMAT_NDJSON,
+}
+
+NAME_MAX_LENGTH = PantryItem._meta.get_field("name").max_length
+
+
+class ImportFormatError(ValueError):
+    """The file can't be read as the requested format at all."""
+
+
+def detect_format(filename="", content_type=""):
+    """Import format from a content type or file extension, or ``None``."""
+    content_type = (content_type or "").split(";")[0].strip().lower()
+    if content_type in _CONTENT_TYPES:
+        return _CONTENT_TYPES[content_type]
+    filename = (filename or "").lower()
+    for extension, file_format in _EXTENSIONS.items():
+        if filename.endswith(extension):
+            return file_format
+    return None
+
+
+def _text_lines(stream, encoding):
+    # A BOM from spreadsheet exports is dropped by utf-8-sig.
+    if encoding.lower().replace("_", "-") in ("utf-8", "utf8"):
+        encoding = "utf-8-sig"
+    return codecs.getreader(encoding)(stream, errors="replace")
+
+
+def iter_csv_rows(stream, encoding="utf-8"):
+    """
+    Yield ``(line_number, row, error)`` from a CSV byte stream, one line at a time.
+
+    The header row must contain a ``name`` column; ``notes`` is optional and
+    other columns are ignored. Header names are case-insensitive.
+    """
+    reader = csv.reader(_text_lines(stream, encoding))
+    try:
+        header = next(reader)
+    except StopIteration:
+        return
+    except csv.Error as e:
+        raise ImportFormatError(f"Unreadable CSV header: {e}") from e
+    columns = [column.strip().lower() for column in header]
+    if "name" not in columns:
+        raise ImportFormatError("CSV header must include a name column")
+
+    while True:
+        try:
+            values = next(reader)
+        except StopIteration:
+            return
+        except csv.Error as e:
+            yield reader.line_num, None, f"Unreadable CSV row: {e}"
+            continue
+        if not any(value.strip() for value in values):
+            continue
+        yield reader.line_num, dict(zip(columns, values)), None
+
+
+def iter_ndjson_rows(stream, encoding="utf-8"):
+    """Yield ``(line_number, row, error)`` from a newline-delimited JSON byte stream."""
+    for line_number, line in enumerate(_text_lines(stream, encoding), start=1):
+        line = line.strip()
+        if not line:
+            continue
+        try:
+            row = json.loads(line)
+        except ValueError as e:
+            yield line_number, None, f"Invalid JSON: {e}"
+            continue
+        if not isinstance(row, dict):
+            yield line_number, None, "Each line must be a JSON object"
+            continue
+        yield line_number, row, None
+
+
+def iter_rows(stream, file_format, encoding="utf-8"):
+    if file_format == FORMAT_CSV:
+        return iter_csv_rows(stream, encoding)
+    if file_format == FORMAT_NDJSON:
+        return iter_ndjson_rows(stream, encoding)
+    raise ImportFormatError(f"Format must be one of {', '.join(FORMATS)}")
+
+
+def _clean(row):
+    """``(name, notes, error)`` for one parsed row; ``notes`` is ``None`` when not given."""
+    name = row.get("name")
+    if not isinstance(name, str) or not name.strip():
+        return None, None, "name is required"
+    name = name.strip()
+    if len(name) > NAME_MAX_LENGTH:
+        return None, None, f"name is longer than {NAME_MAX_LENGTH} characters"
+    notes = row.get("notes")
+    if notes is not None:
+        notes = str(notes).strip() or None
+    return name, notes, None
+
+
+def _upsert_chunk(user, chunk):
+    """Insert or update one chunk of ``{name: notes}``; returns ``(inserted, updated)``."""
+    with transaction.atomic():
+        existing = set(
+            PantryItem.objects.filter(user=user, name__in=list(chunk)).values_list(
+                "name", flat=True
+            )
+        )
+        # Rows without notes must not blank out notes the user already has,
+        # so they only touch updated_at on conflict.
+        with_notes = [
+            PantryItem(user=user, name=name, notes=notes)
+            for name, notes in chunk.items()
+            if notes is not None
+        ]
+        without_notes = [
+            PantryItem(user=user, name=name)
+            for name, notes in chunk.items()
+            if notes is None
+        ]
+        for items, update_fields in (
+            (with_notes, ["notes", "updated_at"]),
+            (without_notes, ["updated_at"]),
+        ):
+            if items:
+                PantryItem.objects.bulk_create(
+                    items,
+                    update_conflicts=True,
+                    unique_fields=["user", "name"],
+                    update_fields=update_fields,
+                )
+        # bulk_create sends no post_save, so log the chunk for delta sync.
+        sync.record_changes(
+            user.id,
+            SyncChange.KIND_PANTRY_ITEM,
+            PantryItem.objects.filter(user=user, name__in=list(chunk)).values_list(
+                "id", flat=True
+            ),
+            SyncChange.OP_UPSERT,
+        )
+    return len(chunk) - len(existing), len(existing)
+
+
+def import_pantry_items(user, rows, chunk_size=500, max_errors=20):
+    """
+    Upsert pantry items for ``user`` from ``(line_number, row, error)`` tuples.
+
+    Rows are consumed lazily and written every ``chunk_size`` distinct names
+    with ``bulk_create(update_conflicts=True)`` on ``(user, name)``, each chunk
+    in its own transaction, so memory use is bounded by the chunk size (plus
+    the set of names seen, used to skip repeats within the file).
+
+    Returns a report with ``inserted``, ``updated`` and ``skipped`` counts,
+    timing and throughput, and the first ``max_errors`` skipped rows.
+    """
+    report = {"inserted": 0, "updated": 0, "skipped": 0, "errors": []}
+    started = time.monotonic()
+    seen = set()
+    chunk = {}
+
+    def skip(line_number, error):
+        report["skipped"] += 1
+        if len(report["errors"]) < max_errors:
+            report["errors"].append({"line": line_number, "error": error})
+
+    def flush():
+        inserted, updated = _upsert_chunk(user, chunk)
+        report["inserted"] += inserted
+        report["updated"] += updated
+        chunk.clear()
+
+    for line_number, row, error in rows:
+        if error is None:
+            name, notes, error = _clean(row)
+        if error is not None:
+            skip(line_number, error)
+            continue
+        if name in seen:
+            skip(line_number, f"duplicate of an earlier row for {name!r}")
+            continue
+        seen.add(name)
+        chunk[name] = notes
+        if len(chunk) >= chunk_size:
+            flush()
+    if chunk:
+        flush()
+
+    elapsed = time.monotonic() - started
+    report["rows"] = report["inserted"] + report["updated"] + report["skipped"]
+    report["elapsed_seconds"] = round(elapsed, 3)
+    report["rows_per_second"] = round(report["rows"] / elapsed, 1) if elapsed > 0 else None
+    return report
@@ -0,0 +1,229 @@
+import re
+from collections import namedtuple
+from functools import lru_cache
+
+import numpy as np
+
+from .ingredients import normalize_ingredient
+
+MASS = "g"
+VOLUME = "ml"
+COUNT = "count"
+
+# Distinct strings remembered by parse_quantity. Recipe amounts and grocery
+# quantities repeat heavily ("1", "2 tbsp", "500g"), so a few thousand
+# entries cover nearly every lookup.
+CACHE_SIZE = 8192
+
+# unit -> (dimension, amount of the canonical unit in one of it)
+UNITS = {
+    "": (COUNT, 1.0),
+    "piece": (COUNT, 1.0),
+    "pieces": (COUNT, 1.0),
+    "pc": (COUNT, 1.0),
+    "pcs": (COUNT, 1.0),
+    "whole": (COUNT, 1.0),
+    "each": (COUNT, 1.0),
+    "x": (COUNT, 1.0),
+    "mg": (MASS, 0.001),
+    "g": (MASS, 1.0),
+    "gr": (MASS, 1.0),
+    "gram": (MASS, 1.0),
+    "grams": (MASS, 1.0),
+    "kg": (MASS, 1000.0),
+    "kilogram": (MASS, 1000.0),
+    "kilograms": (MASS, 1000.0),
+    "oz": (MASS, 28.3495),
+    "ounce": (MASS, 28.3495),
+    "ounces": (MASS, 28.3495),
+    "lb": (MASS, 453.592),
+    "lbs": (MASS, 453.592),
+    "pound": (MASS, 453.592),
+    "pounds": (MASS, 453.592),
+    "ml": (VOLUME, 1.0),
+    "milliliter": (VOLUME, 1.0),
+    "milliliters": (VOLUME, 1.0),
+    "millilitre": (VOLUME, 1.0),
+    "millilitres": (VOLUME, 1.0),
+    "l": (VOLUME, 1000.0),
+    "liter": (VOLUME, 1000.0),
+    "liters": (VOLUME, 1000.0),
+    "litre": (VOLUME, 1000.0),
+    "litres": (VOLUME, 1000.0),
+    "tsp": (VOLUME, 4.92892),
+    "teaspoon": (VOLUME, 4.92892),
+    "teaspoons": (VOLUME, 4.92892),
+    "tbsp": (VOLUME, 14.7868),
+    "tablespoon": (VOLUME, 14.7868),
+    "tablespoons": (VOLUME, 14.7868),
+    "fl oz": (VOLUME, 29.5735),
+    "cup": (VOLUME, 236.588),
+    "cups": (VOLUME, 236.588),
+    "pint": (VOLUME, 473.176),
+    "pints": (VOLUME, 473.176),
+    "quart": (VOLUME, 946.353),
+    "quarts": (VOLUME, 946.353),
+}
+
+_FRACTION_CHARS = {"½": " 1/2", "⅓": " 1/3", "⅔": " 2/3", "¼": " 1/4", "¾": " 3/4", "⅛": " 1/8"}
+_FRACTION_CHARS_RE = re.compile("|".join(_FRACTION_CHARS))
+# A mixed number ("1 1/2"), a fraction, a decimal or an integer.
+_NUMBER = r"\d+\s+\d+/\d+|\d+/\d+|\d+(?:\.\d+)?|\.\d+"
+_QUANTITY_RE = re.compile(
+    rf"^\s*(?P<number>{_NUMBER})(?:\s*(?:-|to)\s*(?P<upper>{_NUMBER}))?\s*(?P<unit>.*?)\.?\s*$"
+)
+# "1 can (400g)": the aside restates the amount, so it is dropped.
+_PARENTHETICAL_RE = re.compile(r"\([^)]*\)")
+# A unit missing from UNITS ("can", "clove") is taken as written only when
+# it is a single word; "lb 4 oz" or "x 400g cans" stay unparsed.
+_FREE_UNIT_RE = re.compile(r"^[^\W\d_]+$")
+
+Quantity = namedtuple("Quantity", ["value", "unit", "dimension", "amount"])
+Quantity.__doc__ = """
+A parsed quantity.
+
+``value`` and ``unit`` are as written ("1.5", "kg"); ``amount`` is the
+value in the canonical unit of ``dimension`` (grams, millilitres, a count,
+or the normalized unit itself for units such as "can"). ``value`` and
+``amount`` are ``None`` when the text has no leading number or its unit
+is not understood, with ``unit`` holding the text as written.
+"""
+
+
+def _number(text):
+    """The value of a ``_NUMBER`` match, or ``None`` for a zero denominator."""
+    total = 0.0
+    for part in text.split():
+        if "/" in part:
+            numerator, denominator = part.split("/")
+            if not float(denominator):
+                return None
+            total += float(numerator) / float(denominator)
+        else:
+            total += float(part)
+    return total
+
+
+@lru_cache(maxsize=1024)
+def canonical_unit(unit):
+    """
+    ``(dimension, factor)`` for a unit, or ``None`` if it is not one.
+
+    Known units map through ``UNITS``; any other single word ("can",
+    "cloves") is its own dimension, in its normalized form. Parenthetical
+    asides are ignored.
+    """
+    unit = _PARENTHETICAL_RE.sub(" ", unit or "").strip().lower().rstrip(".").strip()
+    unit = " ".join(unit.split())
+    if unit in UNITS:
+        return UNITS[unit]
+    if not _FREE_UNIT_RE.match(unit):
+        return None
+    return normalize_ingredient(unit) or unit, 1.0
+
+
+def _unparsed(text):
+    return Quantity(None, text.strip(), None, None)
+
+
+@lru_cache(maxsize=CACHE_SIZE)
+def _parse_text(text):
+    text = _FRACTION_CHARS_RE.sub(lambda match: _FRACTION_CHARS[match.group()], text.lower())
+    match = _QUANTITY_RE.match(_PARENTHETICAL_RE.sub(" ", text))
+    if not match:
+        return _unparsed(text)
+    # Ranges use their upper bound, since that is what needs buying.
+    value = _number(match.group("upper") or match.group("number"))
+    unit = match.group("unit")
+    units = canonical_unit(unit)
+    if value is None or units is None:
+        return _unparsed(text)
+    dimension, factor = units
+    return Quantity(value, unit, dimension, value * factor)
+
+
+def parse_quantity(text):
+    """
+    Parse text such as ``"200 g"``, ``"1 1/2 cups"``, ``"½ tsp"`` or ``"2-3 cans"``.
+
+    Results are memoized in a bounded LRU; ``cache_info()`` reports its hits.
+    """
+    if isinstance(text, bool) or text is None:
+        return _parse_text("")
+    if isinstance(text, (int, float)):
+        return Quantity(float(text), "", COUNT, float(text))
+    return _parse_text(str(text).strip())
+
+
+def parse_amount(amount, unit=None):
+    """
+    Parse a recipe ingredient's separate ``amount`` and ``unit`` strings.
+
+    The amount may already carry its unit ("500g" with unit "g"), in which
+    case the unit field is ignored.
+    """
+    quantity = parse_quantity(amount)
+    if quantity.value is None or quantity.unit or not unit:
+        return quantity
+    units = canonical_unit(unit)
+    if units is None:
+        return _unparsed(f"{amount} {unit}")
+    dimension, factor = units
+    return Quantity(quantity.value, unit, dimension, quantity.value * factor)
+
+
+def parse_batch(texts):
+    """
+    Parse many strings at once; returns ``(amounts, dimensions)`` arrays.
+
+    Each distinct string is parsed once, then the results are broadcast
+    back to every position, so a column of repeated values costs one parse
+    per distinct value. Unparseable entries have a NaN amount and a
+    ``None`` dimension.
+    """
+    texts = np.asarray([str(text if text is not None else "") for text in texts], dtype=object)
+    if not len(texts):
+        return np.empty(0, dtype=np.float64), np.empty(0, dtype=object)
+    unique, inverse = np.unique(texts, return_inverse=True)
+    parsed = [parse_quantity(text) for text in unique]
+    amounts = np.array(
+        [np.nan if quantity.amount is None else quantity.amount for quantity in parsed],
+        dtype=np.float64,
+    )
+    dimensions = np.array([quantity.dimension for quantity in parsed], dtype=object)
+    return amounts[inverse], dimensions[inverse]
+
+
+def cache_info():
+    return _parse_text.cache_info()
+
+
+def clear_cache():
+    _parse_text.cache_clear()
+
+
+def _format_number(value):
+    value = round(value, 2) if value < 10 else round(value)
+    return f"{value:g}"
+
+
+def format_quantity(amounts, unparsed=()):
+    """Display text for ``{dimension: total}``, e.g. ``"1.2 kg + 2 can"``."""
+    parts = []
+    for dimension, value in amounts.items():
+        if dimension == MASS:
+            parts.append(
+                f"{_format_number(value / 1000)} kg" if value >= 1000 else f"{_format_number(value)} g"
+            )
+        elif dimension == VOLUME:
+            parts.append(
+                f"{_format_number(value / 1000)} l" if value >= 1000 else f"{_format_number(value)} ml"
+            )
+        elif dimension == COUNT:
+            parts.append(_format_number(value))
+        else:
+            parts.append(f"{_format_number(value)} {dimension}")
+    if not parts:
+        # Nothing measurable, e.g. only "to taste" or a blank amount.
+        parts = [next((text for text in unparsed if text), "as needed")]
+    return " + ".join(parts)
@@ -0,0 +1,240 @@
+import copy
+import hashlib
+import json
+import logging
+import re
+import threading
+import time
+from collections import OrderedDict
+
+from django.conf import settings
+from django.core.cache import caches
+from django.core.cache.backends.base import InvalidCacheBackendError
+
+logger = logging.getLogger(__name__)
+
+# Profile fields that are interpolated into the recipe generation prompt.
+# Anything not listed here cannot change the model output, so it must not
+# fragment the cache.
+PROFILE_PROMPT_FIELDS = ("weight_kg", "height_cm", "goal", "preferences", "allergies")
+
+_WHITESPACE_RE = re.compile(r"\s+")
+_TRAILING_PUNCTUATION_RE = re.compile(r"[\s.!?,;:]+$")
+
+
+def normalize_prompt(prompt):
+    """Lower-case a prompt and collapse whitespace and trailing punctuation."""
+    text = _WHITESPACE_RE.sub(" ", str(prompt or "")).strip().lower()
+    return _TRAILING_PUNCTUATION_RE.sub("", text)
+
+
+def profile_fingerprint(user_profile):
+    """
+    Reduce a user profile to the values that end up in the prompt.
+
+    List fields are de-duplicated and sorted so that ["nuts", "dairy"] and
+    ["Dairy", "nuts"] share a cache entry.
+    """
+    user_profile = user_profile or {}
+    fingerprint = {}
+    for field in PROFILE_PROMPT_FIELDS:
+        value = user_profile.get(field)
+        if isinstance(value, (list, tuple)):
+            value = sorted({normalize_prompt(v) for v in value if v})
+        elif isinstance(value, str):
+            value = normalize_prompt(value)
+        elif isinstance(value, float) and value.is_integer():
+            value = int(value)
+        fingerprint[field] = value
+    return fingerprint
+
+
+def build_cache_key(kind, payload):
+    """Build a stable, backend-safe cache key for a Bedrock request."""
+    serialized = json.dumps(payload, sort_keys=True, separators=(",", ":"), default=str)
+    digest = hashlib.sha256(serialized.encode("utf-8")).hexdigest()
+    return f"bedrock:{kind}:{digest}"
+
+
+def recipe_cache_key(prompt, user_profile=None):
+    """Cache key for ``generate_recipe``."""
+    return build_cache_key(
+        "recipe",
+        {"prompt": normalize_prompt(prompt), "profile": profile_fingerprint(user_profile)},
+    )
+
+
+def pantry_cache_key(ingredient_names):
+    """Cache key for ``suggest_recipes_from_pantry``; ingredient order is ignored."""
+    names = sorted({normalize_prompt(name) for name in ingredient_names if name})
+    return build_cache_key("pantry", {"ingredients": names})
+
+
+class RecipeResponseCache:
+    """
+    Two-tier cache for parsed Bedrock responses.
+
+    The first tier is an in-process LRU bounded by ``max_entries``; the second
+    is a Django cache backend (database cache by default) shared by every
+    worker. Both tiers honour ``ttl_seconds``. Failures in the shared tier are
+    logged and treated as misses so a missing cache table never breaks
+    recipe generation.
+    """
+
+    def __init__(self, max_entries=512, ttl_seconds=86400, shared_alias=None):
+        self.max_entries = max_entries
+        self.ttl_seconds = ttl_seconds
+        self.shared_alias = shared_alias
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+        self._counters = {
+            "local_hits": 0,
+            "shared_hits": 0,
+            "misses": 0,
+            "sets": 0,
+            "evictions": 0,
+            "expirations": 0,
+            "shared_errors": 0,
+        }
+
+    def _incr(self, counter, amount=1):
+        with self._lock:
+            self._counters[counter] += amount
+
+    def _shared_backend(self):
+        if not self.shared_alias:
+            return None
+        try:
+            return caches[self.shared_alias]
+        except InvalidCacheBackendError:
+            return None
+
+    def _get_local(self, key):
+        now = time.monotonic()
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                return None
+            expires_at, value = entry
+            if expires_at <= now:
+                del self._entries[key]
+                self._counters["expirations"] += 1
+                return None
+            self._entries.move_to_end(key)
+            self._counters["local_hits"] += 1
+        # Callers get their own copy so they can't mutate the cached value.
+        return copy.deepcopy(value)
+
+    def _set_local(self, key, value):
+        expires_at = time.monotonic() + self.ttl_seconds
+        value = copy.deepcopy(value)
+        with self._lock:
+            self._entries[key] = (expires_at, value)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+                self._counters["evictions"] += 1
+
+    def get(self, key):
+        """Return the cached value for ``key`` or ``None`` on a miss."""
+        value = self._get_local(key)
+        if value is not None:
+            return value
+
+        backend = self._shared_backend()
+        if backend is not None:
+            try:
+                value = backend.get(key)
+            except Exception as e:
+                self._incr("shared_errors")
+                logger.warning("Shared recipe cache read failed: %s", e)
+                value = None
+            if value is not None:
+                self._incr("shared_hits")
+                self._set_local(key, value)
+                return value
+
+        self._incr("misses")
+        return None
+
+    def peek(self, key):
+        """Like ``get`` but without touching the hit/miss counters."""
+        now = time.monotonic()
+        with self._lock:
+            entry = self._entries.get(key)
+        if entry is not None and entry[0] > now:
+            return copy.deepcopy(entry[1])
+
+        backend = self._shared_backend()
+        if backend is None:
+            return None
+        try:
+            return backend.get(key)
+        except Exception:
+            return None
+
+    def set(self, key, value):
+        """Store ``value`` in both tiers."""
+        if value is None:
+            return
+        self._set_local(key, value)
+        self._incr("sets")
+
+        backend = self._shared_backend()
+        if backend is not None:
+            try:
+                backend.set(key, value, timeout=self.ttl_seconds)
+            except Exception as e:
+                self._incr("shared_errors")
+                logger.warning("Shared recipe cache write failed: %s", e)
+
+    def delete(self, key):
+        with self._lock:
+            self._entries.pop(key, None)
+        backend = self._shared_backend()
+        if backend is not None:
+            try:
+                backend.delete(key)
+            except Exception as e:
+                self._incr("shared_errors")
+                logger.warning("Shared recipe cache delete failed: %s", e)
+
+    def clear(self):
+        """Drop the in-process tier and reset counters."""
+        with self._lock:
+            self._entries.clear()
+            for counter in self._counters:
+                self._counters[counter] = 0
+
+    def stats(self):
+        with self._lock:
+            stats = dict(self._counters)
+            stats["local_size"] = len(self._entries)
+        lookups = stats["local_hits"] + stats["shared_hits"] + stats["misses"]
+        stats["hit_ratio"] = (
+            (stats["local_hits"] + stats["shared_hits"]) / lookups if lookups else 0.0
+        )
+        return stats
+
+
+_cache = None
+_cache_lock = threading.Lock()
+
+
+def get_recipe_cache():
+    """Return the process-wide cache configured from ``settings.BEDROCK_CACHE``."""
+    global _cache
+    if _cache is None:
+        with _cache_lock:
+            if _cache is None:
+                options = getattr(settings, "BEDROCK_CACHE", {})
+                _cache = RecipeResponseCache(
+                    max_entries=options.get("MAX_ENTRIES", 512),
+                    ttl_seconds=options.get("TTL_SECONDS", 86400),
+                    shared_alias=options.get("CACHE_ALIAS"),
+                )
+    return _cache
+
+
+def recipe_cache_enabled():
+    return getattr(settings, "BEDROCK_CACHE", {}).get("ENABLED", True)
@@ -0,0 +1,130 @@
+from django.contrib.postgres.search import SearchQuery, SearchRank
+from django.db import connection
+from django.db.models import F, FloatField, Q, Value
+from django.db.models.functions import Cast
+
+from ..models import Recipe
+from ..pagination import InvalidCursor, decode_cursor, encode_cursor
+
+SEARCH_CONFIG = "english"
+
+# The tsvector is computed in SQL so save-time updates and batch backfills
+# produce identical documents. Ingredients contribute their "item" names and
+# steps their text; both columns may hold non-array JSON from older rows.
+_UPDATE_SEARCH_VECTOR_SQL = """
+    UPDATE {table} SET search_vector =
+        setweight(to_tsvector(%(config)s, coalesce(name, '')), 'A')
+        || setweight(to_tsvector(%(config)s, coalesce((
+            SELECT string_agg(coalesce(elem->>'item', elem #>> '{{}}'), ' ')
+            FROM jsonb_array_elements(
+                CASE WHEN jsonb_typeof(ingredients::jsonb) = 'array'
+                     THEN ingredients::jsonb ELSE '[]'::jsonb END
+            ) AS elem
+        ), '')), 'B')
+        || setweight(to_tsvector(%(config)s, coalesce((
+            SELECT string_agg(step, ' ')
+            FROM jsonb_array_elements_text(
+                CASE WHEN jsonb_typeof(steps::jsonb) = 'array'
+                     THEN steps::jsonb ELSE '[]'::jsonb END
+            ) AS step
+        ), '')), 'C')
+    WHERE {where}
+"""
+
+
+def search_supported():
+    return connection.vendor == "postgresql"
+
+
+def _update_search_vectors(where, params):
+    sql = _UPDATE_SEARCH_VECTOR_SQL.format(
+        table=connection.ops.quote_name(Recipe._meta.db_table), where=where
+    )
+    with connection.cursor() as cursor:
+        cursor.execute(sql, {"config": SEARCH_CONFIG, **params})
+        return cursor.rowcount
+
+
+def update_search_vector(recipe_id):
+    """Recompute the stored tsvector for one recipe (no-op off PostgreSQL)."""
+    if not search_supported():
+        return 0
+    return _update_search_vectors("id = %(id)s", {"id": recipe_id})
+
+
+def rebuild_search_vectors(batch_size=5000):
+    """Recompute every stored tsvector in id-range batches; returns rows updated."""
+    if not search_supported():
+        return 0
+    updated = 0
+    last_id = 0
+    while True:
+        ids = list(
+            Recipe.objects.filter(id__gt=last_id)
+            .order_by("id")
+            .values_list("id", flat=True)[:batch_size]
+        )
+        if not ids:
+            return updated
+        updated += _update_search_vectors(
+            "id BETWEEN %(low)s AND %(high)s", {"low": ids[0], "high": ids[-1]}
+        )
+        last_id = ids[-1]
+
+
+def search_recipes(
+    query_text,
+    difficulty=None,
+    min_calories=None,
+    max_calories=None,
+    max_time=None,
+    cursor=None,
+    limit=20,
+):
+    """
+    Ranked full-text search over recipes with keyset pagination.
+
+    Results are ordered by ``(rank desc, id desc)`` and ``cursor`` carries
+    the last ``(rank, id)`` pair, so later pages cost the same as the first.
+    Off PostgreSQL this degrades to a name match with a constant rank so
+    local development still works.
+
+    Returns ``(recipes, next_cursor)``; ``next_cursor`` is ``None`` on the
+    last page. Raises ``pagination.InvalidCursor`` for a bad cursor.
+    """
+    qs = Recipe.objects.defer("search_vector")
+    if difficulty:
+        qs = qs.filter(difficulty=difficulty)
+    if min_calories is not None:
+        qs = qs.filter(calories__gte=min_calories)
+    if max_calories is not None:
+        qs = qs.filter(calories__lte=max_calories)
+    if max_time is not None:
+        qs = qs.filter(time_taken_minutes__lte=max_time)
+
+    if search_supported():
+        query = SearchQuery(query_text, search_type="websearch", config=SEARCH_CONFIG)
+        # ts_rank returns real; casting to double lets the cursor value
+        # round-trip exactly for the keyset comparison.
+        qs = qs.filter(search_vector=query).annotate(
+            rank=Cast(SearchRank(F("search_vector"), query), FloatField())
+        )
+    else:
+        qs = qs.filter(name__icontains=query_text).annotate(
+            rank=Value(0.0, output_field=FloatField())
+        )
+
+    if cursor:
+        values = decode_cursor(cursor)
+        try:
+            last_rank, last_id = float(values[0]), int(values[1])
+        except (IndexError, TypeError, ValueError):
+            raise InvalidCursor("Invalid cursor")
+        qs = qs.filter(Q(rank__lt=last_rank) | Q(rank=last_rank, id__lt=last_id))
+
+    page = list(qs.order_by("-rank", "-id")[: limit + 1])
+    next_cursor = None
+    if len(page) > limit:
+        page = page[:limit]
+        next_cursor = encode_cursor([page[-1].rank, page[-1].id])
+    return page, next_cursor
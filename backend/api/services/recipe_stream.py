@@ -0,0 +1,153 @@
+import json
+
+
+class IncrementalRecipeParser:
+    """
+    Incremental scanner for the recipe JSON object produced by the model.
+
+    Text is fed in arbitrary chunks. As soon as the top-level ``name`` value,
+    an element of ``ingredients`` or an element of ``steps`` is complete, it
+    is decoded and returned as an ``(event, data)`` tuple. Anything before the
+    first ``{`` (e.g. a markdown fence) is ignored.
+    """
+
+    def __init__(self):
+        self._text = ""
+        self._pos = 0
+        self._start = None
+        self._end = None
+        self._stack = []
+        self._in_string = False
+        self._escape = False
+        self._string_start = None
+        self._element_start = None
+        self._expect_key = False
+        self._current_key = None
+
+    @property
+    def complete(self):
+        return self._end is not None
+
+    def feed(self, chunk):
+        """Consume ``chunk`` and return the events it completed."""
+        self._text += chunk
+        events = []
+        text = self._text
+        while self._pos < len(text) and self._end is None:
+            char = text[self._pos]
+            if self._start is None:
+                if char == "{":
+                    self._start = self._pos
+                    self._stack.append("{")
+                    self._expect_key = True
+                self._pos += 1
+                continue
+
+            if self._in_string:
+                if self._escape:
+                    self._escape = False
+                elif char == "\\":
+                    self._escape = True
+                elif char == '"':
+                    self._in_string = False
+                    self._on_string_end(events)
+                self._pos += 1
+                continue
+
+            depth = len(self._stack)
+            if char == '"':
+                self._in_string = True
+                self._string_start = self._pos
+            elif char in "{[":
+                self._stack.append(char)
+                if depth == 2 and char == "{":
+                    self._element_start = self._pos
+            elif char in "}]":
+                self._stack.pop()
+                if not self._stack:
+                    self._end = self._pos + 1
+                elif depth == 3 and char == "}" and self._current_key == "ingredients":
+                    element = text[self._element_start:self._pos + 1]
+                    events.append(("ingredient", json.loads(element)))
+            elif char == "," and depth == 1:
+                self._expect_key = True
+            elif char == ":" and depth == 1:
+                self._expect_key = False
+            self._pos += 1
+        return events
+
+    def _on_string_end(self, events):
+        depth = len(self._stack)
+        value = json.loads(self._text[self._string_start:self._pos + 1])
+        if depth == 1:
+            if self._expect_key:
+                self._current_key = value
+            elif self._current_key == "name":
+                events.append(("name", value))
+        elif depth == 2 and self._stack[-1] == "[" and self._current_key == "steps":
+            events.append(("step", value))
+
+    def result(self):
+        """Decode the complete recipe object; raises ``json.JSONDecodeError`` if unfinished."""
+        if self._start is None:
+            raise json.JSONDecodeError("No JSON object in model output", self._text, 0)
+        end = self._end if self._end is not None else len(self._text)
+        return json.loads(self._text[self._start:end])
+
+
+def iter_text_deltas(event_stream, usage=None, on_first=None):
+    """
+    Yield text deltas from a Bedrock ``invoke_model_with_response_stream`` body.
+
+    ``event_stream`` only needs to be an iterable of ``{"chunk": {"bytes": ...}}``
+    dicts, so a plain list works as a local fake stream. Token counts from
+    the ``message_start`` and ``message_delta`` events are written into the
+    ``usage`` dict if one is given, and ``on_first`` is called before the
+    first delta is yielded.
+    """
+    for event in event_stream:
+        chunk = event.get("chunk")
+        if not chunk:
+            continue
+        payload = json.loads(chunk["bytes"])
+        kind = payload.get("type")
+        if kind == "content_block_delta":
+            delta = payload.get("delta", {})
+            if delta.get("type") == "text_delta":
+                if on_first is not None:
+                    on_first()
+                    on_first = None
+                yield delta.get("text", "")
+        elif usage is not None and kind == "message_start":
+            usage.update(payload.get("message", {}).get("usage") or {})
+        elif usage is not None and kind == "message_delta":
+            usage.update(payload.get("usage") or {})
+
+
+def iter_recipe_events(text_chunks):
+    """
+    Turn model output text chunks into recipe events.
+
+    Yields ``("name", str)``, ``("ingredient", dict)`` and ``("step", str)``
+    as they complete and finally ``("recipe", dict)`` with the whole object.
+    """
+    parser = IncrementalRecipeParser()
+    for chunk in text_chunks:
+        yield from parser.feed(chunk)
+    yield ("recipe", parser.result())
+
+
+def replay_recipe_events(recipe):
+    """Yield the same events ``iter_recipe_events`` would for an already complete recipe."""
+    if "name" in recipe:
+        yield ("name", recipe["name"])
+    for ingredient in recipe.get("ingredients", []):
+        yield ("ingredient", ingredient)
+    for step in recipe.get("steps", []):
+        yield ("step", step)
+    yield ("recipe", recipe)
+
+
+def format_sse(event, data):
+    """Encode one server-sent event."""
+    return f"event: {event}\ndata: {json.dumps(data)}\n\n"
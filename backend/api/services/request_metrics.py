@@ -0,0 +1,313 @@
+import copy
+import logging
+import os
+import re
+import threading
+import time
+from contextvars import ContextVar
+
+from django.conf import settings
+
+from .bedrock_metrics import get_bedrock_metrics
+from .histogram import INF, Histogram
+
+logger = logging.getLogger(__name__)
+
+# Upper bounds of the per-route histograms; the last is open-ended.
+LATENCY_BUCKETS_MS = (5, 10, 25, 50, 100, 250, 500, 1000, 2500, 5000, 10000, 30000, INF)
+QUERY_BUCKETS = (0, 1, 2, 5, 10, 20, 50, 100, 200, INF)
+
+# Route label for requests that matched no URL pattern, so scanners probing
+# random paths can't create unbounded label values.
+UNMATCHED_ROUTE = "<unmatched>"
+
+# Statements that only delimit transactions. They are not counted, so query
+# counts (and budgets) are the same on backends that send an explicit BEGIN
+# for atomic() (SQLite) and those that don't (PostgreSQL).
+_TRANSACTION_CONTROL_RE = re.compile(
+    r"\s*(?:BEGIN|COMMIT|ROLLBACK|END|SAVEPOINT|RELEASE)\b", re.IGNORECASE
+)
+
+
+def _options():
+    return getattr(settings, "REQUEST_METRICS", {})
+
+
+class QueryCounter:
+    """
+    ``connection.execute_wrapper`` callable that counts queries and their time.
+
+    One instance is shared by every database alias a request touches.
+    Transaction control statements (``BEGIN``, ``SAVEPOINT`` ...) are not
+    counted.
+    """
+
+    __slots__ = ("count", "seconds")
+
+    def __init__(self):
+        self.count = 0
+        self.seconds = 0.0
+
+    def __call__(self, execute, sql, params, many, context):
+        started = time.perf_counter()
+        try:
+            return execute(sql, params, many, context)
+        finally:
+            if not _TRANSACTION_CONTROL_RE.match(sql):
+                self.seconds += time.perf_counter() - started
+                self.count += 1
+
+
+_current_counter = ContextVar("request_query_counter", default=None)
+
+
+def start_counting():
+    """Count the current request's queries; pass the result to ``stop_counting``."""
+    counter = QueryCounter()
+    return counter, _current_counter.set(counter)
+
+
+def stop_counting(token):
+    _current_counter.reset(token)
+
+
+def count_queries(execute, sql, params, many, context):
+    """
+    Permanent ``execute_wrapper`` feeding the current request's ``QueryCounter``.
+
+    The counter is found through a context variable rather than a wrapper
+    pushed on the request thread's connections, so queries an async view runs
+    on executor threads (which copy the context) are counted too.
+    """
+    counter = _current_counter.get()
+    if counter is None:
+        return execute(sql, params, many, context)
+    return counter(execute, sql, params, many, context)
+
+
+def install_query_counter(connection):
+    """Add ``count_queries`` to ``connection`` (once; it survives reconnects)."""
+    if count_queries not in connection.execute_wrappers:
+        connection.execute_wrappers.append(count_queries)
+
+
+class RouteStats:
+    """Counters and histograms for one ``(method, route)``."""
+
+    def __init__(self):
+        self.statuses = {}  # "2xx" etc. -> requests
+        self.latency_ms = Histogram(LATENCY_BUCKETS_MS)
+        self.queries = Histogram(QUERY_BUCKETS)
+        self.sql_ms = 0.0
+        self.over_budget = {"latency": 0, "queries": 0}
+
+    def add(self, status_code, elapsed_ms, queries, sql_ms, over_latency, over_queries):
+        status_class = f"{status_code // 100}xx"
+        self.statuses[status_class] = self.statuses.get(status_class, 0) + 1
+        self.latency_ms.observe(elapsed_ms)
+        self.queries.observe(queries)
+        self.sql_ms += sql_ms
+        self.over_budget["latency"] += over_latency
+        self.over_budget["queries"] += over_queries
+
+    def snapshot(self):
+        requests = self.latency_ms.count
+        return {
+            "requests": requests,
+            "statuses": dict(self.statuses),
+            "latency_ms": self.latency_ms.snapshot(),
+            "queries": self.queries.snapshot(),
+            "sql_ms": round(self.sql_ms, 1),
+            "mean_sql_ms": round(self.sql_ms / requests, 1) if requests else None,
+            "over_budget": dict(self.over_budget),
+        }
+
+
+class RequestMetrics:
+    """
+    In-process per-route request latency and database usage.
+
+    Routes are URL patterns (``grocery/grocery-list/<int:list_id>/``), not
+    paths, so the number of series is bounded by the URLconf.
+    """
+
+    def __init__(self, latency_budget_ms=500, query_budget=20, route_budgets=None):
+        self.latency_budget_ms = latency_budget_ms
+        self.query_budget = query_budget
+        self.route_budgets = route_budgets or {}
+        self._lock = threading.Lock()
+        self.reset()
+
+    def reset(self):
+        with self._lock:
+            self._started_at = time.time()
+            self._routes = {}
+
+    def budgets(self, route):
+        """``(latency ms, query count)`` budget for ``route``; ``ROUTE_BUDGETS`` overrides either."""
+        override = self.route_budgets.get(route, {})
+        return (
+            override.get("LATENCY_MS", self.latency_budget_ms),
+            override.get("QUERIES", self.query_budget),
+        )
+
+    def record(self, method, route, status_code, elapsed_ms, queries, sql_ms):
+        """Add one request; returns the names of the budgets it exceeded."""
+        latency_budget, query_budget = self.budgets(route)
+        over_latency = latency_budget is not None and elapsed_ms > latency_budget
+        over_queries = query_budget is not None and queries > query_budget
+        with self._lock:
+            stats = self._routes.get((method, route))
+            if stats is None:
+                stats = self._routes[(method, route)] = RouteStats()
+            stats.add(status_code, elapsed_ms, queries, sql_ms, over_latency, over_queries)
+        return [
+            name for name, over in (("latency", over_latency), ("queries", over_queries)) if over
+        ]
+
+    def snapshot(self):
+        with self._lock:
+            return {
+                "pid": os.getpid(),
+                "since": self._started_at,
+                "routes": {
+                    f"{method} {route}": stats.snapshot()
+                    for (method, route), stats in sorted(self._routes.items())
+                },
+            }
+
+    def routes(self):
+        """A consistent copy of ``[((method, route), RouteStats)]`` for exporting."""
+        with self._lock:
+            return copy.deepcopy(sorted(self._routes.items()))
+
+
+_metrics = None
+_metrics_lock = threading.Lock()
+
+
+def get_request_metrics():
+    """Return the process-wide registry configured from ``settings.REQUEST_METRICS``."""
+    global _metrics
+    if _metrics is None:
+        with _metrics_lock:
+            if _metrics is None:
+                options = _options()
+                _metrics = RequestMetrics(
+                    latency_budget_ms=options.get("LATENCY_BUDGET_MS", 500),
+                    query_budget=options.get("QUERY_BUDGET", 20),
+                    route_budgets=options.get("ROUTE_BUDGETS"),
+                )
+    return _metrics
+
+
+def _escape(value):
+    return str(value).replace("\\", "\\\\").replace("\n", "\\n").replace('"', '\\"')
+
+
+def _labels(**labels):
+    return "{" + ",".join(f'{name}="{_escape(value)}"' for name, value in labels.items()) + "}"
+
+
+def _bound(bound, scale):
+    return "+Inf" if bound == INF else f"{bound * scale:g}"
+
+
+def _histogram_lines(name, histogram, labels, scale=1.0):
+    lines = [
+        f"{name}_bucket{_labels(**labels, le=_bound(bound, scale))} {count}"
+        for bound, count in histogram.cumulative()
+    ]
+    lines.append(f"{name}_sum{_labels(**labels)} {histogram.total * scale:.6f}")
+    lines.append(f"{name}_count{_labels(**labels)} {histogram.count}")
+    return lines
+
+
+def render_prometheus():
+    """Request and Bedrock metrics of this process in the Prometheus text format (0.0.4)."""
+    routes = get_request_metrics().routes()
+    lines = [
+        "# HELP chef_http_requests_total Requests by route and status class.",
+        "# TYPE chef_http_requests_total counter",
+    ]
+    for (method, route), stats in routes:
+        for status_class, count in sorted(stats.statuses.items()):
+            lines.append(
+                f"chef_http_requests_total{_labels(method=method, route=route, status=status_class)} {count}"
+            )
+
+    lines += [
+        "# HELP chef_http_request_duration_seconds Time spent in the view and middleware.",
+        "# TYPE chef_http_request_duration_seconds histogram",
+    ]
+    for (method, route), stats in routes:
+        lines += _histogram_lines(
+            "chef_http_request_duration_seconds",
+            stats.latency_ms,
+            {"method": method, "route": route},
+            scale=0.001,
+        )
+
+    lines += [
+        "# HELP chef_http_db_queries Database queries per request.",
+        "# TYPE chef_http_db_queries histogram",
+    ]
+    for (method, route), stats in routes:
+        lines += _histogram_lines(
+            "chef_http_db_queries", stats.queries, {"method": method, "route": route}
+        )
+
+    lines += [
+        "# HELP chef_http_db_duration_seconds_total Time spent executing SQL.",
+        "# TYPE chef_http_db_duration_seconds_total counter",
+    ]
+    for (method, route), stats in routes:
+        lines.append(
+            f"chef_http_db_duration_seconds_total{_labels(method=method, route=route)} "
+            f"{stats.sql_ms / 1000:.6f}"
+        )
+
+    lines += [
+        "# HELP chef_http_over_budget_total Requests over their latency or query budget.",
+        "# TYPE chef_http_over_budget_total counter",
+    ]
+    for (method, route), stats in routes:
+        for budget, count in sorted(stats.over_budget.items()):
+            lines.append(
+                f"chef_http_over_budget_total{_labels(method=method, route=route, budget=budget)} {count}"
+            )
+
+    bedrock = get_bedrock_metrics().snapshot(top_users=0)["endpoints"]
+    lines += [
+        "# HELP chef_bedrock_calls_total Bedrock calls by endpoint and outcome.",
+        "# TYPE chef_bedrock_calls_total counter",
+    ]
+    for endpoint, stats in sorted(bedrock.items()):
+        errors = stats["errors"] + stats["parse_failures"] + stats["cancelled"]
+        outcomes = (
+            ("ok", stats["calls"] - errors),
+            ("error", stats["errors"]),
+            ("parse_error", stats["parse_failures"]),
+            ("cancelled", stats["cancelled"]),
+        )
+        for outcome, count in outcomes:
+            lines.append(
+                f"chef_bedrock_calls_total{_labels(endpoint=endpoint, status=outcome)} {count}"
+            )
+    lines += [
+        "# HELP chef_bedrock_tokens_total Bedrock tokens by endpoint and direction.",
+        "# TYPE chef_bedrock_tokens_total counter",
+    ]
+    for endpoint, stats in sorted(bedrock.items()):
+        for direction in ("input", "output"):
+            lines.append(
+                f"chef_bedrock_tokens_total{_labels(endpoint=endpoint, direction=direction)} "
+                f"{stats[f'{direction}_tokens']}"
+            )
+    lines += [
+        "# HELP chef_bedrock_cost_usd_total Estimated Bedrock cost.",
+        "# TYPE chef_bedrock_cost_usd_total counter",
+    ]
+    for endpoint, stats in sorted(bedrock.items()):
+        lines.append(f"chef_bedrock_cost_usd_total{_labels(endpoint=endpoint)} {stats['cost_usd']}")
+    return "\n".join(lines) + "\n"
@@ -0,0 +1,195 @@
+import copy
+import logging
+import threading
+import time
+import uuid
+
+from django.conf import settings
+from django.core.cache import caches
+from django.core.cache.backends.base import InvalidCacheBackendError
+
+logger = logging.getLogger(__name__)
+
+
+class _Call:
+    def __init__(self):
+        self.done = threading.Event()
+        self.result = None
+        self.error = None
+        self.waiters = 0
+
+
+def _copy_error(error):
+    """A fresh instance of ``error`` (same type and details, no traceback)."""
+    try:
+        return copy.copy(error)
+    except Exception:
+        return RuntimeError(f"Shared call failed: {error!r}")
+
+
+class SingleFlight:
+    """
+    Collapses concurrent calls that share a key into one upstream call.
+
+    Within a process, the first caller for a key (the leader) runs the
+    function and every caller that arrives while it is running waits for and
+    receives a copy of the same result or exception.
+
+    With ``lock_alias`` set, leaders also take a short-lived lock in that
+    Django cache. A caller in another process that finds the lock held polls
+    ``lookup`` (normally the shared response cache) for the leader's result
+    instead of calling upstream itself, and falls back to calling upstream if
+    the lock is released or expires without a result.
+    """
+
+    def __init__(self, lock_alias=None, lock_timeout=120, poll_interval=0.25):
+        self.lock_alias = lock_alias
+        self.lock_timeout = lock_timeout
+        self.poll_interval = poll_interval
+        self._calls = {}
+        self._lock = threading.Lock()
+        self._counters = {
+            "upstream_calls": 0,
+            "coalesced_local": 0,
+            "coalesced_remote": 0,
+            "lock_timeouts": 0,
+            "lock_errors": 0,
+        }
+
+    def _incr(self, counter):
+        with self._lock:
+            self._counters[counter] += 1
+
+    def do(self, key, fn, lookup=None):
+        """Return ``fn()``, sharing the call with any concurrent caller using ``key``."""
+        with self._lock:
+            call = self._calls.get(key)
+            if call is None:
+                call = _Call()
+                self._calls[key] = call
+                leader = True
+            else:
+                call.waiters += 1
+                self._counters["coalesced_local"] += 1
+                leader = False
+
+        if not leader:
+            call.done.wait()
+            if call.error is not None:
+                # Each follower raises its own copy: raising the shared
+                # object from several threads would mix up its traceback.
+                raise _copy_error(call.error) from call.error
+            return copy.deepcopy(call.result)
+
+        try:
+            result = self._lead(key, fn, lookup)
+            # Followers copy from a private snapshot so the leader's caller
+            # can freely mutate what it gets back.
+            call.result = copy.deepcopy(result)
+            return result
+        except Exception as e:
+            call.error = e
+            raise
+        finally:
+            with self._lock:
+                self._calls.pop(key, None)
+            call.done.set()
+
+    def _backend(self):
+        if not self.lock_alias:
+            return None
+        try:
+            return caches[self.lock_alias]
+        except InvalidCacheBackendError:
+            return None
+
+    def _lead(self, key, fn, lookup):
+        backend = self._backend()
+        if backend is None:
+            self._incr("upstream_calls")
+            return fn()
+
+        lock_key = f"singleflight:{key}"
+        token = uuid.uuid4().hex
+        deadline = time.monotonic() + self.lock_timeout
+        while True:
+            try:
+                acquired = backend.add(lock_key, token, timeout=self.lock_timeout)
+            except Exception as e:
+                # A broken lock store must never block generation.
+                self._incr("lock_errors")
+                logger.warning("Single-flight lock failed for %s: %s", key, e)
+                self._incr("upstream_calls")
+                return fn()
+
+            if acquired:
+                try:
+                    self._incr("upstream_calls")
+                    return fn()
+                finally:
+                    self._release(backend, lock_key, token)
+
+            # Another process is already calling upstream for this key.
+            while time.monotonic() < deadline:
+                if lookup is not None:
+                    result = lookup(key)
+                    if result is not None:
+                        self._incr("coalesced_remote")
+                        return result
+                try:
+                    lock_held = backend.get(lock_key) is not None
+                except Exception:
+                    lock_held = False
+                if not lock_held:
+                    # The leader finished or gave up. It may have stored its
+                    # result just before releasing, so look once more.
+                    result = lookup(key) if lookup is not None else None
+                    if result is not None:
+                        self._incr("coalesced_remote")
+                        return result
+                    break
+                time.sleep(self.poll_interval)
+            else:
+                self._incr("lock_timeouts")
+                self._incr("upstream_calls")
+                return fn()
+
+    def _release(self, backend, lock_key, token):
+        try:
+            if backend.get(lock_key) == token:
+                backend.delete(lock_key)
+        except Exception as e:
+            self._incr("lock_errors")
+            logger.warning("Single-flight unlock failed for %s: %s", lock_key, e)
+
+    def stats(self):
+        with self._lock:
+            stats = dict(self._counters)
+            stats["in_flight"] = len(self._calls)
+        stats["calls_saved"] = stats["coalesced_local"] + stats["coalesced_remote"]
+        return stats
+
+
+_single_flight = None
+_single_flight_lock = threading.Lock()
+
+
+def get_single_flight():
+    """Return the process-wide instance configured from ``settings.BEDROCK_SINGLE_FLIGHT``."""
+    global _single_flight
+    if _single_flight is None:
+        with _single_flight_lock:
+            if _single_flight is None:
+                options = getattr(settings, "BEDROCK_SINGLE_FLIGHT", {})
+                _single_flight = SingleFlight(
+                    lock_alias=(
+                        options.get("LOCK_ALIAS") if options.get("CROSS_PROCESS") else None
+                    ),
+                    lock_timeout=options.get("LOCK_TIMEOUT", 120),
+                    poll_interval=options.get("POLL_INTERVAL", 0.25),
+                )
+    return _single_flight
+
+
+def single_flight_enabled():
+    return getattr(settings, "BEDROCK_SINGLE_FLIGHT", {}).get("ENABLED", True)
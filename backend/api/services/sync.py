@@ -0,0 +1,236 @@
+import threading
+import time
+from contextlib import contextmanager
+from datetime import datetime, timedelta
+from datetime import timezone as dt_timezone
+
+from django.conf import settings
+from django.db.models import Max, QuerySet
+from django.utils import timezone
+
+from ..models import GroceryItem, GroceryList, PantryItem, SyncChange, UserSavedRecipe
+from ..pagination import InvalidCursor, decode_cursor, encode_cursor
+from ..serializers import (
+    GroceryItemSerializer,
+    GroceryListSyncSerializer,
+    PantryItemSerializer,
+    UserSavedRecipeSerializer,
+)
+
+MODEL_KINDS = {
+    PantryItem: SyncChange.KIND_PANTRY_ITEM,
+    GroceryList: SyncChange.KIND_GROCERY_LIST,
+    GroceryItem: SyncChange.KIND_GROCERY_ITEM,
+    UserSavedRecipe: SyncChange.KIND_SAVED_RECIPE,
+}
+
+# kind -> (response key, user-scoped queryset, serializer)
+_KINDS = {
+    SyncChange.KIND_PANTRY_ITEM: (
+        "pantry_items",
+        lambda user: PantryItem.objects.filter(user=user),
+        PantryItemSerializer,
+    ),
+    SyncChange.KIND_GROCERY_LIST: (
+        "grocery_lists",
+        lambda user: GroceryList.objects.filter(user=user),
+        GroceryListSyncSerializer,
+    ),
+    SyncChange.KIND_GROCERY_ITEM: (
+        "grocery_items",
+        lambda user: GroceryItem.objects.filter(grocery_list__user=user),
+        GroceryItemSerializer,
+    ),
+    SyncChange.KIND_SAVED_RECIPE: (
+        "saved_recipes",
+        lambda user: UserSavedRecipe.objects.filter(user=user)
+        .select_related("recipe")
+        .defer("recipe__search_vector"),
+        UserSavedRecipeSerializer,
+    ),
+}
+
+
+class CursorExpired(Exception):
+    """The changes after this cursor may have been pruned; the client must resync."""
+
+
+_local = threading.local()
+
+
+@contextmanager
+def recorded_explicitly():
+    """
+    Stop the signal receivers from logging changes inside this block.
+
+    For bulk write paths that call ``record_changes`` once for the whole
+    batch instead of paying for one log insert (and owner lookup) per row.
+    """
+    _local.depth = getattr(_local, "depth", 0) + 1
+    try:
+        yield
+    finally:
+        _local.depth -= 1
+
+
+def tracking_suppressed():
+    return getattr(_local, "depth", 0) > 0
+
+
+def record_changes(user_id, kind, object_ids, op):
+    """Log ``op`` for each of ``object_ids``; returns the number of entries written."""
+    entries = [
+        SyncChange(user_id=user_id, kind=kind, object_id=object_id, op=op)
+        for object_id in object_ids
+    ]
+    SyncChange.objects.bulk_create(entries)
+    return len(entries)
+
+
+def owner_id(instance):
+    """User id a synced row belongs to, or ``None`` for an item outside any list."""
+    if isinstance(instance, GroceryItem):
+        if instance.grocery_list_id is None:
+            return None
+        if GroceryItem.grocery_list.is_cached(instance):
+            return instance.grocery_list.user_id
+        return (
+            GroceryList.objects.filter(pk=instance.grocery_list_id)
+            .values_list("user_id", flat=True)
+            .first()
+        )
+    return instance.user_id
+
+
+def record_instance_change(instance, op):
+    if tracking_suppressed():
+        return
+    user_id = owner_id(instance)
+    if user_id is not None:
+        record_changes(user_id, MODEL_KINDS[type(instance)], [instance.pk], op)
+
+
+def origin_model(origin):
+    """Model class whose deletion started a (possibly cascading) delete."""
+    if isinstance(origin, QuerySet):
+        return origin.model
+    return type(origin) if origin is not None else None
+
+
+def _options():
+    return getattr(settings, "SYNC", {})
+
+
+def _retention():
+    return timedelta(days=_options().get("RETENTION_DAYS", 30))
+
+
+def _overlap():
+    return timedelta(seconds=_options().get("OVERLAP_SECONDS", 30))
+
+
+def _cursor(change_id, issued_at, read_at):
+    return encode_cursor([change_id, issued_at, read_at])
+
+
+def _parse_cursor(cursor):
+    """``(change_id, read_at)`` from a cursor; ``read_at`` is when it was handed out."""
+    values = decode_cursor(cursor)
+    try:
+        change_id, issued_at = int(values[0]), float(values[1])
+        # Cursors from before read_at was added re-read from issued_at.
+        read_at = float(values[2]) if len(values) > 2 else issued_at
+    except (IndexError, TypeError, ValueError):
+        raise InvalidCursor("Invalid cursor")
+    if time.time() - issued_at > _retention().total_seconds():
+        raise CursorExpired("Sync cursor has expired; sync again without a cursor")
+    return change_id, read_at
+
+
+def _empty_payload():
+    return {key: {"upserted": [], "deleted": []} for key, _, _ in _KINDS.values()}
+
+
+def snapshot(user):
+    """Every synced row for ``user`` plus a cursor for later delta syncs."""
+    # Take the cursor first so changes made while we read are sent next time.
+    last_change = SyncChange.objects.filter(user=user).aggregate(last=Max("id"))["last"]
+    payload = _empty_payload()
+    for key, queryset, serializer_class in _KINDS.values():
+        payload[key]["upserted"] = serializer_class(
+            queryset(user).order_by("id"), many=True
+        ).data
+    now = time.time()
+    payload.update(full=True, has_more=False, cursor=_cursor(last_change or 0, now, now))
+    return payload
+
+
+def changes_since(user, cursor, limit=500):
+    """
+    Rows created, changed or deleted since ``cursor``.
+
+    Reads at most ``limit`` log entries after the cursor through the
+    ``(user, id)`` index, keeps the latest operation per row and loads the
+    surviving rows with one ``id__in`` query per kind, so the work done is
+    proportional to the number of changes rather than the size of the
+    user's data. Rows that no longer exist are reported as deleted.
+
+    Log ids are assigned at insert, not at commit, so a bulk write still in
+    its transaction when the cursor was handed out can commit ids below it.
+    Entries logged up to ``SYNC["OVERLAP_SECONDS"]`` before that are read
+    again as well (outside ``limit``), which means a response can repeat
+    rows the client already has; applying it by id is idempotent.
+
+    Raises ``InvalidCursor`` for a malformed cursor and ``CursorExpired``
+    once it is older than the log retention period.
+    """
+    change_id, read_at = _parse_cursor(cursor)
+    now = time.time()
+    fields = ("id", "kind", "object_id", "op", "changed_at")
+    entries = list(
+        SyncChange.objects.filter(user=user, id__gt=change_id)
+        .order_by("id")
+        .values_list(*fields)[: limit + 1]
+    )
+    has_more = len(entries) > limit
+    entries = entries[:limit]
+    overlap_from = datetime.fromtimestamp(read_at, tz=dt_timezone.utc) - _overlap()
+    overlap = SyncChange.objects.filter(
+        user=user, id__lte=change_id, changed_at__gte=overlap_from
+    ).order_by("id")
+
+    latest = {}
+    for _, kind, object_id, op, _ in [*overlap.values_list(*fields), *entries]:
+        latest[(kind, object_id)] = op
+
+    payload = _empty_payload()
+    upserts = {}
+    for (kind, object_id), op in latest.items():
+        if op == SyncChange.OP_DELETE:
+            payload[_KINDS[kind][0]]["deleted"].append(object_id)
+        else:
+            upserts.setdefault(kind, []).append(object_id)
+
+    for kind, object_ids in upserts.items():
+        key, queryset, serializer_class = _KINDS[kind]
+        rows = list(queryset(user).filter(id__in=object_ids).order_by("id"))
+        payload[key]["upserted"] = serializer_class(rows, many=True).data
+        # Deleted in a change we haven't reached yet (or outside this user).
+        found = {row.pk for row in rows}
+        payload[key]["deleted"].extend(i for i in object_ids if i not in found)
+
+    if entries:
+        change_id = entries[-1][0]
+    # A cursor with more to read ages from its oldest unread change, which
+    # is what pruning removes first.
+    issued_at = entries[-1][4].timestamp() if has_more else now
+    payload.update(full=False, has_more=has_more, cursor=_cursor(change_id, issued_at, now))
+    return payload
+
+
+def prune_changes(older_than=None):
+    """Delete log entries older than the retention period; returns the count deleted."""
+    if older_than is None:
+        older_than = timezone.now() - _retention()
+    deleted, _ = SyncChange.objects.filter(changed_at__lt=older_than).delete()
+    return deleted
@@ -0,0 +1,97 @@
+from django.contrib.auth import get_user_model
+from django.db.backends.signals import connection_created
+from django.db.models.signals import post_delete, post_save, pre_save
+from django.dispatch import receiver
+
+from .models import (
+    GroceryItem,
+    GroceryList,
+    MealHistory,
+    PantryItem,
+    Recipe,
+    SyncChange,
+    UserSavedRecipe,
+)
+from .services import nutrition, sync
+from .services.ingredient_index import index_recipe
+from .services.recipe_search import update_search_vector
+from .services.request_metrics import install_query_counter
+
+SEARCH_FIELDS = {"name", "ingredients", "steps"}
+
+
+@receiver(post_save, sender=Recipe)
+def update_ingredient_index(sender, instance, update_fields=None, **kwargs):
+    """Keep the ingredient inverted index in step with ``Recipe.ingredients``."""
+    if update_fields is not None and "ingredients" not in update_fields:
+        return
+    index_recipe(instance)
+
+
+@receiver(post_save, sender=Recipe)
+def update_recipe_search_vector(sender, instance, update_fields=None, **kwargs):
+    """Recompute the stored tsvector when searchable fields may have changed."""
+    if update_fields is not None and not SEARCH_FIELDS.intersection(update_fields):
+        return
+    update_search_vector(instance.pk)
+
+
+@receiver(post_save, sender=PantryItem)
+@receiver(post_save, sender=GroceryList)
+@receiver(post_save, sender=GroceryItem)
+@receiver(post_save, sender=UserSavedRecipe)
+def record_sync_upsert(sender, instance, **kwargs):
+    """Log creates and updates of synced rows for the delta-sync endpoint."""
+    sync.record_instance_change(instance, SyncChange.OP_UPSERT)
+
+
+@receiver(post_delete, sender=PantryItem)
+@receiver(post_delete, sender=GroceryList)
+@receiver(post_delete, sender=GroceryItem)
+@receiver(post_delete, sender=UserSavedRecipe)
+def record_sync_delete(sender, instance, origin=None, **kwargs):
+    """Log tombstones for deleted synced rows."""
+    started_by = sync.origin_model(origin)
+    if started_by is not None and issubclass(started_by, get_user_model()):
+        return  # the account and its change log are going away too
+    if sender is GroceryItem and started_by is GroceryList:
+        return  # the list's tombstone covers its items
+    sync.record_instance_change(instance, SyncChange.OP_DELETE)
+
+
+@receiver(pre_save, sender=MealHistory)
+def remember_meal_state(sender, instance, raw=False, **kwargs):
+    """Keep the stored version of an edited meal so its old day can be corrected."""
+    previous = None
+    if instance.pk and not raw:
+        previous = (
+            MealHistory.objects.filter(pk=instance.pk)
+            .values("user_id", "eaten_at", "calories_consumed", "macros_consumed")
+            .first()
+        )
+    instance._nutrition_previous = nutrition.meal_state(previous) if previous else None
+
+
+@receiver(post_save, sender=MealHistory)
+def update_nutrition_on_save(sender, instance, raw=False, **kwargs):
+    """Apply a logged or edited meal to the daily nutrition rollups."""
+    if raw:
+        return
+    nutrition.apply_meal_change(
+        getattr(instance, "_nutrition_previous", None), nutrition.meal_state(instance)
+    )
+
+
+@receiver(post_delete, sender=MealHistory)
+def update_nutrition_on_delete(sender, instance, origin=None, **kwargs):
+    """Remove a deleted meal from the daily nutrition rollups."""
+    started_by = sync.origin_model(origin)
+    if started_by is not None and issubclass(started_by, get_user_model()):
+        return  # the rollups are deleted with the account
+    nutrition.apply_meal_change(nutrition.meal_state(instance), None)
+
+
+@receiver(connection_created)
+def count_request_queries(sender, connection, **kwargs):
+    """Let the request metrics count queries on every new connection."""
+    install_query_counter(connection)
@@ -0,0 +1,117 @@
+from django.test import TestCase
+from django.utils.http import http_date
+from rest_framework.test import APIClient
+
+from users.models import User
+
+from .models import GroceryItem, GroceryList, PantryItem, SyncChange
+
+
+class ConditionalListTests(TestCase):
+    """Revalidation of the ETag-conditional list views (``api.conditional``)."""
+
+    def setUp(self):
+        self.user = User.objects.create_user(
+            username="conditional", email="conditional@example.com", password="x-password-123"
+        )
+        self.items = [
+            PantryItem.objects.create(user=self.user, name=name) for name in ("flour", "eggs", "milk")
+        ]
+        self.client = APIClient()
+        self.client.force_authenticate(self.user)
+
+    def test_unchanged_list_is_not_modified(self):
+        response = self.client.get("/api/v1/pantry/items/")
+        self.assertEqual(response.status_code, 200)
+        self.assertNotIn("Last-Modified", response.headers)
+
+        response = self.client.get("/api/v1/pantry/items/", HTTP_IF_NONE_MATCH=response["ETag"])
+        self.assertEqual(response.status_code, 304)
+
+    def test_delete_of_older_row_invalidates(self):
+        response = self.client.get("/api/v1/pantry/items/")
+        etag = response["ETag"]
+
+        # Not the newest row, so the latest updated_at stays the same.
+        response = self.client.delete(f"/api/v1/pantry/items/{self.items[0].pk}/")
+        self.assertIn(response.status_code, (200, 204))
+
+        response = self.client.get("/api/v1/pantry/items/", HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(len(response.json()), 2)
+
+        # If-Modified-Since is not a validator for these lists.
+        response = self.client.get(
+            "/api/v1/pantry/items/", HTTP_IF_MODIFIED_SINCE=http_date(2**31)
+        )
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(len(response.json()), 2)
+
+
+class ConsolidateTests(TestCase):
+    """Merging a grocery list with ``grocery/grocery-list/<id>/consolidate/``."""
+
+    def setUp(self):
+        self.user = User.objects.create_user(
+            username="consolidate", email="consolidate@example.com", password="x-password-123"
+        )
+        self.grocery_list = GroceryList.objects.create(user=self.user, name="Week")
+        self.url = f"/api/v1/grocery/grocery-list/{self.grocery_list.pk}/consolidate/"
+        self.client = APIClient()
+        self.client.force_authenticate(self.user)
+
+    def test_only_merged_rows_are_rewritten(self):
+        cans = GroceryItem.objects.create(
+            grocery_list=self.grocery_list, ingredient="tomatoes", quantity="3 x 400g cans"
+        )
+        flour = GroceryItem.objects.create(
+            grocery_list=self.grocery_list, ingredient="flour", quantity="200 g"
+        )
+        GroceryItem.objects.create(grocery_list=self.grocery_list, ingredient="Flour", quantity="1 kg")
+
+        response = self.client.post(self.url, {}, format="json")
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.json()["updated"], 1)
+        cans.refresh_from_db()
+        flour.refresh_from_db()
+        self.assertEqual(cans.quantity, "3 x 400g cans")
+        self.assertEqual(flour.quantity, "1.2 kg")
+
+    def test_overlong_quantity_is_rejected(self):
+        max_length = GroceryItem._meta.get_field("quantity").max_length
+        GroceryItem.objects.create(grocery_list=self.grocery_list, ingredient="salt", quantity="a pinch")
+        GroceryItem.objects.create(
+            grocery_list=self.grocery_list, ingredient="salt", quantity="x" * (max_length - 3)
+        )
+
+        response = self.client.post(self.url, {}, format="json")
+        self.assertEqual(response.status_code, 400)
+        self.assertEqual(GroceryItem.objects.filter(grocery_list=self.grocery_list).count(), 2)
+
+
+class SyncOverlapTests(TestCase):
+    """Delta sync must not skip log entries committed below a cursor already handed out."""
+
+    def setUp(self):
+        self.user = User.objects.create_user(
+            username="sync", email="sync@example.com", password="x-password-123"
+        )
+        self.client = APIClient()
+        self.client.force_authenticate(self.user)
+
+    def test_late_commit_below_cursor_is_sent(self):
+        cursor = self.client.get("/api/v1/sync/").json()["cursor"]
+        # Stand-in for a bulk write whose log id is taken but not yet committed.
+        reserved = SyncChange.objects.create(
+            user=self.user, kind=SyncChange.KIND_PANTRY_ITEM, object_id=0, op=SyncChange.OP_DELETE
+        )
+        reserved_id = reserved.pk
+        reserved.delete()
+        PantryItem.objects.create(user=self.user, name="eggs")
+        response = self.client.get("/api/v1/sync/", {"cursor": cursor}).json()
+        self.assertEqual([row["name"] for row in response["pantry_items"]["upserted"]], ["eggs"])
+
+        late = PantryItem.objects.create(user=self.user, name="flour")
+        SyncChange.objects.filter(object_id=late.pk).update(id=reserved_id)
+        response = self.client.get("/api/v1/sync/", {"cursor": response["cursor"]}).json()
+        self.assertIn("flour", [row["name"] for row in response["pantry_items"]["upserted"]])
@@ -4,5 +4,9 @@ urlpatterns = [
     path('recipes/', include('api.urls.recipe_urls')),
     path('grocery/', include('api.urls.grocery_urls')),
     path('pantry/', include('api.urls.pantry_urls')),
+    path('sync/', include('api.urls.sync_urls')),
+    path('nutrition/', include('api.urls.nutrition_urls')),
+    path('meal-plans/', include('api.urls.meal_plan_urls')),
+    path('metrics/', include('api.urls.metrics_urls')),
     path('profile/', include('users.urls')),
 ]
@@ -2,7 +2,9 @@ from django.urls import path
 from ..views.grocery_views import (
     grocery_lists,
     grocery_list_detail,
+    grocery_list_consolidate,
     grocery_items,
+    grocery_items_bulk,
     grocery_item_detail,
 )
 
@@ -11,7 +13,13 @@ urlpatterns = [
     path(
         "grocery-list/<int:list_id>/", grocery_list_detail, name="grocery_list_detail"
     ),
+    path(
+        "grocery-list/<int:list_id>/consolidate/",
+        grocery_list_consolidate,
+        name="grocery_list_consolidate",
+    ),
     path("grocery-item/", grocery_items, name="grocery_items"),
+    path("grocery-item/bulk/", grocery_items_bulk, name="grocery_items_bulk"),
     path(
         "grocery-item/<int:item_id>/", grocery_item_detail, name="grocery_item_detail"
     ),
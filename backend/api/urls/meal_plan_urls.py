@@ -0,0 +1,15 @@
+from django.conf import settings
+from django.urls import path
+
+from api.views import meal_plan_detail, meal_plan_stream, meal_plan_stream_async, meal_plans
+
+# Under ASGI the stream is an async view, so slots are sent as they finish.
+if getattr(settings, "ASYNC_VIEWS", {}).get("ENABLED"):
+    meal_plan_stream = meal_plan_stream_async
+
+
+urlpatterns = [
+    path("", meal_plans, name="meal_plans"),
+    path("stream/", meal_plan_stream, name="meal_plan_stream"),
+    path("<int:plan_id>/", meal_plan_detail, name="meal_plan_detail"),
+]
@@ -0,0 +1,10 @@
+from django.urls import path
+
+from api.views import bedrock_metrics, prometheus_metrics, request_metrics
+
+
+urlpatterns = [
+    path("bedrock/", bedrock_metrics, name="bedrock_metrics"),
+    path("requests/", request_metrics, name="request_metrics"),
+    path("prometheus/", prometheus_metrics, name="prometheus_metrics"),
+]
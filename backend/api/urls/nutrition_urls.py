@@ -0,0 +1,22 @@
+from django.urls import path
+
+from api.views import (
+    grocery_list_nutrition,
+    meal_detail,
+    meals,
+    nutrition_summary,
+    saved_recipes_nutrition,
+)
+
+
+urlpatterns = [
+    path("meals/", meals, name="meals"),
+    path("meals/<int:meal_id>/", meal_detail, name="meal_detail"),
+    path("summary/", nutrition_summary, name="nutrition_summary"),
+    path(
+        "grocery-lists/<int:list_id>/",
+        grocery_list_nutrition,
+        name="grocery_list_nutrition",
+    ),
+    path("saved-recipes/", saved_recipes_nutrition, name="saved_recipes_nutrition"),
+]
@@ -1,16 +1,38 @@
+from django.conf import settings
 from django.urls import path
 from ..views.recipe_views import (
     generate_recipe, 
+    generate_recipe_stream,
     suggest_recipes_from_pantry,
+    search_recipes,
+    recipe_detail,
     save_recipe,
     get_saved_recipes,
     delete_saved_recipe
 )
+from ..views.async_recipe_views import (
+    generate_recipe_async,
+    generate_recipe_stream_async,
+    suggest_recipes_from_pantry_async,
+)
+from ..views.job_views import recipe_jobs, recipe_job_detail
+
+# Under ASGI the Bedrock-bound endpoints run as async views, so a worker
+# keeps many Bedrock calls in flight without a thread per request.
+if getattr(settings, 'ASYNC_VIEWS', {}).get('ENABLED'):
+    generate_recipe = generate_recipe_async
+    generate_recipe_stream = generate_recipe_stream_async
+    suggest_recipes_from_pantry = suggest_recipes_from_pantry_async
 
 urlpatterns = [
     path('generate/', generate_recipe, name='generate_recipe'),
+    path('generate/stream/', generate_recipe_stream, name='generate_recipe_stream'),
     path('pantry-suggestions/', suggest_recipes_from_pantry, name='pantry_suggestions'),
+    path('search/', search_recipes, name='search_recipes'),
+    path('<int:recipe_id>/', recipe_detail, name='recipe_detail'),
     path('saved-recipes/', get_saved_recipes, name='get_saved_recipes'),
     path('save-recipes/', save_recipe, name='save_recipe'),
     path('saved-recipes/<int:recipe_id>/', delete_saved_recipe, name='delete_saved_recipe'),
+    path('jobs/', recipe_jobs, name='recipe_jobs'),
+    path('jobs/<uuid:job_id>/', recipe_job_detail, name='recipe_job_detail'),
 ]
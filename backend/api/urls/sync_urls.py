@@ -0,0 +1,8 @@
+from django.urls import path
+
+from api.views import sync_changes
+
+
+urlpatterns = [
+    path("", sync_changes, name="sync_changes"),
+]
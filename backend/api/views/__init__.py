@@ -1,31 +1,89 @@
 from .recipe_views import (
     generate_recipe,
+    generate_recipe_stream,
     suggest_recipes_from_pantry,
+    search_recipes,
+    recipe_detail,
     save_recipe,
     get_saved_recipes,
     delete_saved_recipe,
 )
+from .async_recipe_views import (
+    generate_recipe_async,
+    generate_recipe_stream_async,
+    suggest_recipes_from_pantry_async,
+)
 from .grocery_views import (
     grocery_lists,
     grocery_list_detail,
+    grocery_list_consolidate,
     grocery_items,
+    grocery_items_bulk,
     grocery_item_detail,
 )
+from .job_views import (
+    recipe_jobs,
+    recipe_job_detail,
+)
+from .sync_views import sync_changes
+from .nutrition_views import (
+    meals,
+    meal_detail,
+    nutrition_summary,
+    grocery_list_nutrition,
+    saved_recipes_nutrition,
+)
+from .meal_plan_views import (
+    meal_plans,
+    meal_plan_stream,
+    meal_plan_detail,
+)
+from .async_meal_plan_views import meal_plan_stream_async
+from .metrics_views import (
+    bedrock_metrics,
+    request_metrics,
+    prometheus_metrics,
+)
 from .pantry_views import (
     pantry_items,
+    pantry_import,
     pantry_item_detail,
 )
 
 __all__ = [
     "generate_recipe",
+    "generate_recipe_stream",
     "suggest_recipes_from_pantry",
+    "search_recipes",
+    "recipe_detail",
     "save_recipe",
     "get_saved_recipes",
     "delete_saved_recipe",
+    "generate_recipe_async",
+    "generate_recipe_stream_async",
+    "suggest_recipes_from_pantry_async",
     "grocery_lists",
     "grocery_list_detail",
+    "grocery_list_consolidate",
     "grocery_items",
+    "grocery_items_bulk",
     "grocery_item_detail",
+    "recipe_jobs",
+    "recipe_job_detail",
+    "sync_changes",
+    "meals",
+    "meal_detail",
+    "nutrition_summary",
+    "grocery_list_nutrition",
+    "saved_recipes_nutrition",
+    "meal_plans",
+    "meal_plan_stream",
+    "meal_plan_detail",
+    "meal_plan_stream_async",
     "pantry_items",
+    "pantry_import",
     "pantry_item_detail",
+    "bedrock_metrics",
+    "request_metrics",
+    "prometheus_metrics",
 ]
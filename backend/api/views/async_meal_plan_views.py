@@ -0,0 +1,38 @@
+from django.http import JsonResponse
+from rest_framework import exceptions
+
+from ..services.async_executors import iterate_bedrock, run_db
+from .async_recipe_views import _error_response, _prepare, _request_data, _sse_response
+from .meal_plan_views import _begin_generation, _plan_events
+
+# Async counterpart of meal_plan_views.meal_plan_stream, routed in its place
+# when settings.ASYNC_VIEWS["ENABLED"] is set; see async_recipe_views.
+
+
+async def meal_plan_stream_async(request):
+    """
+    Generate a meal plan, streamed as server-sent events.
+
+    Same events as ``meal_plan_stream``; each is sent as soon as its slot
+    finishes.
+    """
+    error = await _prepare(request, "POST")
+    if error is not None:
+        return error
+
+    try:
+        data = _request_data(request)
+    except ValueError as e:
+        return _error_response(exceptions.ParseError(f"JSON parse error - {e}"))
+
+    generation, error = await run_db(_begin_generation, request.user, data)
+    if error is not None:
+        body, status_code, headers = error
+        return JsonResponse(body, status=status_code, headers=headers, safe=False)
+
+    # Slots are waited for on the Bedrock executor, like the calls filling them.
+    return _sse_response(iterate_bedrock(_plan_events(request.user, generation)))
+
+
+# Django 4.2's csrf_exempt wraps the view in a sync function.
+meal_plan_stream_async.csrf_exempt = True
@@ -0,0 +1,181 @@
+import json
+
+from django.http import JsonResponse, StreamingHttpResponse
+from rest_framework import exceptions, status
+from rest_framework.settings import api_settings
+
+from ..services.async_executors import iterate_bedrock, run_db
+from ..services.aws_bedrock import agenerate_recipe as bedrock_generate_recipe
+from ..services.aws_bedrock import asuggest_recipes_from_pantry as bedrock_suggest_recipes
+from ..services.bedrock_metrics import call_context
+from ..services.ingredient_index import suggest_from_index
+from .recipe_views import _pantry_grocery_items, _profile_payload, _recipe_events
+
+# Async counterparts of the Bedrock-bound views in recipe_views, routed in
+# place of them when settings.ASYNC_VIEWS["ENABLED"] is set (under ASGI).
+# DRF's api_view is sync-only, so authentication, method checks and error
+# shapes are reproduced here; blocking work goes through the executors in
+# services.async_executors. Token authentication needs no CSRF check, as
+# with DRF's views. Streaming views return an async iterator: Django runs a
+# sync one to completion in a thread before sending anything under ASGI.
+
+
+def _error_response(exc):
+    """The response DRF's exception handler gives for ``exc``"""
+    data = exc.detail if isinstance(exc.detail, (list, dict)) else {'detail': exc.detail}
+    return JsonResponse(data, status=exc.status_code, safe=False)
+
+
+def _authenticate(request):
+    """
+    Authenticate ``request`` like DRF with ``IsAuthenticated`` would
+
+    Sets ``request.user`` and returns ``None``, or returns the 401 response.
+    """
+    authenticators = [cls() for cls in api_settings.DEFAULT_AUTHENTICATION_CLASSES]
+    try:
+        for authenticator in authenticators:
+            result = authenticator.authenticate(request)
+            if result is not None:
+                request.user, request.auth = result
+                return None
+        exc = exceptions.NotAuthenticated()
+    except exceptions.AuthenticationFailed as e:
+        exc = e
+
+    response = _error_response(exc)
+    if authenticators:
+        response['WWW-Authenticate'] = authenticators[0].authenticate_header(request)
+    return response
+
+
+async def _prepare(request, method):
+    """Method check and authentication; returns an error response or ``None``"""
+    if request.method != method:
+        response = _error_response(exceptions.MethodNotAllowed(request.method))
+        response['Allow'] = f'{method}, OPTIONS'
+        return response
+    return await run_db(_authenticate, request)
+
+
+def _request_data(request):
+    """``request.data`` for a JSON or form body"""
+    if request.content_type == 'application/json':
+        return json.loads(request.body or b'{}')
+    return request.POST
+
+
+async def generate_recipe_async(request):
+    """Generate a new recipe using AI"""
+    error = await _prepare(request, 'POST')
+    if error is not None:
+        return error
+
+    try:
+        data = _request_data(request)
+    except ValueError as e:
+        return _error_response(exceptions.ParseError(f'JSON parse error - {e}'))
+    prompt = data.get('prompt') if hasattr(data, 'get') else None
+
+    if not prompt:
+        return JsonResponse(
+            {'error': 'Prompt is required'},
+            status=status.HTTP_400_BAD_REQUEST
+        )
+
+    try:
+        # The profile usually comes attached to the cached user; a user
+        # built from token claims loads it with a query.
+        user_profile = await run_db(_profile_payload, request.user)
+
+        with call_context('recipes/generate', request.user.id):
+            recipe_data = await bedrock_generate_recipe(prompt, user_profile)
+
+        return JsonResponse(recipe_data, status=status.HTTP_200_OK, safe=False)
+
+    except Exception as e:
+        return JsonResponse(
+            {'error': f'Recipe generation failed: {str(e)}'},
+            status=status.HTTP_500_INTERNAL_SERVER_ERROR
+        )
+
+
+def _sse_response(events):
+    """A server-sent events response over the async iterator ``events``"""
+    response = StreamingHttpResponse(events, content_type='text/event-stream')
+    response['Cache-Control'] = 'no-cache'
+    response['X-Accel-Buffering'] = 'no'  # stop nginx from buffering the stream
+    return response
+
+
+async def generate_recipe_stream_async(request):
+    """Generate a new recipe using AI, streamed as server-sent events"""
+    error = await _prepare(request, 'POST')
+    if error is not None:
+        return error
+
+    try:
+        data = _request_data(request)
+    except ValueError as e:
+        return _error_response(exceptions.ParseError(f'JSON parse error - {e}'))
+    prompt = data.get('prompt') if hasattr(data, 'get') else None
+
+    if not prompt:
+        return JsonResponse(
+            {'error': 'Prompt is required'},
+            status=status.HTTP_400_BAD_REQUEST
+        )
+
+    try:
+        user_profile = await run_db(_profile_payload, request.user)
+    except Exception as e:
+        return JsonResponse(
+            {'error': f'Recipe generation failed: {str(e)}'},
+            status=status.HTTP_500_INTERNAL_SERVER_ERROR
+        )
+
+    return _sse_response(iterate_bedrock(_recipe_events(prompt, user_profile, request.user.id)))
+
+
+def _index_suggestions(user):
+    """Pantry items and the stored recipes they already cover"""
+    grocery_items = _pantry_grocery_items(user)
+    if not grocery_items:
+        return grocery_items, []
+    return grocery_items, suggest_from_index(
+        [item['ingredient_name'] for item in grocery_items]
+    )
+
+
+async def suggest_recipes_from_pantry_async(request):
+    """Suggest recipes based on user's grocery list"""
+    error = await _prepare(request, 'GET')
+    if error is not None:
+        return error
+
+    try:
+        grocery_items, recipes_data = await run_db(_index_suggestions, request.user)
+
+        if not grocery_items:
+            return JsonResponse(
+                {'error': 'No items in grocery list'},
+                status=status.HTTP_400_BAD_REQUEST
+            )
+
+        if not recipes_data:
+            with call_context('recipes/pantry-suggestions', request.user.id):
+                recipes_data = await bedrock_suggest_recipes(grocery_items)
+
+        return JsonResponse(recipes_data, status=status.HTTP_200_OK, safe=False)
+
+    except Exception as e:
+        return JsonResponse(
+            {'error': f'Recipe suggestion failed: {str(e)}'},
+            status=status.HTTP_500_INTERNAL_SERVER_ERROR
+        )
+
+
+# Django 4.2's csrf_exempt wraps the view in a sync function.
+generate_recipe_async.csrf_exempt = True
+generate_recipe_stream_async.csrf_exempt = True
+suggest_recipes_from_pantry_async.csrf_exempt = True
@@ -1,15 +1,40 @@
+from django.conf import settings
 from django.shortcuts import get_object_or_404
 from rest_framework import status
 from rest_framework.decorators import api_view, permission_classes
 from rest_framework.permissions import IsAuthenticated
 from rest_framework.response import Response
 
+from ..conditional import conditional_list, list_state
 from ..models import GroceryItem, GroceryList
+from ..pagination import (
+    InvalidCursor,
+    paginate_request,
+    paginated_response,
+    wants_pagination,
+)
 from ..serializers import GroceryItemSerializer, GroceryListSerializer
+from ..services.grocery_bulk import BulkOperationError, apply_grocery_item_operations
+from ..services.grocery_consolidation import (
+    QuantityTooLong,
+    RecipeNotFound,
+    consolidate_grocery_list,
+)
+
+
+def _grocery_lists_state(request):
+    # Lists are returned with their items, so both feed the validators.
+    return [
+        list_state(GroceryList.objects.filter(user=request.user), "updated_at"),
+        list_state(
+            GroceryItem.objects.filter(grocery_list__user=request.user), "updated_at"
+        ),
+    ]
 
 
 @api_view(["GET", "POST"])
 @permission_classes([IsAuthenticated])
+@conditional_list(_grocery_lists_state)
 def grocery_lists(request):
     """List or create grocery lists for the authenticated user."""
 
@@ -19,6 +44,15 @@ def grocery_lists(request):
             .order_by("created_at")
             .prefetch_related("items")
         )
+        if wants_pagination(request):
+            try:
+                page, next_cursor = paginate_request(
+                    request, grocery_lists_qs, ["created_at", "id"]
+                )
+            except InvalidCursor as e:
+                return Response({"error": str(e)}, status=status.HTTP_400_BAD_REQUEST)
+            serializer = GroceryListSerializer(page, many=True)
+            return paginated_response(serializer.data, next_cursor)
         serializer = GroceryListSerializer(grocery_lists_qs, many=True)
         return Response(serializer.data, status=status.HTTP_200_OK)
 
@@ -51,6 +85,42 @@ def grocery_list_detail(request, list_id):
     return Response(status=status.HTTP_204_NO_CONTENT)
 
 
+@api_view(["POST"])
+@permission_classes([IsAuthenticated])
+def grocery_list_consolidate(request, list_id):
+    """
+    Add recipes' ingredients to a grocery list and merge it to one item per ingredient.
+
+    Body: ``{"recipe_ids": [...], "dry_run": false}``. Both are optional;
+    with no recipes the list's existing items are merged.
+    """
+
+    grocery_list = get_object_or_404(GroceryList, id=list_id, user=request.user)
+    recipe_ids = request.data.get("recipe_ids", [])
+    if not isinstance(recipe_ids, list) or not all(
+        isinstance(recipe_id, int) and not isinstance(recipe_id, bool)
+        for recipe_id in recipe_ids
+    ):
+        return Response(
+            {"error": "recipe_ids must be a list of recipe ids."},
+            status=status.HTTP_400_BAD_REQUEST,
+        )
+    max_recipes = getattr(settings, "GROCERY_CONSOLIDATE_MAX_RECIPES", 100)
+    if len(recipe_ids) > max_recipes:
+        return Response(
+            {"error": f"At most {max_recipes} recipes per request."},
+            status=status.HTTP_400_BAD_REQUEST,
+        )
+
+    try:
+        report = consolidate_grocery_list(
+            grocery_list, recipe_ids, dry_run=bool(request.data.get("dry_run", False))
+        )
+    except (RecipeNotFound, QuantityTooLong) as e:
+        return Response({"error": str(e)}, status=status.HTTP_400_BAD_REQUEST)
+    return Response(report, status=status.HTTP_200_OK)
+
+
 @api_view(["GET", "POST"])
 @permission_classes([IsAuthenticated])
 def grocery_items(request):
@@ -61,6 +131,15 @@ def grocery_items(request):
         items_qs = GroceryItem.objects.filter(grocery_list__user=request.user)
         if grocery_list_id:
             items_qs = items_qs.filter(grocery_list_id=grocery_list_id)
+        if wants_pagination(request):
+            try:
+                page, next_cursor = paginate_request(
+                    request, items_qs, ["created_at", "id"]
+                )
+            except InvalidCursor as e:
+                return Response({"error": str(e)}, status=status.HTTP_400_BAD_REQUEST)
+            serializer = GroceryItemSerializer(page, many=True)
+            return paginated_response(serializer.data, next_cursor)
         serializer = GroceryItemSerializer(items_qs, many=True)
         return Response(serializer.data, status=status.HTTP_200_OK)
 
@@ -77,6 +156,31 @@ def grocery_items(request):
     return Response(serializer.errors, status=status.HTTP_400_BAD_REQUEST)
 
 
+@api_view(["POST"])
+@permission_classes([IsAuthenticated])
+def grocery_items_bulk(request):
+    """Apply a batch of create/update/delete operations to grocery items atomically."""
+
+    operations = (
+        request.data.get("operations") if isinstance(request.data, dict) else request.data
+    )
+    try:
+        applied, results = apply_grocery_item_operations(
+            request.user,
+            operations,
+            max_operations=getattr(settings, "GROCERY_BULK_MAX_OPERATIONS", 500),
+        )
+    except BulkOperationError as e:
+        return Response({"error": str(e)}, status=status.HTTP_400_BAD_REQUEST)
+
+    if not applied:
+        return Response(
+            {"error": "No operations were applied.", "results": results},
+            status=status.HTTP_400_BAD_REQUEST,
+        )
+    return Response({"results": results}, status=status.HTTP_200_OK)
+
+
 @api_view(["GET", "PUT", "DELETE"])
 @permission_classes([IsAuthenticated])
 def grocery_item_detail(request, item_id):
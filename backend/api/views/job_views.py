@@ -0,0 +1,85 @@
+import math
+
+from django.conf import settings
+from rest_framework import status
+from rest_framework.decorators import api_view, permission_classes
+from rest_framework.permissions import IsAuthenticated
+from rest_framework.response import Response
+
+from ..models import RecipeJob
+from ..serializers import RecipeJobSerializer
+from ..services.job_queue import QueueFull, get_job_queue
+from .recipe_views import _pantry_grocery_items, _profile_payload
+
+
+@api_view(["POST"])
+@permission_classes([IsAuthenticated])
+def recipe_jobs(request):
+    """Queue a recipe generation or pantry suggestion job and return its id."""
+
+    kind = request.data.get("kind", RecipeJob.KIND_GENERATE)
+
+    # Inputs are snapshotted now so workers never touch the request user.
+    if kind == RecipeJob.KIND_GENERATE:
+        prompt = request.data.get("prompt")
+        if not prompt:
+            return Response(
+                {"error": "Prompt is required"}, status=status.HTTP_400_BAD_REQUEST
+            )
+        payload = {"prompt": prompt, "user_profile": _profile_payload(request.user)}
+    elif kind == RecipeJob.KIND_PANTRY_SUGGESTIONS:
+        grocery_items = _pantry_grocery_items(request.user)
+        if not grocery_items:
+            return Response(
+                {"error": "No items in pantry"}, status=status.HTTP_400_BAD_REQUEST
+            )
+        payload = {"grocery_items": grocery_items}
+    else:
+        choices = [choice for choice, _ in RecipeJob.KIND_CHOICES]
+        return Response(
+            {"error": f"kind must be one of {choices}."},
+            status=status.HTTP_400_BAD_REQUEST,
+        )
+
+    try:
+        job = get_job_queue().submit(request.user, kind, payload)
+    except QueueFull as e:
+        return Response(
+            {"error": str(e)},
+            status=status.HTTP_503_SERVICE_UNAVAILABLE,
+            headers={"Retry-After": "5"},
+        )
+
+    serializer = RecipeJobSerializer(job)
+    return Response(serializer.data, status=status.HTTP_202_ACCEPTED)
+
+
+@api_view(["GET"])
+@permission_classes([IsAuthenticated])
+def recipe_job_detail(request, job_id):
+    """
+    Return a job's status and result.
+
+    Pass ``?wait=<seconds>`` to long-poll: the response is held until the job
+    finishes or the wait (capped by ``RECIPE_JOBS["MAX_WAIT_SECONDS"]``) ends.
+    """
+
+    try:
+        wait = float(request.query_params.get("wait", 0))
+        # NaN would slip through min()/max() below and never time out.
+        if not math.isfinite(wait):
+            raise ValueError(wait)
+    except ValueError:
+        return Response(
+            {"error": "wait must be a number of seconds."},
+            status=status.HTTP_400_BAD_REQUEST,
+        )
+    max_wait = getattr(settings, "RECIPE_JOBS", {}).get("MAX_WAIT_SECONDS", 25)
+    wait = min(max(wait, 0), max_wait)
+
+    job = get_job_queue().wait(job_id, user_id=request.user.id, timeout=wait)
+    if job is None:
+        return Response({"error": "Job not found"}, status=status.HTTP_404_NOT_FOUND)
+
+    serializer = RecipeJobSerializer(job)
+    return Response(serializer.data, status=status.HTTP_200_OK)
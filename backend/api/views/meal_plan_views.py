@@ -0,0 +1,155 @@
+from django.db.models import Prefetch
+from django.http import StreamingHttpResponse
+from django.shortcuts import get_object_or_404
+from rest_framework import status
+from rest_framework.decorators import api_view, permission_classes
+from rest_framework.permissions import IsAuthenticated
+from rest_framework.response import Response
+
+from ..models import MealPlan, MealPlanEntry
+from ..pagination import (
+    InvalidCursor,
+    paginate_request,
+    paginated_response,
+    wants_pagination,
+)
+from ..serializers import (
+    MealPlanEntrySerializer,
+    MealPlanRequestSerializer,
+    MealPlanSerializer,
+    MealPlanSummarySerializer,
+)
+from ..services.meal_plans import PlanGeneration, PoolFull, create_plan
+from ..services.nutrition_engine import meal_plan_matrix
+from ..services.recipe_stream import format_sse
+from .recipe_views import _profile_payload
+
+
+def _plan_with_entries(user, plan_id):
+    """A plan with its entries and their recipes loaded in two queries."""
+    entries = MealPlanEntry.objects.select_related("recipe").defer("recipe__search_vector")
+    plans = MealPlan.objects.prefetch_related(Prefetch("entries", queryset=entries))
+    return get_object_or_404(plans, id=plan_id, user=user)
+
+
+def _plan_payload(plan):
+    """Serialized plan plus its calorie and macro totals for the whole plan and per day."""
+    totals = meal_plan_matrix(plan).totals(servings=plan.days)
+    return {
+        **MealPlanSerializer(plan).data,
+        "nutrition": {
+            "totals": totals["totals"],
+            "per_day": totals["per_serving"],
+            "known": totals["known"],
+        },
+    }
+
+
+def _begin_generation(user, data):
+    """
+    Validate the request body, store the plan and start generating its slots.
+
+    Returns ``(generation, None)`` or ``(None, (body, status, headers))``.
+    """
+    serializer = MealPlanRequestSerializer(data=data)
+    if not serializer.is_valid():
+        return None, (serializer.errors, status.HTTP_400_BAD_REQUEST, None)
+
+    user_profile = _profile_payload(user)
+    plan = create_plan(user, goal=user_profile.get("goal"), **serializer.validated_data)
+    try:
+        return PlanGeneration(plan, user_profile), None
+    except PoolFull as e:
+        plan.delete()
+        return None, ({"error": str(e)}, status.HTTP_503_SERVICE_UNAVAILABLE, {"Retry-After": "10"})
+
+
+def _start_generation(request):
+    """``_begin_generation`` for a DRF request; errors come back as a ``Response``."""
+    generation, error = _begin_generation(request.user, request.data)
+    if error is not None:
+        body, status_code, headers = error
+        return None, Response(body, status=status_code, headers=headers)
+    return generation, None
+
+
+def _plan_events(user, generation):
+    """Server-sent events for a streamed meal plan generation."""
+    try:
+        plan = _plan_with_entries(user, generation.plan.id)
+        yield format_sse("plan", MealPlanSerializer(plan).data)
+        for event, data in generation.events():
+            if event == "entry":
+                yield format_sse("entry", MealPlanEntrySerializer(data).data)
+        plan = _plan_with_entries(user, generation.plan.id)
+        yield format_sse("done", _plan_payload(plan))
+    except Exception as e:
+        yield format_sse("error", {"error": f"Meal plan generation failed: {str(e)}"})
+    finally:
+        generation.close()
+
+
+@api_view(["GET", "POST"])
+@permission_classes([IsAuthenticated])
+def meal_plans(request):
+    """
+    List the caller's meal plans (newest first), or generate a new one.
+
+    POST waits for every slot and returns the finished plan; use
+    ``meal-plans/stream/`` to receive slots as they are generated.
+    """
+
+    if request.method == "GET":
+        plans = MealPlan.objects.filter(user=request.user).order_by("-created_at", "-id")
+        if wants_pagination(request):
+            try:
+                page, next_cursor = paginate_request(request, plans, ["-created_at", "-id"])
+            except InvalidCursor as e:
+                return Response({"error": str(e)}, status=status.HTTP_400_BAD_REQUEST)
+            serializer = MealPlanSummarySerializer(page, many=True)
+            return paginated_response(serializer.data, next_cursor)
+        serializer = MealPlanSummarySerializer(plans, many=True)
+        return Response(serializer.data, status=status.HTTP_200_OK)
+
+    generation, error_response = _start_generation(request)
+    if error_response is not None:
+        return error_response
+    plan = generation.run()
+    plan = _plan_with_entries(request.user, plan.id)
+    return Response(_plan_payload(plan), status=status.HTTP_201_CREATED)
+
+
+@api_view(["POST"])
+@permission_classes([IsAuthenticated])
+def meal_plan_stream(request):
+    """
+    Generate a meal plan, streamed as server-sent events.
+
+    A ``plan`` event with every slot pending comes first, then one ``entry``
+    event per slot in the order they finish (cached slots first), then a
+    ``done`` event with the finished plan and its nutrition totals.
+    """
+
+    generation, error_response = _start_generation(request)
+    if error_response is not None:
+        return error_response
+    response = StreamingHttpResponse(
+        _plan_events(request.user, generation), content_type="text/event-stream"
+    )
+    response["Cache-Control"] = "no-cache"
+    response["X-Accel-Buffering"] = "no"  # stop nginx from buffering the stream
+    return response
+
+
+@api_view(["GET", "DELETE"])
+@permission_classes([IsAuthenticated])
+def meal_plan_detail(request, plan_id):
+    """Retrieve a meal plan with its recipes and nutrition totals, or delete it."""
+
+    if request.method == "DELETE":
+        plan = get_object_or_404(MealPlan, id=plan_id, user=request.user)
+        plan.delete()
+        return Response(status=status.HTTP_204_NO_CONTENT)
+
+    plan = _plan_with_entries(request.user, plan_id)
+    return Response(_plan_payload(plan), status=status.HTTP_200_OK)
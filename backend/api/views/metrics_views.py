@@ -0,0 +1,106 @@
+from datetime import timedelta
+
+from django.conf import settings
+from django.db.models import Avg, Count, Q, Sum
+from django.db.models.functions import TruncDate
+from django.http import HttpResponse, HttpResponseForbidden
+from django.utils import timezone
+from rest_framework import status
+from rest_framework.decorators import api_view, permission_classes
+from rest_framework.permissions import IsAdminUser
+from rest_framework.response import Response
+
+from ..models import BedrockCallLog
+from ..services.bedrock_metrics import get_bedrock_metrics
+from ..services.request_metrics import get_request_metrics, render_prometheus
+
+
+def _non_negative_int(request, name, default, maximum):
+    value = request.query_params.get(name)
+    if value in (None, ""):
+        return default
+    try:
+        value = int(value)
+    except ValueError:
+        value = -1
+    if value < 0:
+        raise ValueError(f"{name} must be a non-negative integer")
+    return min(value, maximum)
+
+
+def _daily_trends(days):
+    """Persisted calls per day and endpoint over the last ``days`` days."""
+    since = timezone.now() - timedelta(days=days)
+    rows = (
+        BedrockCallLog.objects.filter(created_at__gte=since)
+        .annotate(day=TruncDate("created_at"))
+        .values("day", "endpoint")
+        .annotate(
+            calls=Count("id"),
+            errors=Count("id", filter=~Q(status=BedrockCallLog.STATUS_OK)),
+            parse_failures=Count("id", filter=Q(status=BedrockCallLog.STATUS_PARSE_ERROR)),
+            mean_wall_ms=Avg("wall_ms"),
+            mean_ttfb_ms=Avg("ttfb_ms"),
+            input_tokens=Sum("input_tokens"),
+            output_tokens=Sum("output_tokens"),
+            cost_usd=Sum("cost_usd"),
+        )
+        .order_by("day", "endpoint")
+    )
+    return [
+        {
+            **row,
+            "day": row["day"].isoformat(),
+            "mean_wall_ms": round(row["mean_wall_ms"], 1),
+            "mean_ttfb_ms": None if row["mean_ttfb_ms"] is None else round(row["mean_ttfb_ms"], 1),
+            "cost_usd": None if row["cost_usd"] is None else float(row["cost_usd"]),
+        }
+        for row in rows
+    ]
+
+
+@api_view(["GET"])
+@permission_classes([IsAdminUser])
+def bedrock_metrics(request):
+    """
+    Bedrock latency, token and cost aggregates for this worker process.
+
+    Broken down per endpoint, per model and for the ``users`` busiest users
+    (default 20). ``days`` adds daily per-endpoint trends from the persisted
+    call log, which covers every worker when ``BEDROCK_METRICS["PERSIST"]``
+    is on.
+    """
+
+    try:
+        top_users = _non_negative_int(request, "users", 20, 1000)
+        days = _non_negative_int(request, "days", 0, 365)
+    except ValueError as e:
+        return Response({"error": str(e)}, status=status.HTTP_400_BAD_REQUEST)
+
+    data = get_bedrock_metrics().snapshot(top_users=top_users)
+    if days:
+        data["daily"] = _daily_trends(days)
+    return Response(data, status=status.HTTP_200_OK)
+
+
+@api_view(["GET"])
+@permission_classes([IsAdminUser])
+def request_metrics(request):
+    """Per-route latency percentiles, query counts and SQL time for this worker process."""
+    return Response(get_request_metrics().snapshot(), status=status.HTTP_200_OK)
+
+
+def prometheus_metrics(request):
+    """
+    Request and Bedrock metrics in the Prometheus text format.
+
+    A plain Django view so scrapers need no API token; it only answers
+    clients in ``REQUEST_METRICS["PROMETHEUS_ALLOWED_IPS"]`` (loopback by
+    default). Each worker process reports its own series.
+    """
+    allowed = getattr(settings, "REQUEST_METRICS", {}).get(
+        "PROMETHEUS_ALLOWED_IPS", ["127.0.0.1", "::1"]
+    )
+    if request.META.get("REMOTE_ADDR") not in allowed:
+        return HttpResponseForbidden()
+    return HttpResponse(render_prometheus(), content_type="text/plain; version=0.0.4; charset=utf-8")
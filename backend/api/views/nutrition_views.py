@@ -0,0 +1,195 @@
+import math
+from datetime import date, datetime, time, timedelta
+
+from django.shortcuts import get_object_or_404
+from django.utils import timezone
+from rest_framework import status
+from rest_framework.decorators import api_view, permission_classes
+from rest_framework.permissions import IsAuthenticated
+from rest_framework.response import Response
+
+from ..models import GroceryList, MealHistory
+from ..pagination import (
+    InvalidCursor,
+    paginate_request,
+    paginated_response,
+    wants_pagination,
+)
+from ..serializers import MealHistorySerializer
+from ..services.nutrition import PERIODS, nutrition_summary as summarize
+from ..services.nutrition_engine import (
+    GOAL_SPLITS,
+    grocery_list_matrix,
+    ranked_goal_fit,
+    saved_recipes_matrix,
+)
+
+# Longest range one summary request may cover.
+MAX_SUMMARY_DAYS = 366 * 2
+
+
+def _date_range(request, default_days=7):
+    """``(start, end)`` from ``?start=&end=`` (ISO dates); raises ``ValueError``."""
+    start = request.query_params.get("start")
+    end = request.query_params.get("end")
+    end = date.fromisoformat(end) if end else timezone.localdate()
+    start = date.fromisoformat(start) if start else end - timedelta(days=default_days - 1)
+    if start > end:
+        raise ValueError("start must not be after end")
+    return start, end
+
+
+def _positive_number(request, name, default=None):
+    """Optional positive float query parameter; raises ``ValueError``."""
+    value = request.query_params.get(name)
+    if value in (None, ""):
+        return default
+    value = float(value)
+    # float() accepts "nan" and "inf", which would not serialize to JSON.
+    if not math.isfinite(value) or value <= 0:
+        raise ValueError(f"{name} must be a positive number")
+    return value
+
+
+def _profile_goal(user):
+    profile = getattr(user, "profile", None)
+    return getattr(profile, "goal", None)
+
+
+@api_view(["GET", "POST"])
+@permission_classes([IsAuthenticated])
+def meals(request):
+    """List (newest first) or log meals for the authenticated user."""
+
+    if request.method == "GET":
+        meals_qs = MealHistory.objects.filter(user=request.user).order_by(
+            "-eaten_at", "-id"
+        )
+        if request.query_params.get("start") or request.query_params.get("end"):
+            try:
+                start, end = _date_range(request)
+            except ValueError as e:
+                return Response({"error": str(e)}, status=status.HTTP_400_BAD_REQUEST)
+            # A half-open datetime range keeps the (user, eaten_at) index usable.
+            meals_qs = meals_qs.filter(
+                eaten_at__gte=timezone.make_aware(datetime.combine(start, time.min)),
+                eaten_at__lt=timezone.make_aware(
+                    datetime.combine(end + timedelta(days=1), time.min)
+                ),
+            )
+        if wants_pagination(request):
+            try:
+                page, next_cursor = paginate_request(
+                    request, meals_qs, ["-eaten_at", "-id"]
+                )
+            except InvalidCursor as e:
+                return Response({"error": str(e)}, status=status.HTTP_400_BAD_REQUEST)
+            serializer = MealHistorySerializer(page, many=True)
+            return paginated_response(serializer.data, next_cursor)
+        serializer = MealHistorySerializer(meals_qs, many=True)
+        return Response(serializer.data, status=status.HTTP_200_OK)
+
+    serializer = MealHistorySerializer(data=request.data)
+    if serializer.is_valid():
+        serializer.save(user=request.user)
+        return Response(serializer.data, status=status.HTTP_201_CREATED)
+    return Response(serializer.errors, status=status.HTTP_400_BAD_REQUEST)
+
+
+@api_view(["GET", "PUT", "DELETE"])
+@permission_classes([IsAuthenticated])
+def meal_detail(request, meal_id):
+    """Retrieve, update, or delete a logged meal."""
+
+    meal = get_object_or_404(MealHistory, id=meal_id, user=request.user)
+
+    if request.method == "GET":
+        serializer = MealHistorySerializer(meal)
+        return Response(serializer.data, status=status.HTTP_200_OK)
+
+    if request.method == "PUT":
+        serializer = MealHistorySerializer(meal, data=request.data)
+        if serializer.is_valid():
+            serializer.save()
+            return Response(serializer.data, status=status.HTTP_200_OK)
+        return Response(serializer.errors, status=status.HTTP_400_BAD_REQUEST)
+
+    meal.delete()
+    return Response(status=status.HTTP_204_NO_CONTENT)
+
+
+@api_view(["GET"])
+@permission_classes([IsAuthenticated])
+def nutrition_summary(request):
+    """Calories and macros per day, week or month, read from the daily rollups."""
+
+    period = request.query_params.get("period", "day")
+    if period not in PERIODS:
+        return Response(
+            {"error": f"period must be one of {', '.join(PERIODS)}"},
+            status=status.HTTP_400_BAD_REQUEST,
+        )
+    try:
+        start, end = _date_range(request)
+    except ValueError as e:
+        return Response({"error": str(e)}, status=status.HTTP_400_BAD_REQUEST)
+    if (end - start).days >= MAX_SUMMARY_DAYS:
+        return Response(
+            {"error": f"Range must be shorter than {MAX_SUMMARY_DAYS} days"},
+            status=status.HTTP_400_BAD_REQUEST,
+        )
+
+    return Response(summarize(request.user, start, end, period), status=status.HTTP_200_OK)
+
+
+@api_view(["GET"])
+@permission_classes([IsAuthenticated])
+def grocery_list_nutrition(request, list_id):
+    """Calorie and macro totals for a grocery list, optionally per serving."""
+
+    grocery_list = get_object_or_404(GroceryList, id=list_id, user=request.user)
+    try:
+        servings = _positive_number(request, "servings", default=1)
+    except ValueError as e:
+        return Response({"error": str(e)}, status=status.HTTP_400_BAD_REQUEST)
+
+    matrix = grocery_list_matrix(grocery_list)
+    return Response(
+        {"grocery_list": grocery_list.id, "servings": servings, **matrix.totals(servings)},
+        status=status.HTTP_200_OK,
+    )
+
+
+@api_view(["GET"])
+@permission_classes([IsAuthenticated])
+def saved_recipes_nutrition(request):
+    """
+    Nutrition across the caller's saved recipes, with goal-fit scores.
+
+    ``?goal=`` defaults to the profile goal; ``?calorie_target=`` (kcal per
+    serving) also rewards recipes close to that many calories.
+    """
+
+    goal = request.query_params.get("goal") or _profile_goal(request.user)
+    if goal and goal not in GOAL_SPLITS:
+        return Response(
+            {"error": f"goal must be one of {', '.join(GOAL_SPLITS)}"},
+            status=status.HTTP_400_BAD_REQUEST,
+        )
+    try:
+        calorie_target = _positive_number(request, "calorie_target")
+    except ValueError as e:
+        return Response({"error": str(e)}, status=status.HTTP_400_BAD_REQUEST)
+
+    matrix = saved_recipes_matrix(request.user)
+    totals = matrix.totals()
+    return Response(
+        {
+            "goal": goal,
+            "recipes": ranked_goal_fit(matrix, goal, calorie_target),
+            "totals": totals["totals"],
+            "average_per_recipe": totals["average"],
+            "known": totals["known"],
+        },
+        status=status.HTTP_200_OK,
+    )
@@ -1,20 +1,46 @@
+from django.conf import settings
 from django.shortcuts import get_object_or_404
 from rest_framework import status
 from rest_framework.decorators import api_view, permission_classes
 from rest_framework.permissions import IsAuthenticated
 from rest_framework.response import Response
 
+from ..conditional import conditional_list, list_state
 from ..models import PantryItem
+from ..pagination import (
+    InvalidCursor,
+    paginate_request,
+    paginated_response,
+    wants_pagination,
+)
 from ..serializers import PantryItemSerializer
+from ..services.pantry_import import (
+    ImportFormatError,
+    detect_format,
+    import_pantry_items,
+    iter_rows,
+)
+
+
+def _pantry_state(request):
+    return [list_state(PantryItem.objects.filter(user=request.user), "updated_at")]
 
 
 @api_view(["GET", "POST"])
 @permission_classes([IsAuthenticated])
+@conditional_list(_pantry_state)
 def pantry_items(request):
     """List or create pantry items for the authenticated user."""
 
     if request.method == "GET":
         pantry_qs = PantryItem.objects.filter(user=request.user).order_by("name")
+        if wants_pagination(request):
+            try:
+                page, next_cursor = paginate_request(request, pantry_qs, ["name", "id"])
+            except InvalidCursor as e:
+                return Response({"error": str(e)}, status=status.HTTP_400_BAD_REQUEST)
+            serializer = PantryItemSerializer(page, many=True)
+            return paginated_response(serializer.data, next_cursor)
         serializer = PantryItemSerializer(pantry_qs, many=True)
         return Response(serializer.data, status=status.HTTP_200_OK)
 
@@ -25,6 +51,47 @@ def pantry_items(request):
     return Response(serializer.errors, status=status.HTTP_400_BAD_REQUEST)
 
 
+@api_view(["POST"])
+@permission_classes([IsAuthenticated])
+def pantry_import(request):
+    """
+    Bulk-import pantry items from CSV or NDJSON, upserting on name.
+
+    Send the file as the raw request body (``Content-Type: text/csv`` or
+    ``application/x-ndjson``) or as a multipart upload in the ``file`` field.
+    ``?format=csv|ndjson`` overrides detection.
+    """
+
+    content_type = request.content_type or ""
+    upload = None
+    if detect_format(content_type=content_type):
+        # Raw body: read it straight off the socket without buffering it.
+        stream = request.stream
+    else:
+        upload = request.FILES.get("file")
+        if upload is None:
+            return Response(
+                {"error": "Send a CSV/NDJSON body or a multipart file field."},
+                status=status.HTTP_400_BAD_REQUEST,
+            )
+        stream = upload
+
+    file_format = request.query_params.get("format") or detect_format(
+        filename=upload.name if upload else "",
+        content_type=upload.content_type if upload else content_type,
+    )
+    options = getattr(settings, "PANTRY_IMPORT", {})
+    try:
+        report = import_pantry_items(
+            request.user,
+            iter_rows(stream, file_format, request.query_params.get("encoding", "utf-8")),
+            chunk_size=options.get("CHUNK_SIZE", 500),
+        )
+    except (ImportFormatError, LookupError) as e:
+        return Response({"error": str(e)}, status=status.HTTP_400_BAD_REQUEST)
+    return Response(report, status=status.HTTP_200_OK)
+
+
 @api_view(["GET", "PUT", "DELETE"])
 @permission_classes([IsAuthenticated])
 def pantry_item_detail(request, item_id):
@@ -2,10 +2,48 @@ from rest_framework import status
 from rest_framework.decorators import api_view, permission_classes
 from rest_framework.permissions import IsAuthenticated
 from rest_framework.response import Response
+from django.http import StreamingHttpResponse
 from django.shortcuts import get_object_or_404
+from ..conditional import conditional_list, list_state
 from ..models import Recipe, UserSavedRecipe
-from ..serializers import RecipeSerializer, UserSavedRecipeSerializer
+from ..pagination import (
+    InvalidCursor,
+    paginate_request,
+    paginated_response,
+    parse_limit,
+    wants_pagination,
+)
+from ..serializers import (
+    RecipeSerializer,
+    RecipeSummarySerializer,
+    UserSavedRecipeSerializer,
+    UserSavedRecipeSummarySerializer,
+)
 from ..services.aws_bedrock import generate_recipe as bedrock_generate_recipe, suggest_recipes_from_pantry as bedrock_suggest_recipes
+from ..services.aws_bedrock import stream_recipe as bedrock_stream_recipe
+from ..services import recipe_search
+from ..services.bedrock_metrics import call_context
+from ..services.ingredient_index import suggest_from_index
+from ..services.recipe_stream import format_sse
+
+
+def _profile_payload(user):
+    """Profile fields that are passed to Bedrock with a recipe prompt"""
+    return {
+        'weight_kg': user.profile.weight_kg,
+        'height_cm': user.profile.height_cm,
+        'goal': user.profile.goal,
+        'preferences': user.profile.preferences,
+        'allergies': user.profile.allergies,
+    }
+
+
+def _pantry_grocery_items(user):
+    """Pantry contents in the shape expected by the Bedrock suggestion prompt"""
+    return [
+        {'ingredient_name': name}
+        for name in user.pantry_items.order_by('name').values_list('name', flat=True)
+    ]
 
 
 @api_view(['POST'])
@@ -22,16 +60,11 @@ def generate_recipe(request):
     
     try:
         # Get user profile data
-        user_profile = {
-            'weight_kg': request.user.profile.weight_kg,
-            'height_cm': request.user.profile.height_cm,
-            'goal': request.user.profile.goal,
-            'preferences': request.user.profile.preferences,
-            'allergies': request.user.profile.allergies,
-        }
+        user_profile = _profile_payload(request.user)
         
         # Generate recipe using AWS Bedrock
-        recipe_data = bedrock_generate_recipe(prompt, user_profile)
+        with call_context('recipes/generate', request.user.id):
+            recipe_data = bedrock_generate_recipe(prompt, user_profile)
         
         return Response(recipe_data, status=status.HTTP_200_OK)
         
@@ -42,15 +75,61 @@ def generate_recipe(request):
         )
 
 
+def _recipe_events(prompt, user_profile, user_id):
+    """Server-sent events for a streamed recipe generation"""
+    # Partial events go out as soon as they are parsed; the final
+    # "recipe" event is only sent once the whole object validates.
+    try:
+        with call_context('recipes/generate/stream', user_id):
+            for event, data in bedrock_stream_recipe(prompt, user_profile):
+                if event == 'recipe':
+                    serializer = RecipeSerializer(data=data)
+                    if not serializer.is_valid():
+                        yield format_sse('error', {
+                            'error': 'Generated recipe failed validation',
+                            'details': serializer.errors,
+                        })
+                        return
+                yield format_sse(event, data)
+    except Exception as e:
+        yield format_sse('error', {'error': f'Recipe generation failed: {str(e)}'})
+
+
+@api_view(['POST'])
+@permission_classes([IsAuthenticated])
+def generate_recipe_stream(request):
+    """Generate a new recipe using AI, streamed as server-sent events"""
+    prompt = request.data.get('prompt')
+    
+    if not prompt:
+        return Response(
+            {'error': 'Prompt is required'}, 
+            status=status.HTTP_400_BAD_REQUEST
+        )
+    
+    try:
+        user_profile = _profile_payload(request.user)
+    except Exception as e:
+        return Response(
+            {'error': f'Recipe generation failed: {str(e)}'}, 
+            status=status.HTTP_500_INTERNAL_SERVER_ERROR
+        )
+    
+    response = StreamingHttpResponse(
+        _recipe_events(prompt, user_profile, request.user.id), content_type='text/event-stream'
+    )
+    response['Cache-Control'] = 'no-cache'
+    response['X-Accel-Buffering'] = 'no'  # stop nginx from buffering the stream
+    return response
+
+
 @api_view(['GET'])
 @permission_classes([IsAuthenticated])
 def suggest_recipes_from_pantry(request):
     """Suggest recipes based on user's grocery list"""
     try:
-        # Get user's grocery list
-        grocery_items = list(request.user.usergrocerylist_set.values(
-            'ingredient_name', 'quantity'
-        ))
+        # Get user's pantry items
+        grocery_items = _pantry_grocery_items(request.user)
         
         if not grocery_items:
             return Response(
@@ -58,8 +137,14 @@ def suggest_recipes_from_pantry(request):
                 status=status.HTTP_400_BAD_REQUEST
             )
         
-        # Generate recipe suggestions
-        recipes_data = bedrock_suggest_recipes(grocery_items)
+        # Stored recipes the pantry already covers are served from the
+        # ingredient index; Bedrock is only asked when none are close enough.
+        recipes_data = suggest_from_index(
+            [item['ingredient_name'] for item in grocery_items]
+        )
+        if not recipes_data:
+            with call_context('recipes/pantry-suggestions', request.user.id):
+                recipes_data = bedrock_suggest_recipes(grocery_items)
         
         return Response(recipes_data, status=status.HTTP_200_OK)
         
@@ -70,6 +155,53 @@ def suggest_recipes_from_pantry(request):
         )
 
 
+def _optional_int(request, name):
+    value = request.query_params.get(name)
+    if value in (None, ''):
+        return None
+    return int(value)
+
+
+@api_view(['GET'])
+@permission_classes([IsAuthenticated])
+def search_recipes(request):
+    """Full-text search over stored recipes, ranked, with keyset pagination"""
+    query = request.query_params.get('q', '').strip()
+    if not query:
+        return Response(
+            {'error': 'Query parameter q is required'}, 
+            status=status.HTTP_400_BAD_REQUEST
+        )
+    
+    try:
+        filters = {
+            'difficulty': request.query_params.get('difficulty') or None,
+            'min_calories': _optional_int(request, 'min_calories'),
+            'max_calories': _optional_int(request, 'max_calories'),
+            'max_time': _optional_int(request, 'max_time'),
+        }
+    except ValueError:
+        return Response(
+            {'error': 'min_calories, max_calories and max_time must be integers'}, 
+            status=status.HTTP_400_BAD_REQUEST
+        )
+    
+    limit = parse_limit(request.query_params.get('limit'), default=20, maximum=100)
+    try:
+        recipes, next_cursor = recipe_search.search_recipes(
+            query, cursor=request.query_params.get('cursor'), limit=limit, **filters
+        )
+    except InvalidCursor as e:
+        return Response({'error': str(e)}, status=status.HTTP_400_BAD_REQUEST)
+    
+    results = []
+    for recipe in recipes:
+        data = RecipeSerializer(recipe).data
+        data['rank'] = recipe.rank
+        results.append(data)
+    return paginated_response(results, next_cursor)
+
+
 @api_view(['POST'])
 @permission_classes([IsAuthenticated])
 def save_recipe(request):
@@ -109,11 +241,56 @@ def save_recipe(request):
 
 @api_view(['GET'])
 @permission_classes([IsAuthenticated])
+def recipe_detail(request, recipe_id):
+    """Full recipe, for loading detail on demand from a summary list"""
+    recipe = get_object_or_404(Recipe.objects.defer('search_vector'), id=recipe_id)
+    return Response(RecipeSerializer(recipe).data, status=status.HTTP_200_OK)
+
+
+def _saved_recipes_state(request):
+    return [list_state(UserSavedRecipe.objects.filter(user=request.user), 'saved_at')]
+
+
+@api_view(['GET'])
+@permission_classes([IsAuthenticated])
+@conditional_list(_saved_recipes_state)
 def get_saved_recipes(request):
-    """Get all recipes saved by the user"""
+    """Get all recipes saved by the user (?view=summary omits ingredients and steps)"""
+    view = request.query_params.get('view', 'full')
+    if view not in ('full', 'summary'):
+        return Response(
+            {'error': 'view must be one of full, summary'}, 
+            status=status.HTTP_400_BAD_REQUEST
+        )
+    
     try:
-        saved_recipes = UserSavedRecipe.objects.filter(user=request.user).order_by('-saved_at')
-        serializer = UserSavedRecipeSerializer(saved_recipes, many=True)
+        # The recipe is joined in the same query, so the list costs a
+        # constant number of queries however many recipes are saved.
+        saved_recipes = (
+            UserSavedRecipe.objects.filter(user=request.user)
+            .select_related('recipe')
+            .order_by('-saved_at')
+        )
+        if view == 'summary':
+            serializer_class = UserSavedRecipeSummarySerializer
+            saved_recipes = saved_recipes.only(
+                'id', 'saved_at', 'recipe',
+                *[f'recipe__{field}' for field in RecipeSummarySerializer.Meta.fields]
+            )
+        else:
+            serializer_class = UserSavedRecipeSerializer
+            saved_recipes = saved_recipes.defer('recipe__search_vector')
+        
+        if wants_pagination(request):
+            try:
+                page, next_cursor = paginate_request(
+                    request, saved_recipes, ['-saved_at', '-id']
+                )
+            except InvalidCursor as e:
+                return Response({'error': str(e)}, status=status.HTTP_400_BAD_REQUEST)
+            serializer = serializer_class(page, many=True)
+            return paginated_response(serializer.data, next_cursor)
+        serializer = serializer_class(saved_recipes, many=True)
         return Response(serializer.data, status=status.HTTP_200_OK)
         
     except Exception as e:
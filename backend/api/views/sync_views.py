@@ -0,0 +1,38 @@
+from django.conf import settings
+from rest_framework import status
+from rest_framework.decorators import api_view, permission_classes
+from rest_framework.permissions import IsAuthenticated
+from rest_framework.response import Response
+
+from ..pagination import InvalidCursor, parse_limit
+from ..services.sync import CursorExpired, changes_since, snapshot
+
+
+@api_view(["GET"])
+@permission_classes([IsAuthenticated])
+def sync_changes(request):
+    """
+    Delta sync for offline clients.
+
+    Without ``cursor`` this returns every synced row (``full: true``). With
+    the ``cursor`` from the previous response it returns only the rows
+    created, changed or deleted since then; keep calling while ``has_more``.
+    """
+
+    cursor = request.query_params.get("cursor")
+    if not cursor:
+        return Response(snapshot(request.user), status=status.HTTP_200_OK)
+
+    options = getattr(settings, "SYNC", {})
+    limit = parse_limit(
+        request.query_params.get("limit"),
+        default=options.get("PAGE_SIZE", 500),
+        maximum=options.get("MAX_PAGE_SIZE", 2000),
+    )
+    try:
+        payload = changes_since(request.user, cursor, limit=limit)
+    except InvalidCursor as e:
+        return Response({"error": str(e)}, status=status.HTTP_400_BAD_REQUEST)
+    except CursorExpired as e:
+        return Response({"error": str(e)}, status=status.HTTP_410_GONE)
+    return Response(payload, status=status.HTTP_200_OK)
@@ -26,7 +26,7 @@ print(f"Recipes: {recipe_count}")
 if recipe_count > 0:
     print("Sample recipes:")
     for recipe in Recipe.objects.all()[:3]:
-        print(f"  - {recipe.title} (ID: {recipe.id})")
+        print(f"  - {recipe.name} (ID: {recipe.id})")
 
 print()
 
@@ -36,6 +36,6 @@ print(f"Saved Recipes: {saved_count}")
 if saved_count > 0:
     print("Saved recipe entries:")
     for saved in UserSavedRecipe.objects.select_related('user', 'recipe').all():
-        print(f"  - {saved.user.email} saved '{saved.recipe.title}' at {saved.saved_at}")
+        print(f"  - {saved.user.email} saved '{saved.recipe.name}' at {saved.saved_at}")
 
 print("\n✅ Database is ready for testing!")
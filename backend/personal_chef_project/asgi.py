@@ -0,0 +1,17 @@
+"""
+ASGI config for personal_chef_project project.
+
+Serves the Bedrock-bound recipe and meal plan endpoints, including the SSE
+streams, as async views, so one worker keeps many Bedrock calls in flight
+and streamed events go out as they are produced; run it with e.g.
+``uvicorn personal_chef_project.asgi:application --workers 4``.
+"""
+
+import os
+
+from django.core.asgi import get_asgi_application
+
+os.environ.setdefault('DJANGO_SETTINGS_MODULE', 'personal_chef_project.settings')
+os.environ.setdefault('DJANGO_ASYNC_VIEWS', 'True')
+
+application = get_asgi_application()
@@ -26,6 +26,7 @@ DJANGO_APPS = [
     "django.contrib.sessions",
     "django.contrib.messages",
     "django.contrib.staticfiles",
+    "django.contrib.postgres",
 ]
 
 THIRD_PARTY_APPS = [
@@ -50,6 +51,8 @@ MIDDLEWARE = [
     "django.contrib.auth.middleware.AuthenticationMiddleware",
     "django.contrib.messages.middleware.MessageMiddleware",
     "django.middleware.clickjacking.XFrameOptionsMiddleware",
+    "api.middleware.RequestMetricsMiddleware",
+    "api.middleware.ReplicaRoutingMiddleware",
 ]
 
 ROOT_URLCONF = "personal_chef_project.urls"
@@ -85,6 +88,44 @@ DATABASES = {
     }
 }
 
+# Read replicas: comma-separated "host" or "host:port" entries that share the
+# primary's name and credentials. Each becomes a "replica_<n>" alias; use
+# DB_REPLICA_HOSTS=localhost to try the routing against a single database.
+for _n, _host in enumerate(
+    config("DB_REPLICA_HOSTS", default="", cast=lambda v: [h.strip() for h in v.split(",") if h.strip()]),
+    start=1,
+):
+    _host, _, _port = _host.partition(":")
+    DATABASES[f"replica_{_n}"] = {
+        **DATABASES["default"],
+        "HOST": _host,
+        "PORT": _port or DATABASES["default"]["PORT"],
+        "TEST": {"MIRROR": "default"},
+    }
+
+DATABASE_ROUTERS = ["api.db_router.ReplicaRouter"]
+
+# GET/HEAD requests to ROUTES (URL pattern prefixes) read from a healthy
+# replica unless the user wrote within STICKY_SECONDS. STICKY_CACHE_ALIAS
+# must be shared by all workers for that to hold across them; the default
+# is the "bedrock" database cache (Redis/memcached are cheaper).
+REPLICA_ROUTING = {
+    "ENABLED": config("DB_REPLICA_ROUTING_ENABLED", default=True, cast=bool),
+    "REPLICAS": [alias for alias in DATABASES if alias.startswith("replica_")],
+    "ROUTES": [
+        "api/v1/pantry/",
+        "api/v1/grocery/",
+        "api/v1/recipes/saved-recipes/",
+        "api/v1/auth/profile/",
+        "api/v1/profile/profile/",
+    ],
+    "STICKY_SECONDS": config("DB_REPLICA_STICKY_SECONDS", default=5, cast=int),
+    "STICKY_CACHE_ALIAS": config("DB_REPLICA_STICKY_CACHE_ALIAS", default="bedrock"),
+    "MAX_LAG_SECONDS": config("DB_REPLICA_MAX_LAG_SECONDS", default=10, cast=float),
+    "CHECK_INTERVAL_SECONDS": 5,
+    "RETRY_SECONDS": 30,
+}
+
 # Custom User Model
 AUTH_USER_MODEL = "users.User"
 
@@ -120,7 +161,7 @@ DEFAULT_AUTO_FIELD = "django.db.models.BigAutoField"
 # REST Framework settings
 REST_FRAMEWORK = {
     "DEFAULT_AUTHENTICATION_CLASSES": (
-        "rest_framework_simplejwt.authentication.JWTAuthentication",
+        "users.authentication.CachedJWTAuthentication",
     ),
     "DEFAULT_PERMISSION_CLASSES": [
         "rest_framework.permissions.IsAuthenticated",
@@ -129,6 +170,35 @@ REST_FRAMEWORK = {
     "PAGE_SIZE": 20,
 }
 
+# Cursor pagination for the list endpoints (opt-in via ?cursor= or ?limit=)
+KEYSET_PAGINATION = {
+    "DEFAULT_LIMIT": 50,
+    "MAX_LIMIT": 200,
+}
+
+# Largest batch accepted by POST grocery/grocery-item/bulk/
+GROCERY_BULK_MAX_OPERATIONS = 500
+
+# Most recipes one POST grocery/grocery-list/<id>/consolidate/ may add
+GROCERY_CONSOLIDATE_MAX_RECIPES = 100
+
+# Pantry CSV/NDJSON import: rows upserted per bulk_create/transaction
+PANTRY_IMPORT = {
+    "CHUNK_SIZE": 500,
+}
+
+# Delta sync (GET sync/): change log page size and how long entries are kept.
+# Cursors older than RETENTION_DAYS get 410 and the client must resync.
+# Entries logged up to OVERLAP_SECONDS before a cursor was handed out are
+# sent again with the next delta, so changes committed late by a long write
+# transaction are not skipped; it should exceed the longest such transaction.
+SYNC = {
+    "PAGE_SIZE": 500,
+    "MAX_PAGE_SIZE": 2000,
+    "RETENTION_DAYS": config("SYNC_RETENTION_DAYS", default=30, cast=int),
+    "OVERLAP_SECONDS": config("SYNC_OVERLAP_SECONDS", default=30, cast=int),
+}
+
 # JWT Settings
 SIMPLE_JWT = {
     "ACCESS_TOKEN_LIFETIME": timedelta(minutes=60),
@@ -137,6 +207,20 @@ SIMPLE_JWT = {
     "BLACKLIST_AFTER_ROTATION": True,
 }
 
+# Cache of authenticated users and profiles (users.auth_cache). SHARED_ALIAS
+# adds a cross-process tier; point it at Redis/memcached, not the DB cache.
+# TRUST_TOKEN_CLAIMS builds the user from token claims on read-only cache
+# misses, checking only its token version and active flag in the DB.
+# Other workers keep accepting revoked tokens and deactivated users from
+# their in-process tier for up to TTL_SECONDS.
+AUTH_CACHE = {
+    "ENABLED": config("AUTH_CACHE_ENABLED", default=True, cast=bool),
+    "TTL_SECONDS": config("AUTH_CACHE_TTL_SECONDS", default=60, cast=int),
+    "MAX_ENTRIES": config("AUTH_CACHE_MAX_ENTRIES", default=10000, cast=int),
+    "SHARED_ALIAS": config("AUTH_CACHE_SHARED_ALIAS", default=""),
+    "TRUST_TOKEN_CLAIMS": config("AUTH_CACHE_TRUST_TOKEN_CLAIMS", default=False, cast=bool),
+}
+
 # CORS settings
 CORS_ALLOWED_ORIGINS = [
     "http://localhost:3000",
@@ -149,4 +233,139 @@ CORS_ALLOW_CREDENTIALS = True
 # External API Keys
 AWS_BEDROCK_REGION = config("AWS_BEDROCK_REGION", default="us-east-1")
 
+# Pooled Bedrock client (one per worker process, shared by all threads)
+BEDROCK_CLIENT = {
+    "MAX_POOL_CONNECTIONS": config("BEDROCK_MAX_POOL_CONNECTIONS", default=50, cast=int),
+    "CONNECT_TIMEOUT": config("BEDROCK_CONNECT_TIMEOUT", default=5, cast=int),
+    "READ_TIMEOUT": config("BEDROCK_READ_TIMEOUT", default=120, cast=int),
+    "TCP_KEEPALIVE": config("BEDROCK_TCP_KEEPALIVE", default=True, cast=bool),
+    "MAX_ATTEMPTS": config("BEDROCK_MAX_ATTEMPTS", default=3, cast=int),
+    "WARM_UP_ON_STARTUP": config("BEDROCK_WARM_UP_ON_STARTUP", default=False, cast=bool),
+    # "aws" or "simulator" (api.services.bedrock_fake.SimulatedBedrockClient)
+    "BACKEND": config("BEDROCK_BACKEND", default="aws"),
+}
+
+# Local Bedrock simulator used when BEDROCK_CLIENT["BACKEND"] is "simulator".
+# TTFB is log-normal around TTFB_MEDIAN_MS; MAX_CONCURRENCY=0 means no quota.
+BEDROCK_SIMULATOR = {
+    "TTFB_MEDIAN_MS": config("BEDROCK_SIMULATOR_TTFB_MEDIAN_MS", default=700, cast=float),
+    "TTFB_SIGMA": config("BEDROCK_SIMULATOR_TTFB_SIGMA", default=0.4, cast=float),
+    "OUTPUT_TOKENS_PER_SECOND": config("BEDROCK_SIMULATOR_OUTPUT_TOKENS_PER_SECOND", default=80, cast=float),
+    "THROTTLE_RATE": config("BEDROCK_SIMULATOR_THROTTLE_RATE", default=0.0, cast=float),
+    "MAX_CONCURRENCY": config("BEDROCK_SIMULATOR_MAX_CONCURRENCY", default=0, cast=int),
+    "SEED": config("BEDROCK_SIMULATOR_SEED", default=None, cast=lambda v: None if v in (None, "") else int(v)),
+}
+
+# Coalescing of identical in-flight Bedrock requests. CROSS_PROCESS also
+# takes a lock in LOCK_ALIAS so other workers wait for the shared cache entry.
+BEDROCK_SINGLE_FLIGHT = {
+    "ENABLED": config("BEDROCK_SINGLE_FLIGHT_ENABLED", default=True, cast=bool),
+    "CROSS_PROCESS": config("BEDROCK_SINGLE_FLIGHT_CROSS_PROCESS", default=False, cast=bool),
+    "LOCK_ALIAS": "bedrock",
+    "LOCK_TIMEOUT": config("BEDROCK_SINGLE_FLIGHT_LOCK_TIMEOUT", default=120, cast=int),
+    "POLL_INTERVAL": 0.25,
+}
+
+# Async views for the Bedrock-bound endpoints, served through
+# personal_chef_project.asgi (which turns ENABLED on). ORM work runs on
+# DB_THREADS threads, one connection each; blocking Bedrock calls on up to
+# BEDROCK_MAX_IN_FLIGHT threads (default: BEDROCK_CLIENT["MAX_POOL_CONNECTIONS"]).
+ASYNC_VIEWS = {
+    "ENABLED": config("DJANGO_ASYNC_VIEWS", default=False, cast=bool),
+    "DB_THREADS": config("ASYNC_DB_THREADS", default=8, cast=int),
+    "BEDROCK_MAX_IN_FLIGHT": config("ASYNC_BEDROCK_MAX_IN_FLIGHT", default=None, cast=lambda v: None if v in (None, "") else int(v)),
+}
+
+# Pantry suggestions are answered from stored recipes when at least one
+# covers MIN_COVERAGE of its non-staple ingredients; otherwise Bedrock is asked.
+PANTRY_SUGGESTIONS = {
+    "LIMIT": config("PANTRY_SUGGESTIONS_LIMIT", default=3, cast=int),
+    "MIN_COVERAGE": config("PANTRY_SUGGESTIONS_MIN_COVERAGE", default=0.75, cast=float),
+}
+
+# Asynchronous recipe jobs (in-process worker pool; "database" or "memory" broker)
+RECIPE_JOBS = {
+    "BROKER": config("RECIPE_JOBS_BROKER", default="database"),
+    "MAX_WORKERS": config("RECIPE_JOBS_MAX_WORKERS", default=4, cast=int),
+    "MAX_PENDING": config("RECIPE_JOBS_MAX_PENDING", default=100, cast=int),
+    "MAX_WAIT_SECONDS": config("RECIPE_JOBS_MAX_WAIT_SECONDS", default=25, cast=int),
+}
+
+# Weekly meal plans: every uncached slot is generated at once on a bounded
+# per-process pool, so a plan takes about one generation's latency when
+# MAX_WORKERS covers its slots. Keep it under BEDROCK_MAX_POOL_CONNECTIONS.
+MEAL_PLANS = {
+    "MAX_WORKERS": config("MEAL_PLANS_MAX_WORKERS", default=12, cast=int),
+    "MAX_PENDING": config("MEAL_PLANS_MAX_PENDING", default=200, cast=int),
+    "MAX_DAYS": config("MEAL_PLANS_MAX_DAYS", default=14, cast=int),
+    "TIMEOUT_SECONDS": config("MEAL_PLANS_TIMEOUT_SECONDS", default=300, cast=int),
+}
+
+# Bedrock call instrumentation: per-process latency histograms, token counts
+# and cost per endpoint, model and user, served at /api/metrics/bedrock/.
+# PERSIST also writes one BedrockCallLog row per call for cross-worker trends.
+# PRICING is USD per 1,000 tokens, keyed by model id.
+BEDROCK_METRICS = {
+    "ENABLED": config("BEDROCK_METRICS_ENABLED", default=True, cast=bool),
+    "PERSIST": config("BEDROCK_METRICS_PERSIST", default=False, cast=bool),
+    "MAX_USERS": config("BEDROCK_METRICS_MAX_USERS", default=1000, cast=int),
+    "PRICING": {
+        "anthropic.claude-3-sonnet-20240229-v1:0": {
+            "INPUT_PER_1K": 0.003,
+            "OUTPUT_PER_1K": 0.015,
+        },
+    },
+}
+
+# Per-route request latency, query count and SQL time, recorded by
+# api.middleware.RequestMetricsMiddleware for a SAMPLE_RATE share of requests.
+# Requests over LATENCY_BUDGET_MS or QUERY_BUDGET are counted and logged;
+# ROUTE_BUDGETS overrides either per URL pattern, e.g.
+# {"api/v1/meal-plans/": {"LATENCY_MS": 120000}}. Prometheus scrapes
+# /api/v1/metrics/prometheus/ from PROMETHEUS_ALLOWED_IPS.
+REQUEST_METRICS = {
+    "ENABLED": config("REQUEST_METRICS_ENABLED", default=True, cast=bool),
+    "SAMPLE_RATE": config("REQUEST_METRICS_SAMPLE_RATE", default=1.0, cast=float),
+    "LATENCY_BUDGET_MS": config("REQUEST_METRICS_LATENCY_BUDGET_MS", default=500, cast=int),
+    "QUERY_BUDGET": config("REQUEST_METRICS_QUERY_BUDGET", default=20, cast=int),
+    "LOG_OVER_BUDGET": config("REQUEST_METRICS_LOG_OVER_BUDGET", default=True, cast=bool),
+    "ROUTE_BUDGETS": {
+        # Bedrock-backed routes are slow by design; budget them separately.
+        "api/v1/recipes/generate/": {"LATENCY_MS": 30000},
+        "api/v1/recipes/pantry-suggestions/": {"LATENCY_MS": 30000},
+        "api/v1/meal-plans/": {"LATENCY_MS": 300000},
+    },
+    "PROMETHEUS_ALLOWED_IPS": config(
+        "REQUEST_METRICS_PROMETHEUS_ALLOWED_IPS",
+        default="127.0.0.1,::1",
+        cast=lambda v: [ip.strip() for ip in v.split(",") if ip.strip()],
+    ),
+}
+
+# Caches
+# The "bedrock" alias is the shared tier of the Bedrock response cache. It uses
+# the database cache so every worker sees the same entries; create the table
+# with `python manage.py createcachetable`.
+CACHES = {
+    "default": {
+        "BACKEND": "django.core.cache.backends.locmem.LocMemCache",
+    },
+    "bedrock": {
+        "BACKEND": "django.core.cache.backends.db.DatabaseCache",
+        "LOCATION": "bedrock_response_cache",
+        "OPTIONS": {
+            "MAX_ENTRIES": config("BEDROCK_SHARED_CACHE_MAX_ENTRIES", default=10000, cast=int),
+            "CULL_FREQUENCY": 4,
+        },
+    },
+}
+
+# Bedrock response cache (in-process LRU in front of the shared "bedrock" cache)
+BEDROCK_CACHE = {
+    "ENABLED": config("BEDROCK_CACHE_ENABLED", default=True, cast=bool),
+    "TTL_SECONDS": config("BEDROCK_CACHE_TTL_SECONDS", default=60 * 60 * 24, cast=int),
+    "MAX_ENTRIES": config("BEDROCK_CACHE_MAX_ENTRIES", default=512, cast=int),
+    "CACHE_ALIAS": config("BEDROCK_CACHE_ALIAS", default="bedrock"),
+}
+
 # Configure Django app for Heroku.
\ No newline at end of file
@@ -0,0 +1,204 @@
+import logging
+import threading
+import time
+from collections import OrderedDict
+
+from django.conf import settings
+from django.core.cache import caches
+from django.core.cache.backends.base import InvalidCacheBackendError
+from django.db import DEFAULT_DB_ALIAS
+
+from .models import User, UserProfile
+
+logger = logging.getLogger(__name__)
+
+# The password hash never leaves the database; restored users load it
+# lazily (as a deferred field) if anything asks for it.
+_USER_FIELDS = tuple(
+    field.attname for field in User._meta.concrete_fields if field.attname != "password"
+)
+_PROFILE_FIELDS = tuple(field.attname for field in UserProfile._meta.concrete_fields)
+
+
+def snapshot(user):
+    """Plain values of ``user`` and its profile (``None`` if it has none)."""
+    try:
+        profile = user.profile
+    except UserProfile.DoesNotExist:
+        profile = None
+    return {
+        "user": tuple(getattr(user, name) for name in _USER_FIELDS),
+        "profile": None if profile is None else tuple(getattr(profile, name) for name in _PROFILE_FIELDS),
+    }
+
+
+def restore(data):
+    """
+    A fresh ``User`` with its ``profile`` already attached, from ``snapshot``.
+
+    Instances are rebuilt on every hit so a view changing ``request.user``
+    cannot change the cached copy.
+    """
+    user = User.from_db(DEFAULT_DB_ALIAS, _USER_FIELDS, data["user"])
+    profile = None
+    if data["profile"] is not None:
+        profile = UserProfile.from_db(DEFAULT_DB_ALIAS, _PROFILE_FIELDS, data["profile"])
+        UserProfile.user.field.set_cached_value(profile, user)
+    # Caching None makes user.profile raise DoesNotExist, as it would.
+    User.profile.related.set_cached_value(user, profile)
+    return user
+
+
+class AuthCache:
+    """
+    Two-tier cache of authenticated users and their profiles.
+
+    Entries are keyed by user id and token version. The first tier is an
+    in-process LRU; the optional second tier is a shared Django cache, which
+    only pays off when it is cheaper than the user query it replaces (not the
+    database cache). Saves in this process invalidate both tiers at once.
+
+    Other processes are not told: their in-process entries keep serving the
+    old snapshot until they expire, up to ``ttl_seconds`` after the change.
+    That includes ``User.revoke_tokens`` and deactivation, with or without a
+    shared tier: another worker holding an entry for the old token version
+    still accepts the revoked token, or the deactivated user, for up to
+    ``ttl_seconds``. Lower ``AUTH_CACHE_TTL_SECONDS`` (or disable the cache)
+    if that window is too long.
+    """
+
+    def __init__(self, max_entries=10000, ttl_seconds=60, shared_alias=None):
+        self.max_entries = max_entries
+        self.ttl_seconds = ttl_seconds
+        self.shared_alias = shared_alias
+        self._entries = OrderedDict()  # user id -> (expires at, version, snapshot)
+        self._lock = threading.Lock()
+        self._counters = {
+            "local_hits": 0,
+            "shared_hits": 0,
+            "misses": 0,
+            "invalidations": 0,
+            "evictions": 0,
+            "shared_errors": 0,
+        }
+
+    def _incr(self, counter, amount=1):
+        with self._lock:
+            self._counters[counter] += amount
+
+    def _shared_backend(self):
+        if not self.shared_alias:
+            return None
+        try:
+            return caches[self.shared_alias]
+        except InvalidCacheBackendError:
+            return None
+
+    @staticmethod
+    def _shared_key(user_id, version):
+        return f"auth:user:{user_id}:{version}"
+
+    def _set_local(self, user_id, version, data):
+        expires_at = time.monotonic() + self.ttl_seconds
+        with self._lock:
+            self._entries[user_id] = (expires_at, version, data)
+            self._entries.move_to_end(user_id)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+                self._counters["evictions"] += 1
+
+    def get(self, user_id, version):
+        """A restored ``User`` for this id and token version, or ``None``."""
+        now = time.monotonic()
+        with self._lock:
+            entry = self._entries.get(user_id)
+            if entry is not None and entry[0] > now and entry[1] == version:
+                self._entries.move_to_end(user_id)
+                self._counters["local_hits"] += 1
+                data = entry[2]
+            else:
+                data = None
+        if data is not None:
+            return restore(data)
+
+        backend = self._shared_backend()
+        if backend is not None:
+            try:
+                data = backend.get(self._shared_key(user_id, version))
+            except Exception as e:
+                self._incr("shared_errors")
+                logger.warning("Shared auth cache read failed: %s", e)
+            if data is not None:
+                self._incr("shared_hits")
+                self._set_local(user_id, version, data)
+                return restore(data)
+
+        self._incr("misses")
+        return None
+
+    def set(self, user):
+        """Cache ``user`` (with ``user.profile`` loaded) under its current version."""
+        data = snapshot(user)
+        self._set_local(user.pk, user.token_version, data)
+        backend = self._shared_backend()
+        if backend is not None:
+            try:
+                backend.set(self._shared_key(user.pk, user.token_version), data, timeout=self.ttl_seconds)
+            except Exception as e:
+                self._incr("shared_errors")
+                logger.warning("Shared auth cache write failed: %s", e)
+
+    def invalidate(self, user_id, version=None):
+        """Drop ``user_id`` from both tiers; ``version`` also clears its shared entry."""
+        with self._lock:
+            entry = self._entries.pop(user_id, None)
+            self._counters["invalidations"] += 1
+        backend = self._shared_backend()
+        if backend is None:
+            return
+        versions = {v for v in (version, entry and entry[1]) if v is not None}
+        try:
+            backend.delete_many([self._shared_key(user_id, v) for v in versions])
+        except Exception as e:
+            self._incr("shared_errors")
+            logger.warning("Shared auth cache delete failed: %s", e)
+
+    def clear(self):
+        """Drop the in-process tier and reset counters."""
+        with self._lock:
+            self._entries.clear()
+            for counter in self._counters:
+                self._counters[counter] = 0
+
+    def stats(self):
+        with self._lock:
+            stats = dict(self._counters)
+            stats["local_size"] = len(self._entries)
+        lookups = stats["local_hits"] + stats["shared_hits"] + stats["misses"]
+        stats["hit_ratio"] = (
+            (stats["local_hits"] + stats["shared_hits"]) / lookups if lookups else 0.0
+        )
+        return stats
+
+
+_cache = None
+_cache_lock = threading.Lock()
+
+
+def get_auth_cache():
+    """Return the process-wide cache configured from ``settings.AUTH_CACHE``."""
+    global _cache
+    if _cache is None:
+        with _cache_lock:
+            if _cache is None:
+                options = getattr(settings, "AUTH_CACHE", {})
+                _cache = AuthCache(
+                    max_entries=options.get("MAX_ENTRIES", 10000),
+                    ttl_seconds=options.get("TTL_SECONDS", 60),
+                    shared_alias=options.get("SHARED_ALIAS"),
+                )
+    return _cache
+
+
+def auth_cache_enabled():
+    return getattr(settings, "AUTH_CACHE", {}).get("ENABLED", True)
@@ -0,0 +1,93 @@
+from django.conf import settings
+from django.db import DEFAULT_DB_ALIAS
+from django.utils.translation import gettext_lazy as _
+from rest_framework.exceptions import AuthenticationFailed
+from rest_framework.permissions import SAFE_METHODS
+from rest_framework_simplejwt.authentication import JWTAuthentication
+from rest_framework_simplejwt.exceptions import InvalidToken
+from rest_framework_simplejwt.settings import api_settings
+
+from .auth_cache import auth_cache_enabled, get_auth_cache
+from .models import User
+from .tokens import EMAIL_CLAIM, STAFF_CLAIM, VERSION_CLAIM
+
+# Fields a user built from token claims has; the rest load lazily if used.
+_CLAIM_FIELDS = ("id", "email", "is_active", "is_staff", "token_version")
+
+
+def _trust_token_claims():
+    return getattr(settings, "AUTH_CACHE", {}).get("TRUST_TOKEN_CLAIMS", False)
+
+
+class CachedJWTAuthentication(JWTAuthentication):
+    """
+    ``JWTAuthentication`` that serves the user and profile from ``AuthCache``.
+
+    A miss loads both in one query and caches them under the token's
+    ``ver`` claim (0 for tokens issued before it existed). With
+    ``AUTH_CACHE["TRUST_TOKEN_CLAIMS"]``, read-only requests that miss build
+    the user from the signed claims and only look up its token version and
+    active flag, so revocation and deactivation still apply at once; a
+    demoted account keeps its ``is_staff`` claim until the token expires.
+    """
+
+    def authenticate(self, request):
+        header = self.get_header(request)
+        if header is None:
+            return None
+
+        raw_token = self.get_raw_token(header)
+        if raw_token is None:
+            return None
+
+        validated_token = self.get_validated_token(raw_token)
+        read_only = request.method in SAFE_METHODS
+        return self.get_cached_user(validated_token, read_only), validated_token
+
+    def get_cached_user(self, validated_token, read_only=False):
+        if not auth_cache_enabled():
+            return self._check_version(self.get_user(validated_token), validated_token)
+
+        try:
+            user_id = int(validated_token[api_settings.USER_ID_CLAIM])
+        except (KeyError, TypeError, ValueError) as e:
+            raise InvalidToken(_("Token contained no recognizable user identification")) from e
+        version = validated_token.get(VERSION_CLAIM, 0)
+
+        cache = get_auth_cache()
+        user = cache.get(user_id, version)
+        if user is not None:
+            return user
+        if read_only and _trust_token_claims() and EMAIL_CLAIM in validated_token:
+            return self._user_from_claims(user_id, version, validated_token)
+
+        try:
+            user = User.objects.select_related("profile").get(pk=user_id)
+        except User.DoesNotExist as e:
+            raise AuthenticationFailed(_("User not found"), code="user_not_found") from e
+        if api_settings.CHECK_USER_IS_ACTIVE and not user.is_active:
+            raise AuthenticationFailed(_("User is inactive"), code="user_inactive")
+        self._check_version(user, validated_token)
+        cache.set(user)
+        return user
+
+    def _user_from_claims(self, user_id, version, validated_token):
+        # A primary-key lookup of two columns, without the profile join.
+        row = User.objects.filter(pk=user_id).values_list("token_version", "is_active").first()
+        if row is None:
+            raise AuthenticationFailed(_("User not found"), code="user_not_found")
+        token_version, is_active = row
+        if api_settings.CHECK_USER_IS_ACTIVE and not is_active:
+            raise AuthenticationFailed(_("User is inactive"), code="user_inactive")
+        if token_version != version:
+            raise AuthenticationFailed(_("Token has been revoked"), code="token_revoked")
+        return User.from_db(
+            DEFAULT_DB_ALIAS,
+            _CLAIM_FIELDS,
+            (user_id, validated_token[EMAIL_CLAIM], is_active, validated_token.get(STAFF_CLAIM, False), version),
+        )
+
+    def _check_version(self, user, validated_token):
+        if validated_token.get(VERSION_CLAIM, 0) != user.token_version:
+            raise AuthenticationFailed(_("Token has been revoked"), code="token_revoked")
+        return user
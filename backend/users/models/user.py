@@ -17,8 +17,27 @@ class User(AbstractUser):
     # Set username to a unique UUID string
     username = models.CharField(max_length=150, unique=True, default=generate_username)
 
+    # Copied into every token (see users.tokens); bumping it revokes them all.
+    token_version = models.PositiveIntegerField(default=0)
+
     USERNAME_FIELD = "email"
     # REQUIRED_FIELDS = []  # Empty since username is auto-generated and email is USERNAME_FIELD
     REQUIRED_FIELDS = ['username']
     def __str__(self):
         return self.email
+
+    def refresh_from_db(self, using=None, fields=None, **kwargs):
+        # Users served by CachedJWTAuthentication have deferred fields; load
+        # them all on first access rather than one query per attribute.
+        if fields is not None:
+            fields = set(fields)
+            deferred = self.get_deferred_fields()
+            if fields & deferred:
+                fields |= deferred
+        super().refresh_from_db(using, fields, **kwargs)
+
+    def revoke_tokens(self):
+        """Invalidate every token issued so far, e.g. after a password reset."""
+        self.token_version = models.F('token_version') + 1
+        self.save(update_fields=['token_version'])
+        self.refresh_from_db(fields=['token_version'])
@@ -0,0 +1,25 @@
+from django.db.models.signals import post_delete, post_save
+from django.dispatch import receiver
+
+from .auth_cache import get_auth_cache
+from .models import User, UserProfile
+
+
+@receiver(post_save, sender=User)
+@receiver(post_delete, sender=User)
+def invalidate_cached_user(sender, instance, **kwargs):
+    """Drop the cached snapshot so the next request reloads the user."""
+    version = instance.token_version
+    if not isinstance(version, int):
+        # revoke_tokens() saved an F() increment; the shared entry to drop
+        # is the one under the version before it.
+        current = User.objects.filter(pk=instance.pk).values_list("token_version", flat=True).first()
+        version = None if current is None else current - 1
+    get_auth_cache().invalidate(instance.pk, version)
+
+
+@receiver(post_save, sender=UserProfile)
+@receiver(post_delete, sender=UserProfile)
+def invalidate_cached_profile(sender, instance, **kwargs):
+    """Profiles are cached with their user, so drop that snapshot too."""
+    get_auth_cache().invalidate(instance.user_id)
@@ -0,0 +1,22 @@
+from rest_framework_simplejwt.tokens import RefreshToken
+
+# Claim holding ``User.token_version`` when the token was issued.
+VERSION_CLAIM = "ver"
+# Claims ``CachedJWTAuthentication`` can build a user from without the DB.
+EMAIL_CLAIM = "email"
+STAFF_CLAIM = "is_staff"
+
+
+class UserRefreshToken(RefreshToken):
+    """
+    Refresh token whose access tokens also carry the user's token version,
+    email and staff flag.
+    """
+
+    @classmethod
+    def for_user(cls, user):
+        token = super().for_user(user)
+        token[VERSION_CLAIM] = user.token_version
+        token[EMAIL_CLAIM] = user.email
+        token[STAFF_CLAIM] = user.is_staff
+        return token
@@ -2,10 +2,10 @@ from rest_framework import status
 from rest_framework.decorators import api_view, permission_classes
 from rest_framework.permissions import AllowAny, IsAuthenticated
 from rest_framework.response import Response
-from rest_framework_simplejwt.tokens import RefreshToken
 from django.contrib.auth import authenticate
 from ..serializers import UserRegistrationSerializer, UserProfileSerializer
 from ..models import UserProfile
+from ..tokens import UserRefreshToken
 
 
 @api_view(["POST"])
@@ -20,7 +20,7 @@ def register(request):
     if serializer.is_valid():
         try:
             user = serializer.save()
-            refresh = RefreshToken.for_user(user)
+            refresh = UserRefreshToken.for_user(user)
             return Response(
                 {
                     "message": "User registered successfully",
@@ -57,7 +57,7 @@ def login(request):
     user = authenticate(request, username=email, password=password)
 
     if user is not None:
-        refresh = RefreshToken.for_user(user)
+        refresh = UserRefreshToken.for_user(user)
         return Response(
             {"access": str(refresh.access_token), "refresh": str(refresh)},
             status=status.HTTP_200_OK,
@@ -111,7 +111,9 @@ def get_profile(request):
 def update_profile(request):
     """Update user profile"""
     try:
-        profile = request.user.profile
+        # Read the row itself rather than the authentication cache's copy,
+        # which another worker may have changed since it was cached.
+        profile = UserProfile.objects.select_related('user').get(user_id=request.user.pk)
         serializer = UserProfileSerializer(profile, data=request.data, partial=True)
         if serializer.is_valid():
             serializer.save()